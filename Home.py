@@ -1,23 +1,23 @@
 import streamlit as st
+from insights import load_insights, statement_insights, year_end
 
 st.set_page_config(page_title="📊 IRAS KPI Dashboard", layout="wide")
 
+# Top movers of every statement, generated once per data version (see insights.py)
+insights = load_insights()
+latest, previous = insights["fiscal_year"], insights["previous_year"]
+period = f"{latest} vs {previous}" if previous else latest
+
 st.title("📘 IRAS Financial KPI Dashboard")
-st.markdown("""
-Welcome to the **Inland Revenue Authority of Singapore (IRAS)** Financial Dashboard for **FY2023/24**.  
+st.markdown(f"""
+Welcome to the **Inland Revenue Authority of Singapore (IRAS)** Financial Dashboard for **{latest}**.  
 This dashboard summarizes and analyzes data extracted from the official *IRAS Statement of Financial Position*, providing key insights into its equity structure, asset composition, and financial stability.  
-Data source: IRAS Annual Report FY2023/24 (as at 31 March 2024).
+Data source: IRAS Annual Report {latest} (as at {year_end(latest)}).
 """)
 
-st.header("📌 Business Insights (FY2023/24 vs FY2022/23)")
+st.header(f"📌 Business Insights ({period})")
 
-st.markdown("""
-- **Total Equity** increased by **+7.42%**, mainly driven by a rise in **Accumulated Surplus (+7.48%)**, indicating retained earnings growth.
-- **Non-Current Assets** rose **+7.04%**, led by a significant rise in *Development Projects-in-Progress* (+138% YoY).
-- **Current Assets** slightly increased **+1.97%**, with *Funds with fund managers* being the largest component.
-- **Net Current Assets** remained stable with a marginal increase of **+0.39%**, reflecting conservative working capital management.
-- **Non-Current Liabilities** dropped by **-30.19%**, contributing to improved **Debt-to-Equity** and **Liquidity Ratios**.
-""")
+st.markdown(statement_insights("Statement of Financial Position"))
 
 st.header("📈 Financial KPI Definitions and Formulas")
 
@@ -57,20 +57,14 @@ st.markdown("""
 # Income Statement
 
 st.title("📘 Statement of Income Statement")
-st.markdown("""
-This page presents the **Income Statement** analysis from the **IRAS FY2023/24 Annual Report**, highlighting year-over-year performance changes and key income-related KPIs.  
+st.markdown(f"""
+This page presents the **Income Statement** analysis from the **IRAS {latest} Annual Report**, highlighting year-over-year performance changes and key income-related KPIs.  
 It reflects the organization’s profitability, operational efficiency, and reliance on external/government funding sources.
 """)
 
-st.header("📊 Business Insights (FY2023/24 vs FY2022/23)")
+st.header(f"📊 Business Insights ({period})")
 
-st.markdown("""
-- **Operating Income** grew by **+10.26%**, signaling healthy revenue growth year-over-year.
-- **Operating Surplus** rose **+19.36%**, showing improved cost control and operational efficiency.
-- **Net Investment Income** swung from a loss (-11M) to a gain (+35M), a **+415% turnaround**, significantly boosting surplus before government funding.
-- **Net Surplus for the Year** surged by **+61.38%**, despite higher contributions to the **Government Consolidated Fund** (+60.97%).
-- These improvements result in better **surplus margins** and **reduced dependency on government contributions**.
-""")
+st.markdown(statement_insights("Statement of Com. Income"))
 
 st.header("📈 Income Performance KPI Definitions and Formulas")
 
@@ -111,18 +105,14 @@ st.markdown("""
 """)
 
 st.title("📘 Statement of Changes in Equity")
-st.markdown("""
-This page highlights key components affecting equity changes for **IRAS FY2023/24**, focusing on **total comprehensive income** and **dividends paid**.  
+st.markdown(f"""
+This page highlights key components affecting equity changes for **IRAS {latest}**, focusing on **total comprehensive income** and **dividends paid**.  
 These values are essential in understanding how retained earnings are affected year-over-year.
 """)
 
-st.header("📊 Business Insights (FY2023/24 vs FY2022/23)")
+st.header(f"📊 Business Insights ({period})")
 
-st.markdown("""
-- **Total Comprehensive Income** increased by **+61.38%**, indicating stronger financial performance and profitability in FY2023/24.
-- **Dividends Paid** rose dramatically to **SGD -80,000**, a **+3789.16% increase** compared to FY2022/23, reflecting greater distribution to the Government Consolidated Fund or reserves.
-- This suggests stronger confidence in the organization's fiscal position, allowing for higher returns to stakeholders.
-""")
+st.markdown(statement_insights("Statement of Changes in Equity"))
 
 st.header("📈 Equity KPI Definitions and Formulas")
 
@@ -150,20 +140,14 @@ st.markdown("""
 """)
 
 st.title("📘 Statement of Cash Flows")
-st.markdown("""
-This page analyzes the **cash inflows and outflows** of IRAS for **FY2023/24**, with key KPIs for financial liquidity, sustainability, and operational efficiency.  
+st.markdown(f"""
+This page analyzes the **cash inflows and outflows** of IRAS for **{latest}**, with key KPIs for financial liquidity, sustainability, and operational efficiency.  
 It gives insight into how IRAS generates and uses cash, crucial for evaluating short-term health and strategic funding.
 """)
 
-st.header("📊 Business Insights (FY2023/24 vs FY2022/23)")
+st.header(f"📊 Business Insights ({period})")
 
-st.markdown("""
-- **Net Cash from Operating Activities** rose by **+48.18%**, signaling improved core operations and stronger cash generation.
-- **Cash from Investing Activities** slightly decreased due to more outflows, but this may reflect strategic long-term investments.
-- **Financing Cash Outflows** surged **+204.24%**, indicating a substantial increase in payouts (e.g., dividends).
-- **Ending Cash** declined by **-13.21%**, though this still reflects a solid **11.1-month cash runway** and **positive free cash flow** of **S$280,417**.
-- **Net Cash Margin** is **-13.21%**, suggesting that expenses still exceed cash inflows, mainly due to investment and financing activities.
-""")
+st.markdown(statement_insights("Statement of Cash Flows"))
 
 st.header("📈 Cash Flow KPI Definitions and Formulas")
 
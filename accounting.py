@@ -0,0 +1,63 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+
+# --- Accounting numbers ---
+# Statement cells come in as a mix of ints, floats and text in accounting format. Pages used
+# to coerce them one cell at a time with `int(val)` in a bare try/except, which turned
+# "(1,234)" into 0. parse_amounts() converts a whole block of value columns in one pass:
+#   1234, 1234.0, "1,234"    ->  1234
+#   "(1,234)", "-1,234"      -> -1234
+#   "-", "–", "—"            ->  0     (a reported nil)
+#   blank, NaN, other text   ->  missing
+# and returns int64 amounts with a separate boolean mask of missing cells.
+
+DASHES = ["-", "–", "—", "−"]
+UNIT_SCALES = {"": 1, "000": 1_000, "'000": 1_000, "m": 1_000_000, "mil": 1_000_000, "b": 1_000_000_000}
+_UNIT_PATTERN = re.compile(r"S\$\s*(['’]?\s*000|m|mil|b)?", re.IGNORECASE)
+_STRIP_PATTERN = r"[,\s$]|S\$"
+
+
+def unit_scale(text):
+    # "S$'000" -> 1000; anything unrecognised counts as plain dollars
+    match = _UNIT_PATTERN.search(str(text))
+    if not match:
+        return 1
+    unit = (match.group(1) or "").replace("’", "'").replace(" ", "").lower()
+    return UNIT_SCALES.get(unit, 1)
+
+
+def _parse_column(col):
+    numeric = pd.to_numeric(col, errors="coerce") if col.dtype == object else col.astype(float)
+    is_text = col.map(type).eq(str).to_numpy() if col.dtype == object else np.zeros(len(col), dtype=bool)
+    values = numeric.to_numpy(dtype=float)
+    if not is_text.any():
+        return values
+
+    # Currency and separators go first, so "S$ (1,234)" is still seen as bracketed
+    text = col[is_text].astype(str).str.replace(_STRIP_PATTERN, "", regex=True)
+    negative = (text.str.startswith("(") & text.str.endswith(")")).to_numpy()
+    cleaned = text.str.strip("()").str.replace("−", "-")
+    dash = cleaned.isin(DASHES).to_numpy()
+    parsed = pd.to_numeric(cleaned.where(~dash, "0"), errors="coerce").to_numpy(dtype=float)
+    parsed = np.where(negative, -np.abs(parsed), parsed)
+    values[is_text] = parsed
+    return values
+
+
+def parse_amounts(frame, scale=1):
+    # -> (int64 array of shape frame.shape, bool array, True where the cell is missing)
+    frame = pd.DataFrame(frame)
+    values = np.empty(frame.shape, dtype=float)
+    for j in range(frame.shape[1]):
+        values[:, j] = _parse_column(frame.iloc[:, j])
+    missing = np.isnan(values)
+    amounts = np.rint(np.where(missing, 0, values) * scale).astype(np.int64)
+    return amounts, missing
+
+
+def to_float(amounts, missing):
+    # The float view the analytics use: missing cells as NaN
+    return np.where(missing, np.nan, amounts.astype(float))
@@ -0,0 +1,96 @@
+import argparse
+import glob
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+import statements
+import utils
+from kpis import workbook_kpis
+
+
+# --- Batch KPIs ---
+# Computes every registry KPI for any number of IRAS-format workbooks without Streamlit, one
+# worker process per workbook (openpyxl parsing is single-threaded), and writes one combined
+# table with a row per (workbook, fiscal year):
+#   python batch_kpis.py data/iras-fs-*.xlsx -o kpis.parquet [--workers 4] [--stream]
+# The output format follows the extension: .parquet (needs pyarrow) or .csv. --stream reads
+# the statement sheets row by row (statements.read_statement_rows) instead of whole sheets,
+# which keeps each worker's memory down on large consolidated workbooks.
+# Snapshots and statement stores already built next to the workbooks (ingest.py) are used,
+# but nothing is written there: --cache-dir keeps this command's own under another directory.
+
+def _init_worker(stream, cache_dir):
+    statements.STREAM_WORKBOOKS = stream
+    if cache_dir is None:
+        utils.WRITE_SNAPSHOTS = False
+    else:
+        utils.SNAPSHOT_ROOT = cache_dir
+
+
+def _workbook_frame(path):
+    # Runs in a worker process
+    started = time.perf_counter()
+    frame = workbook_kpis(path).reset_index()
+    frame.insert(0, "workbook", path)
+    return frame, time.perf_counter() - started
+
+
+def expand_paths(patterns):
+    paths = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern)) or [pattern]
+        paths.extend(p for p in matches if p not in paths)
+    return paths
+
+
+def compute(paths, workers=None, stream=False, cache_dir=None):
+    # -> (combined frame, {path: error message}); a bad workbook does not stop the others
+    frames, errors = [], {}
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(stream, cache_dir)) as pool:
+        futures = {path: pool.submit(_workbook_frame, path) for path in paths}
+        for path, future in futures.items():
+            try:
+                frame, seconds = future.result()
+            except Exception as exc:
+                errors[path] = f"{type(exc).__name__}: {exc}"
+                continue
+            print(f"{path}: {len(frame)} years in {seconds:.2f}s", file=sys.stderr)
+            frames.append(frame)
+    combined = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+    return combined, errors
+
+
+def write(frame, output):
+    if output.endswith(".parquet"):
+        frame.to_parquet(output, index=False)
+    elif output.endswith(".csv"):
+        frame.to_csv(output, index=False)
+    else:
+        raise ValueError(f"Unsupported output format: {output!r} (use .parquet or .csv)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compute KPIs for IRAS workbooks without the dashboard")
+    parser.add_argument("workbooks", nargs="+", help="workbook paths or glob patterns")
+    parser.add_argument("-o", "--output", default="kpis.csv", help="output .parquet or .csv file")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: one per CPU)")
+    parser.add_argument("--stream", action="store_true", help="stream statement sheets row by row to save memory")
+    parser.add_argument("--cache-dir", default=None,
+                        help="keep workbook snapshots and statement stores here (default: write none)")
+    args = parser.parse_args(argv)
+
+    paths = expand_paths(args.workbooks)
+    frame, errors = compute(paths, workers=args.workers, stream=args.stream, cache_dir=args.cache_dir)
+    for path, message in errors.items():
+        print(f"{path}: failed: {message}", file=sys.stderr)
+    if not frame.empty:
+        write(frame, args.output)
+        print(f"wrote {len(frame)} rows to {args.output}")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,270 @@
+import argparse
+import glob
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import pandas as pd  # noqa: E402
+
+from utils import STATEMENT_SHEETS, read_snapshot  # noqa: E402
+
+
+# --- Benchmarks ---
+# Times every stage a page rerun goes through, per workbook:
+#   load     pd.read_excel of the whole workbook, and the Arrow snapshot read that replaces it
+#   extract  parsing each statement sheet into a Statement, and streaming it straight from
+#            the xlsx (statements.read_statement_rows)
+#   compute  evaluating the KPI registry over a workbook's line items
+#   render   preparing the KPI table (tables.py) and building the Plotly bar chart the pages
+#            draw, cold and from their data-version caches as a rerun sees them
+#   rerun    a full warm rerun of each page through streamlit's AppTest (OpenAI is stubbed)
+#   scale    load + extract on synthetic workbooks with 10x / 100x the rows
+# Results are compared with benchmarks/baseline.json; any stage slower than the baseline by
+# more than --tolerance fails the run.
+#   python benchmarks/bench.py [--save] [--only load,extract] [--scales 10,100]
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+PAGES = [
+    "Home.py",
+    "pages/1_Statement_Position.py",
+    "pages/2_Statement_Income.py",
+    "pages/3_Statement_of_Changes_in_Equity.py",
+    "pages/4_Statement_CashFlows.py",
+    "pages/5_SQL_Query.py",
+    "pages/chatbot.py",
+]
+# Differences below this are timer noise, whatever the percentage
+NOISE_FLOOR_MS = 2.0
+
+
+def measure(fn, repeat=5, setup=None):
+    # Median wall time in milliseconds
+    times = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        started = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - started) * 1000)
+    return round(statistics.median(times), 3)
+
+
+def workbooks():
+    return sorted(glob.glob(os.path.join(ROOT, "data", "iras-fs-*.xlsx")))
+
+
+# --- Stages ---
+def bench_load(results, repeat):
+    for path in workbooks():
+        name = os.path.basename(path)
+        results[f"load/read_excel/{name}"] = measure(lambda: pd.read_excel(path, sheet_name=None), repeat)
+        if read_snapshot(path) is not None:
+            results[f"load/snapshot/{name}"] = measure(lambda: read_snapshot(path), repeat)
+
+
+def bench_extract(results, repeat):
+    from statements import Statement, read_statement_rows
+    from utils import load_workbook
+
+    for path in workbooks():
+        sheets = load_workbook(path)
+        for sheet in STATEMENT_SHEETS:
+            results[f"extract/{sheet}/{os.path.basename(path)}"] = measure(lambda: Statement(sheets[sheet], name=sheet), repeat)
+        results[f"extract/stream/{os.path.basename(path)}"] = measure(
+            lambda: [Statement.from_rows(read_statement_rows(path, s)) for s in STATEMENT_SHEETS], repeat)
+
+
+def bench_compute(results, repeat):
+    from kpis import evaluate, workbook_inputs
+
+    for path in workbooks():
+        inputs = workbook_inputs(path)
+        results[f"compute/kpis/{os.path.basename(path)}"] = measure(lambda: evaluate(inputs), repeat)
+
+    from crossstatement import clear_cross_statement_cache, cross_statement
+    from insights import build_insights
+
+    data_dir = os.path.join(ROOT, "data")
+    view = cross_statement(data_dir)
+    net_cash = ("Statement of Cash Flows", "net (decrease)/increase in cash and cash equivalents")
+    operating_income = ("Statement of Com. Income", "total", "operating income")
+    results["compute/cross_statement"] = measure(lambda: cross_statement(data_dir), repeat,
+                                                 setup=clear_cross_statement_cache)
+    results["compute/cross_statement/ratio"] = measure(lambda: view.ratio(net_cash, operating_income, view.years[-1]),
+                                                       repeat)
+    # Movers and narrative for every statement from the cached view
+    results["compute/insights"] = measure(lambda: build_insights(data_dir), repeat)
+
+
+def _kpi_table():
+    from kpis import comparison, workbook_kpis
+    from tables import kpi_frame
+
+    kpis = workbook_kpis(os.path.join(ROOT, "data", "iras-fs-fy2324.xlsx"))
+    names = ["share_capital", "accumulated_surplus", "total_equity", "non_current_assets",
+             "current_assets", "current_liabilities", "net_current_assets", "non_current_liabilities"]
+    return kpi_frame({name: comparison(kpis, name) for name in names})
+
+
+def bench_render(results, repeat):
+    import plotly.graph_objects as go
+
+    from charts import cached_figure
+    from tables import clear_table_cache, prepare
+    from utils import data_version
+
+    kpi_df = _kpi_table()
+
+    def figure():
+        fig = go.Figure()
+        fig.add_trace(go.Bar(y=kpi_df["Metric"], x=kpi_df["FY2022/23"], name="FY2022/23", orientation="h"))
+        fig.add_trace(go.Bar(y=kpi_df["Metric"], x=kpi_df["FY2023/24"], name="FY2023/24", orientation="h"))
+        fig.update_layout(barmode="group", height=500, template="plotly_dark")
+        fig.to_json()
+        return fig
+
+    def cached():
+        # What a rerun pays once the spec is cached: hashing the drawn values and the lookup
+        version = data_version(list(kpi_df["Metric"]), list(kpi_df["FY2023/24"]), list(kpi_df["FY2022/23"]))
+        cached_figure("bench", version, figure)
+
+    amounts = ["FY2023/24", "FY2022/23"]
+    results["render/table"] = measure(lambda: prepare(kpi_df, amounts), repeat, setup=clear_table_cache)
+    results["render/table/cached"] = measure(lambda: prepare(kpi_df, amounts), repeat)
+    results["render/plotly"] = measure(figure, repeat)
+    results["render/plotly/cached"] = measure(cached, repeat)
+
+
+def bench_rerun(results, repeat):
+    import openai
+    from streamlit.testing.v1 import AppTest
+
+    import openai_stub
+
+    server = openai_stub.serve(port=0)
+    openai.api_base = f"http://127.0.0.1:{server.server_address[1]}/v1"
+    cwd = os.getcwd()
+    os.chdir(ROOT)
+    try:
+        for page in PAGES:
+            app = AppTest.from_file(page, default_timeout=120)
+            app.secrets["openai_api_key"] = "benchmark"
+            started = time.perf_counter()
+            app.run()
+            results[f"rerun/cold/{page}"] = round((time.perf_counter() - started) * 1000, 3)
+            if page == "pages/chatbot.py":
+                app.text_input[0].input("What is the current ratio?")
+            results[f"rerun/warm/{page}"] = measure(app.run, repeat)
+            if app.exception:
+                raise RuntimeError(f"{page} raised: {app.exception[0].message}")
+    finally:
+        os.chdir(cwd)
+        server.shutdown()
+
+
+def synthetic_workbook(path, factor, target):
+    # Every sheet's body repeated `factor` times, labels suffixed so they stay distinct
+    from statements import Statement
+    from utils import load_workbook
+
+    sheets = load_workbook(path)
+    with pd.ExcelWriter(target, engine="openpyxl") as writer:
+        for name, df in sheets.items():
+            start = Statement(df, name=name).data_start
+            head, body = df.iloc[:start], df.iloc[start:]
+            label = df.columns[0]
+            copies = []
+            for i in range(factor):
+                copy = body.copy()
+                if i:
+                    copy[label] = copy[label].map(lambda v, i=i: f"{v} ({i})" if isinstance(v, str) else v)
+                copies.append(copy)
+            pd.concat([head] + copies).to_excel(writer, sheet_name=name, index=False)
+
+
+def bench_scale(results, repeat, scales):
+    from statements import Statement, read_statement_rows
+
+    source = os.path.join(ROOT, "data", "iras-fs-fy2324.xlsx")
+    with tempfile.TemporaryDirectory() as tmp:
+        for factor in [1] + scales:
+            target = os.path.join(tmp, f"synthetic-x{factor}.xlsx")
+            synthetic_workbook(source, factor, target)
+            results[f"scale/x{factor}/read_excel"] = measure(lambda: pd.read_excel(target, sheet_name=None), max(1, repeat // 2))
+            sheets = pd.read_excel(target, sheet_name=None)
+            results[f"scale/x{factor}/extract"] = measure(
+                lambda: [Statement(sheets[s], name=s) for s in STATEMENT_SHEETS], repeat)
+            results[f"scale/x{factor}/stream"] = measure(
+                lambda: [Statement.from_rows(read_statement_rows(target, s)) for s in STATEMENT_SHEETS], max(1, repeat // 2))
+
+
+STAGES = {
+    "load": bench_load,
+    "extract": bench_extract,
+    "compute": bench_compute,
+    "render": bench_render,
+    "rerun": bench_rerun,
+    "scale": bench_scale,
+}
+
+
+# --- Baselines ---
+def compare(results, baseline, tolerance):
+    regressions = []
+    for key, ms in sorted(results.items()):
+        before = baseline.get(key)
+        if before is None:
+            status = "new"
+        elif ms > before * (1 + tolerance) and ms - before > NOISE_FLOOR_MS:
+            status = "REGRESSION"
+            regressions.append(key)
+        else:
+            status = "ok"
+        shown = "" if before is None else f"{before:10.2f}"
+        print(f"{key:70s} {ms:10.2f} {shown:>10s}  {status}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the dashboard's load, compute and render stages")
+    parser.add_argument("--only", default=",".join(STAGES), help="comma-separated stages to run")
+    parser.add_argument("--scales", default="10,100", help="row multipliers for the scale stage")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--tolerance", type=float, default=0.5, help="allowed slowdown, 0.5 = 50%%")
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument("--save", action="store_true", help="write the results as the new baseline")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for stage in args.only.split(","):
+        if stage == "scale":
+            bench_scale(results, args.repeat, [int(s) for s in args.scales.split(",") if s])
+        else:
+            STAGES[stage](results, args.repeat)
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+    print(f"{'stage':70s} {'ms':>10s} {'baseline':>10s}")
+    regressions = compare(results, baseline, args.tolerance)
+
+    if args.save:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump({**baseline, **results}, f, indent=1, sort_keys=True)
+        print(f"baseline written to {args.baseline}")
+        return 0
+    if regressions:
+        print(f"{len(regressions)} stage(s) slower than baseline: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+# --- Startup budget ---
+# Renders each page once in a fresh interpreter (like the first visit after the server
+# starts) and checks two things:
+#   - heavy libraries a page must not pull in on first render (matplotlib, plotly where no
+#     chart is drawn, openai before a question is asked, openpyxl once ingest.py has run)
+#   - the cold render time, against a budget in milliseconds
+# Exits non-zero on any violation, so it can gate CI next to benchmarks/bench.py:
+#   python benchmarks/startup.py [--scale 2.0]
+
+# Cold first render budgets (ms) with the workbook snapshots built (python ingest.py)
+BUDGETS_MS = {
+    "Home.py": 500,
+    "pages/1_Statement_Position.py": 3000,
+    "pages/2_Statement_Income.py": 3000,
+    "pages/3_Statement_of_Changes_in_Equity.py": 3000,
+    "pages/4_Statement_CashFlows.py": 3000,
+    "pages/5_SQL_Query.py": 3000,
+    "pages/chatbot.py": 1500,
+}
+FORBIDDEN_MODULES = {
+    "Home.py": ["matplotlib", "plotly", "openai", "openpyxl"],
+    "pages/1_Statement_Position.py": ["matplotlib", "openai", "openpyxl"],
+    "pages/2_Statement_Income.py": ["matplotlib", "openai", "openpyxl"],
+    "pages/3_Statement_of_Changes_in_Equity.py": ["matplotlib", "openai", "openpyxl"],
+    "pages/4_Statement_CashFlows.py": ["matplotlib", "openai", "openpyxl"],
+    "pages/5_SQL_Query.py": ["matplotlib", "plotly", "openai", "openpyxl"],
+    "pages/chatbot.py": ["matplotlib", "plotly", "openai", "openpyxl"],
+}
+
+_PROBE = """
+import json, sys, time
+from streamlit.testing.v1 import AppTest
+before = set(sys.modules)
+app = AppTest.from_file(sys.argv[1], default_timeout=120)
+app.secrets["openai_api_key"] = "startup-check"
+started = time.perf_counter()
+app.run()
+elapsed = (time.perf_counter() - started) * 1000
+loaded = sorted({name.split(".")[0] for name in set(sys.modules) - before})
+print(json.dumps({"ms": elapsed, "loaded": loaded, "errors": [e.message for e in app.exception]}))
+"""
+
+
+def probe(page, cwd=ROOT):
+    # Renders from `cwd`, whose data/ the page reads (the tests pass a scratch copy)
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [ROOT, os.environ.get("PYTHONPATH")])))
+    output = subprocess.run([sys.executable, "-c", _PROBE, os.path.join(ROOT, page)], cwd=cwd, env=env,
+                            capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check the pages' cold-start imports and render time")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiply every budget, e.g. for slow CI machines")
+    args = parser.parse_args(argv)
+
+    failures = []
+    for page, budget in BUDGETS_MS.items():
+        result = probe(page)
+        budget *= args.scale
+        heavy = [m for m in FORBIDDEN_MODULES[page] if m in result["loaded"]]
+        problems = list(result["errors"])
+        if heavy:
+            problems.append(f"imported {', '.join(heavy)}")
+        if result["ms"] > budget:
+            problems.append(f"{result['ms']:.0f}ms over the {budget:.0f}ms budget")
+        print(f"{page:45s} {result['ms']:8.0f}ms / {budget:.0f}ms  {'; '.join(problems) or 'ok'}")
+        failures.extend(f"{page}: {p}" for p in problems)
+
+    if failures:
+        print(f"{len(failures)} startup budget violation(s)")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,56 @@
+import html
+
+import streamlit as st
+
+
+# --- KPI card grids ---
+# Every card used to be its own st.markdown call: one websocket delta and one DOM update
+# per metric, plus st.columns containers around them. A grid is now rendered as a single
+# HTML block (CSS grid, one column div per page column), so a rerun sends one delta per
+# grid however many metrics or years it shows. The templates are built once at import.
+
+_GRID = ('<div style="display:grid;grid-template-columns:repeat({count},minmax(0,1fr));'
+         'column-gap:1rem">{columns}</div>')
+_COLUMN = "<div>{cards}</div>"
+
+# Headline ratios ("Equity/Assets Ratio  72.15%")
+_RATIO_CARD = ('<div style="padding-bottom:1rem">'
+               '<div style="font-size:1.5rem;color:black;font-weight:800">{label}</div>'
+               '<div style="font-size:1.5rem;font-weight:bold;color:{color}">{value}</div>'
+               '</div>')
+
+# Quick-view line items: latest value and the change against the previous year
+_METRIC_CARD = ('<div style="padding-bottom:1rem">'
+                '<div style="font-size:1.5rem;color:white;font-weight:800">{label}</div>'
+                '<div style="font-size:1.5rem;font-weight:bold">{value:,}</div>'
+                '<div style="color:{color}; font-size:0.9rem">{arrow} {change:.2f}%</div>'
+                '</div>')
+
+_TRENDS = {1: ("🟢 ↑", "green"), -1: ("🔴 ↓", "red"), 0: ("➖", "gray")}
+
+
+def ratio_card(label, value, color="deepskyblue"):
+    return _RATIO_CARD.format(label=html.escape(label), value=value, color=color)
+
+
+def metric_card(label, value, pct):
+    arrow, color = _TRENDS[(pct > 0) - (pct < 0)]
+    return _METRIC_CARD.format(label=html.escape(label), value=value, color=color, arrow=arrow, change=abs(pct))
+
+
+def card_grid(columns):
+    # `columns` is a list of columns, each a list of card HTML strings, drawn left to right
+    body = "".join(_COLUMN.format(cards="".join(cards)) for cards in columns)
+    st.markdown(_GRID.format(count=len(columns), columns=body), unsafe_allow_html=True)
+
+
+def split_columns(items, count):
+    # Earlier columns get the smaller share, as the pages' `half = len(...) // 2` split did
+    bounds = [len(items) * i // count for i in range(count + 1)]
+    return [items[bounds[i]:bounds[i + 1]] for i in range(count)]
+
+
+def metric_grid(kpi_results, count=2):
+    # {label: (latest, previous, % change)} -> one grid of metric cards
+    cards = [metric_card(label, latest, pct) for label, (latest, _, pct) in kpi_results.items()]
+    card_grid(split_columns(cards, count))
@@ -0,0 +1,123 @@
+import json
+
+import streamlit as st
+
+from utils import LRUCache, data_version
+
+
+# --- Cached Plotly figures ---
+# The pages used to rebuild their go.Figure on every rerun and st.plotly_chart then validated
+# and serialized it again, though the numbers only change with the workbook. Figures are now
+# built once per data version (a hash of exactly the values drawn), kept as their JSON spec,
+# and a rerun sends that spec to the frontend as is. plotly is only imported on a cache miss.
+# The spec goes into the same container st.plotly_chart would use (the innermost `with`
+# block, or the container passed in); on a Streamlit whose chart message no longer has the
+# field it is written to, or whose _enqueue rejects the call, the public st.plotly_chart is
+# used instead. requirements.txt pins the Streamlit this was written against.
+
+MAX_CACHED_FIGURES = 32
+_figure_cache = LRUCache(MAX_CACHED_FIGURES)  # (chart kind, data version) -> figure JSON
+
+# Same config st.plotly_chart sends by default
+_CONFIG = json.dumps({"showLink": False, "linkText": False})
+
+# Multi-year charts switch to compact mode (WebGL lines instead of grouped bars) past these
+MAX_BAR_YEARS = 6
+MAX_BAR_POINTS = 120
+
+_LAYOUT = dict(
+    title="📊 Year-on-Year KPI Comparison",
+    xaxis_title="Amount (SGD)",
+    yaxis_title="Metric",
+    height=500,
+    template="plotly_dark",
+    legend=dict(orientation="h", y=-0.2, x=0.3),
+)
+
+
+def cached_figure(kind, version, build):
+    # build() -> go.Figure, only called when this (kind, version) has no spec yet
+    return _figure_cache.get_or_build((kind, version), lambda: build().to_json())
+
+
+def _spec_proto():
+    # The PlotlyChart message if it still carries the figure spec as Streamlit 1.33 sends it
+    from streamlit.proto.PlotlyChart_pb2 import PlotlyChart as PlotlyChartProto
+
+    if "figure" not in PlotlyChartProto.DESCRIPTOR.fields_by_name or not hasattr(st._main, "_enqueue"):
+        return None
+    return PlotlyChartProto()
+
+
+def show_figure(spec, container=None, use_container_width=True):
+    # Enqueues the stored spec the way st.plotly_chart does after its own marshalling
+    dg = st._main if container is None else container
+    proto = _spec_proto()
+    if proto is not None:
+        try:
+            proto.figure.spec = spec
+            proto.figure.config = _CONFIG
+            proto.use_container_width = use_container_width
+            proto.theme = "streamlit"
+            # _enqueue resolves the active container, as every st.* element does
+            return dg._enqueue("plotly_chart", proto)
+        except (AttributeError, TypeError, ValueError):
+            # The message or _enqueue changed shape in another Streamlit: nothing was enqueued
+            pass
+    import plotly.io as pio
+
+    return dg.plotly_chart(pio.from_json(spec), use_container_width=use_container_width)
+
+
+def clear_figure_cache():
+    _figure_cache.clear()
+
+
+# --- Charts ---
+def _comparison_figure(labels, current, previous, years):
+    import plotly.graph_objects as go
+
+    fig = go.Figure()
+    fig.add_trace(go.Bar(y=labels, x=previous, name=years[1], orientation='h', marker_color='lightblue'))
+    fig.add_trace(go.Bar(y=labels, x=current, name=years[0], orientation='h', marker_color='dodgerblue'))
+    fig.update_layout(barmode='group', **_LAYOUT)
+    return fig
+
+
+def comparison_chart(kpi_results, years=("FY2023/24", "FY2022/23"), container=None):
+    # {label: (latest, previous, % change)} -> horizontal grouped bars, latest year on top
+    labels = list(kpi_results.keys())
+    current = [v[0] for v in kpi_results.values()]
+    previous = [v[1] for v in kpi_results.values()]
+    version = data_version(labels, current, previous, list(years))
+    show_figure(cached_figure("comparison", version, lambda: _comparison_figure(labels, current, previous, years)),
+                container)
+
+
+def _history_figure(frame, compact):
+    import plotly.graph_objects as go
+
+    fig = go.Figure()
+    years = [str(year) for year in frame.index]
+    if compact:
+        # One WebGL line per line item across the years; scales to long histories
+        for label in frame.columns:
+            fig.add_trace(go.Scattergl(x=years, y=frame[label].to_numpy(), name=label, mode="lines"))
+        fig.update_layout(**{**_LAYOUT, "title": "📈 KPI History", "xaxis_title": "Fiscal year",
+                             "yaxis_title": "Amount (SGD)", "hovermode": "x unified"})
+    else:
+        labels = list(frame.columns)
+        for year, row in zip(years, frame.itertuples(index=False)):
+            fig.add_trace(go.Bar(y=labels, x=list(row), name=year, orientation='h'))
+        fig.update_layout(barmode='group', **{**_LAYOUT, "title": "📊 KPI History"})
+    return fig
+
+
+def history_chart(history, names, compact=None, container=None):
+    # history: history_kpis() frame; names: {label: KPI name}. compact=None decides by size
+    frame = history[list(names.values())].set_axis(list(names), axis=1)
+    frame = frame.dropna(how="all")
+    if compact is None:
+        compact = len(frame) > MAX_BAR_YEARS or frame.size > MAX_BAR_POINTS
+    version = data_version(frame, compact)
+    show_figure(cached_figure("history", version, lambda: _history_figure(frame, compact)), container)
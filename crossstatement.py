@@ -0,0 +1,104 @@
+import numpy as np
+import pandas as pd
+
+from equity import EQUITY, MOVEMENTS, equity_history
+from statements import normalize_label
+from timeseries import DATA_DIR, discover_workbooks, fiscal_year_start, safe_divide, statement_history
+from utils import STATEMENT_SHEETS, LRUCache, workbook_key
+
+
+# --- Cross-statement view ---
+# Ratios that span sheets (net cash movement over operating income, dividends over
+# accumulated surplus) used to mean a page loading the other statement itself. Every
+# statement in data/ is lined up here on one fiscal-year axis, once per data version: one
+# (year x line item) array keyed by (statement, section, line item), with dict indexes on
+# both axes, so any cross-statement figure or ratio is a couple of dict hits and an array
+# read. The equity statement contributes (statement, component, movement) columns.
+#   view = cross_statement()
+#   view.value("Statement of Com. Income", "operating surplus")              # latest year
+#   view.ratio(("Statement of Cash Flows", "net (decrease)/increase in cash and cash equivalents"),
+#              ("Statement of Com. Income", "total", "operating income"))      # every year
+#   view.year("FY2023/24")    # {(statement, section, line item): value}
+
+
+class CrossStatement:
+    def __init__(self, frames):
+        # frames: {statement: year-indexed frame with (section, line item) columns}
+        years = sorted(set().union(*(frame.index for frame in frames.values())), key=fiscal_year_start)
+        columns, blocks = [], []
+        for statement, frame in frames.items():
+            columns += [(statement, section, label) for section, label in frame.columns]
+            blocks.append(frame.reindex(years).to_numpy(dtype=float))
+        self.years = years
+        self.columns = pd.MultiIndex.from_tuples(columns, names=["statement", "section", "line_item"])
+        self.values = np.hstack(blocks)  # NaN where a statement does not report a year
+
+        self._year_index = {year: i for i, year in enumerate(years)}
+        self._column_index, self._label_index = {}, {}
+        for i, key in enumerate(columns):
+            self._column_index.setdefault(key, i)
+            self._label_index.setdefault((key[0], key[2]), i)
+        self._rows = {}
+
+    def column(self, statement, label, section=None):
+        # Position of a line item; without a section the first line with that label
+        label = normalize_label(label)
+        if section is None:
+            return self._label_index[(statement, label)]
+        return self._column_index[(statement, normalize_label(section), label)]
+
+    def value(self, statement, label, year=None, section=None):
+        # One figure (NaN if not reported that year); the latest year by default
+        row = len(self.years) - 1 if year is None else self._year_index[year]
+        return self.values[row, self.column(statement, label, section)]
+
+    def series(self, statement, label, section=None):
+        col = self.column(statement, label, section)
+        return pd.Series(self.values[:, col], index=pd.Index(self.years, name="fiscal_year"),
+                         name=normalize_label(label))
+
+    def ratio(self, numerator, denominator, year=None):
+        # numerator/denominator: (statement, label) or (statement, label, section). NaN on x/0;
+        # every year at once when no year is given
+        if year is not None:
+            return float(safe_divide(self.value(*numerator[:2], year, *numerator[2:]),
+                                     self.value(*denominator[:2], year, *denominator[2:])))
+        return safe_divide(self.series(*numerator), self.series(*denominator))
+
+    def year(self, year):
+        # Every figure of one fiscal year across all statements, built on first use
+        if year not in self._rows:
+            row = self.values[self._year_index[year]]
+            self._rows[year] = dict(zip(self.columns, row.tolist()))
+        return self._rows[year]
+
+    def frame(self):
+        return pd.DataFrame(self.values, index=pd.Index(self.years, name="fiscal_year"), columns=self.columns)
+
+
+def _equity_frame(data_dir):
+    history = equity_history(data_dir)
+    frames = {component: history.frame(component) for component in history.components}
+    frame = pd.concat(frames, axis=1, names=["section", "line_item"])
+    return frame[[(c, m) for c in history.components for m in MOVEMENTS]]
+
+
+def _build_view(data_dir):
+    frames = {sheet: statement_history(sheet, data_dir) for sheet in STATEMENT_SHEETS if sheet != EQUITY}
+    frames[EQUITY] = _equity_frame(data_dir)
+    return CrossStatement({sheet: frames[sheet] for sheet in STATEMENT_SHEETS})
+
+
+MAX_CACHED_VIEWS = 4
+_view_cache = LRUCache(MAX_CACHED_VIEWS)  # workbook keys -> CrossStatement
+
+
+def cross_statement(data_dir=DATA_DIR):
+    paths = discover_workbooks(data_dir)
+    if not paths:
+        raise FileNotFoundError(f"No workbooks found in {data_dir!r}")
+    return _view_cache.get_or_build(tuple(workbook_key(p) for p in paths), lambda: _build_view(data_dir))
+
+
+def clear_cross_statement_cache():
+    _view_cache.clear()
@@ -0,0 +1,196 @@
+import os
+import sqlite3
+import threading
+
+import pandas as pd
+
+from statements import load_statement, normalize_label
+from timeseries import DATA_DIR, SUBTOTAL_LABEL, discover_workbooks, fiscal_year_start
+from utils import STATEMENT_SHEETS, iter_sheet_rows, workbook_sha256
+
+
+# --- Line-item database ---
+# Every line item of every workbook in data/, one row per (workbook, statement, line, fiscal
+# year), in an embedded SQLite file so any figure across any number of workbooks is one
+# indexed query away instead of a re-parse:
+#   python ingest.py                                   # (re)imports changed workbooks only
+#   database.line_item_history("Statement of Financial Position", "total equity")
+# A workbook is re-imported only when its sha256 differs from the one recorded at import.
+# Comparative years appear in two workbooks; queries take a fiscal year from the newest
+# workbook that reports it (the `published` year), as timeseries.statement_history does.
+# Only statements laid out by fiscal year are imported: the equity statement's columns are
+# equity components, not years.
+
+DB_PATH = os.environ.get("DASHBOARD_DB", os.path.join(DATA_DIR, "line_items.sqlite"))
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS workbooks (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    sha256 TEXT NOT NULL,
+    entity TEXT,
+    published INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS line_items (
+    workbook_id INTEGER NOT NULL REFERENCES workbooks(id) ON DELETE CASCADE,
+    entity TEXT,
+    published INTEGER NOT NULL,
+    fiscal_year TEXT NOT NULL,
+    statement TEXT NOT NULL,
+    section TEXT NOT NULL,
+    line_item TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    value INTEGER,
+    scale INTEGER NOT NULL,
+    PRIMARY KEY (workbook_id, statement, position, fiscal_year)
+) WITHOUT ROWID;
+-- Covering indexes: a line item's history, and everything reported for one fiscal year,
+-- are answered from the index alone
+CREATE INDEX IF NOT EXISTS line_items_by_item
+    ON line_items (statement, line_item, section, fiscal_year, published, value);
+CREATE INDEX IF NOT EXISTS line_items_by_year
+    ON line_items (fiscal_year, statement, section, line_item, published, value);
+"""
+
+_local = threading.local()  # one connection per thread and database file
+
+
+def connect(db_path=None):
+    db_path = os.path.abspath(db_path or DB_PATH)
+    connections = getattr(_local, "connections", None)
+    if connections is None:
+        connections = _local.connections = {}
+    conn = connections.get(db_path)
+    if conn is None:
+        conn = sqlite3.connect(db_path)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")  # readers are never blocked by an import
+        except sqlite3.OperationalError:
+            pass  # read-only file or directory: stay on the default journal, reads still work
+        conn.execute("PRAGMA foreign_keys=ON")
+        if conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            with conn:
+                conn.execute("DROP TABLE IF EXISTS line_items")
+                conn.execute("DROP TABLE IF EXISTS workbooks")
+                conn.executescript(SCHEMA)
+                conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+        connections[db_path] = conn
+    return conn
+
+
+def close(db_path=None):
+    conn = getattr(_local, "connections", {}).pop(os.path.abspath(db_path or DB_PATH), None)
+    if conn is not None:
+        conn.close()
+
+
+# --- Import ---
+def _entity(path):
+    # The title cell above the first statement, e.g. "INLAND REVENUE AUTHORITY OF SINGAPORE"
+    rows = iter_sheet_rows(path, STATEMENT_SHEETS[0])
+    try:
+        first = next(rows, ())
+    finally:
+        rows.close()
+    return next((str(v).strip() for v in first if v is not None and str(v).strip()), None)
+
+
+def _published(path):
+    # The workbook's own (latest) fiscal year
+    return max(fiscal_year_start(p) or 0 for p in load_statement(STATEMENT_SHEETS[0], path).periods)
+
+
+def _line_item_rows(path, workbook_id, entity, published):
+    for sheet in STATEMENT_SHEETS:
+        statement = load_statement(sheet, path)
+        years = [fiscal_year_start(p) for p in statement.periods]
+        if not all(years):
+            continue
+        items = statement.items
+        for pos, (label, section) in enumerate(zip(items["label"], items["section"])):
+            # Same naming as timeseries: unlabelled totals outside a section are skipped
+            if not label and section is None:
+                continue
+            for col, period in enumerate(statement.periods):
+                value = None if statement.missing[pos, col] else int(statement.amounts[pos, col])
+                yield (workbook_id, entity, published, period, sheet, section or "", label or SUBTOTAL_LABEL,
+                       pos, value, statement.scale)
+
+
+def ingest(paths=None, db_path=None, force=False):
+    # Imports workbooks whose hash changed (all of data/ by default); returns those imported.
+    # Workbooks that no longer exist on disk are dropped.
+    paths = discover_workbooks() if paths is None else paths
+    conn = connect(db_path)
+    imported = []
+    for path in paths:
+        key, sha = os.path.abspath(path), workbook_sha256(path)
+        row = conn.execute("SELECT id, sha256 FROM workbooks WHERE path = ?", (key,)).fetchone()
+        if row and row[1] == sha and not force:
+            continue
+        entity, published = _entity(path), _published(path)
+        with conn:
+            conn.execute(
+                "INSERT INTO workbooks (path, sha256, entity, published) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(path) DO UPDATE SET sha256 = excluded.sha256, entity = excluded.entity, "
+                "published = excluded.published",
+                (key, sha, entity, published))
+            workbook_id = conn.execute("SELECT id FROM workbooks WHERE path = ?", (key,)).fetchone()[0]
+            conn.execute("DELETE FROM line_items WHERE workbook_id = ?", (workbook_id,))
+            conn.executemany("INSERT INTO line_items VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                             _line_item_rows(path, workbook_id, entity, published))
+        imported.append(path)
+    with conn:
+        for workbook_id, path in conn.execute("SELECT id, path FROM workbooks").fetchall():
+            if not os.path.exists(path):
+                conn.execute("DELETE FROM workbooks WHERE id = ?", (workbook_id,))
+    return imported
+
+
+# --- Queries ---
+def query(sql, params=(), db_path=None):
+    return pd.read_sql_query(sql, connect(db_path), params=params)
+
+
+# Rows of the newest workbook reporting each fiscal year
+_LATEST = """
+    published = (SELECT MAX(published) FROM line_items latest
+                 WHERE latest.statement = line_items.statement AND latest.fiscal_year = line_items.fiscal_year)
+"""
+
+
+def line_item_history(statement, line_item, section=None, db_path=None):
+    # One line item as a year-indexed Series, oldest year first. Blank cells read as 0 (a
+    # reported nil), as everywhere else in the dashboard; a repeated label gives its first line
+    sql = ("SELECT fiscal_year, COALESCE(value, 0), MIN(position) FROM line_items "
+           f"WHERE statement = ? AND line_item = ? AND {_LATEST}")
+    params = [statement, normalize_label(line_item)]
+    if section is not None:
+        sql += " AND section = ?"
+        params.append(normalize_label(section))
+    sql += " GROUP BY fiscal_year"
+    rows = connect(db_path).execute(sql, params).fetchall()
+    rows.sort(key=lambda r: fiscal_year_start(r[0]))
+    return pd.Series([r[1] for r in rows], index=pd.Index([r[0] for r in rows], name="fiscal_year"),
+                     name=normalize_label(line_item), dtype="int64")
+
+
+def statement_history(statement, db_path=None):
+    # The frame timeseries.statement_history builds, read from the database
+    rows = query("SELECT published, fiscal_year, section, line_item, position, value FROM line_items "
+                 "WHERE statement = ? ORDER BY published, position", (statement,), db_path)
+    if rows.empty:
+        raise KeyError(f"No line items for {statement!r} in the database")
+    # Repeated labels keep their first line, as in each workbook's own frame
+    rows = rows.drop_duplicates(["published", "fiscal_year", "section", "line_item"])
+    columns = pd.MultiIndex.from_frame(rows[["section", "line_item"]].drop_duplicates(),
+                                       names=["section", "line_item"])
+    latest = rows.groupby("fiscal_year")["published"].transform("max")
+    rows = rows[rows["published"] == latest].fillna({"value": 0})
+    # Line items missing from a year's workbook stay NaN
+    history = rows.pivot(index="fiscal_year", columns=["section", "line_item"], values="value")
+    history = history.reindex(columns=columns)
+    history = history.iloc[sorted(range(len(history)), key=lambda i: fiscal_year_start(history.index[i]))]
+    history.index.name = "fiscal_year"
+    return history
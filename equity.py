@@ -0,0 +1,122 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+from statements import load_statement, normalize_label
+from timeseries import DATA_DIR, discover_workbooks, fiscal_year_start
+from utils import DEFAULT_WORKBOOK, LRUCache, workbook_key
+
+
+# --- Changes in equity ---
+# The equity statement is laid out by equity component (share capital, accumulated surplus,
+# total) rather than by year: each fiscal year is a block of rows from one "Balance as at"
+# line to the next. The page used to read single cells by position (iloc[15, 7]); the sheet
+# is now parsed into a year x movement x component matrix, so every year's roll-forward
+#   opening + comprehensive income + dividends (+ other movements) = closing
+# is one array operation (dividends are reported negative). kpis.py joins the movements
+# onto the other statements' fiscal years through EquityMovement line items.
+#   equity_matrix().movement("dividends")      # year-indexed Series, "total" column
+#   equity_history().differences()             # 0 wherever a year reconciles
+
+EQUITY = "Statement of Changes in Equity"
+
+MOVEMENTS = ["opening", "comprehensive_income", "dividends", "other", "closing"]
+OPENING, COMPREHENSIVE_INCOME, DIVIDENDS, OTHER, CLOSING = range(len(MOVEMENTS))
+
+# Movement lines by label; any other labelled line counts as "other"
+MOVEMENT_LABELS = {
+    "total comprehensive income for the financial year": COMPREHENSIVE_INCOME,
+    "dividends": DIVIDENDS,
+}
+
+BALANCE_PATTERN = re.compile(r"^balance as at \d{1,2} [a-z]+ (\d{4})$")
+
+
+def _fiscal_year(balance_label):
+    # "balance as at 31 march 2023" closes FY2022/23 (IRAS's year ends 31 March)
+    year = int(BALANCE_PATTERN.match(balance_label).group(1))
+    return f"FY{year - 1}/{year % 100:02d}"
+
+
+class EquityMatrix:
+    def __init__(self, years, components, values):
+        self.years = list(years)
+        self.components = list(components)
+        # int64, shape (year, movement, component), oldest year first
+        self.values = values
+
+    @classmethod
+    def from_statement(cls, statement):
+        items = statement.items
+        labels = items["label"].to_numpy(dtype=object)
+        balance = np.flatnonzero([bool(BALANCE_PATTERN.match(label)) for label in labels])
+        if len(balance) < 2:
+            raise ValueError(f"{statement.name!r} has no opening and closing balance lines")
+
+        # Block of every row: block k runs from balance line k to balance line k + 1
+        block = np.searchsorted(balance, np.arange(len(items)), side="right") - 1
+        movement = np.array([MOVEMENT_LABELS.get(label, OTHER) for label in labels])
+        rows = np.flatnonzero((block >= 0) & (block < len(balance) - 1) & (items["kind"] == "item").to_numpy())
+        rows = np.setdiff1d(rows, balance)
+
+        values = np.zeros((len(balance) - 1, len(MOVEMENTS), len(statement.periods)), dtype=np.int64)
+        values[:, OPENING] = statement.amounts[balance[:-1]]
+        values[:, CLOSING] = statement.amounts[balance[1:]]
+        np.add.at(values, (block[rows], movement[rows]), statement.amounts[rows])
+
+        years = [_fiscal_year(labels[pos]) for pos in balance[1:]]
+        return cls(years, [normalize_label(p) for p in statement.periods], values)
+
+    @classmethod
+    def combine(cls, matrices):
+        # Later matrices win for a year reported twice (a restated comparative)
+        latest = {}
+        for matrix in matrices:
+            for i, year in enumerate(matrix.years):
+                latest[year] = (matrix, i)
+        years = sorted(latest, key=fiscal_year_start)
+        components = matrices[-1].components
+        values = np.stack([
+            latest[year][0].values[latest[year][1]][:, [latest[year][0].components.index(c) for c in components]]
+            for year in years
+        ])
+        return cls(years, components, values)
+
+    def movement(self, name, component="total"):
+        values = self.values[:, MOVEMENTS.index(name), self.components.index(normalize_label(component))]
+        return pd.Series(values, index=pd.Index(self.years, name="fiscal_year"), name=name)
+
+    def roll_forward(self):
+        # Closing balance implied by the opening balance and the movements, for every year
+        # and component at once -> (year, component)
+        return self.values[:, OPENING] + self.values[:, OPENING + 1:CLOSING].sum(axis=1)
+
+    def differences(self):
+        # Reported minus implied closing balance; non-zero where a year does not reconcile
+        return pd.DataFrame(self.values[:, CLOSING] - self.roll_forward(),
+                            index=pd.Index(self.years, name="fiscal_year"), columns=self.components)
+
+    def frame(self, component="total"):
+        # One row per fiscal year, one column per movement
+        col = self.components.index(normalize_label(component))
+        return pd.DataFrame(self.values[:, :, col], index=pd.Index(self.years, name="fiscal_year"),
+                            columns=MOVEMENTS)
+
+
+MAX_CACHED_MATRICES = 16
+_matrix_cache = LRUCache(MAX_CACHED_MATRICES)  # workbook key(s) -> EquityMatrix
+
+
+def equity_matrix(path=DEFAULT_WORKBOOK):
+    return _matrix_cache.get_or_build(workbook_key(path),
+                                      lambda: EquityMatrix.from_statement(load_statement(EQUITY, path)))
+
+
+def equity_history(data_dir=DATA_DIR):
+    # Every fiscal year found in data/, as one matrix
+    paths = discover_workbooks(data_dir)
+    if not paths:
+        raise FileNotFoundError(f"No workbooks found in {data_dir!r}")
+    key = tuple(workbook_key(p) for p in paths)
+    return _matrix_cache.get_or_build(key, lambda: EquityMatrix.combine([equity_matrix(p) for p in paths]))
@@ -0,0 +1,56 @@
+import argparse
+
+import database
+from insights import insights_path, refresh_insights
+from kpi_context import build_contexts
+from statements import build_stores
+from timeseries import discover_workbooks
+from utils import build_snapshots
+
+
+# --- Ingestion ---
+# Pre-builds the columnar snapshot of every data/iras-fs-*.xlsx so that a fresh container
+# never has to run openpyxl on the request path, the shared statement store every Streamlit
+# process attaches to (statements.py), the SQLite line-item database (database.py), each
+# workbook's KPI context for the chatbot (kpi_context.py) and Home's business insights
+# (insights.py). Safe to run on every deploy: workbooks whose hash has not changed are skipped.
+#   python ingest.py [--data-dir data] [--force]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build snapshots, statement stores, the line-item database, KPI contexts and insights of the IRAS workbooks")
+    parser.add_argument("--data-dir", default="data")
+    parser.add_argument("--force", action="store_true", help="rebuild even if the workbook is unchanged")
+    args = parser.parse_args(argv)
+
+    built = build_snapshots(args.data_dir, force=args.force)
+    for path in built:
+        print(f"snapshot rebuilt: {path}")
+    if not built:
+        print("all snapshots up to date")
+
+    stores = build_stores(discover_workbooks(args.data_dir), force=args.force)
+    for path in stores:
+        print(f"statement store rebuilt: {path}")
+    if not stores:
+        print("all statement stores up to date")
+
+    imported = database.ingest(discover_workbooks(args.data_dir), force=args.force)
+    for path in imported:
+        print(f"line items imported: {path}")
+    if not imported:
+        print(f"line-item database up to date ({database.DB_PATH})")
+
+    contexts = build_contexts(discover_workbooks(args.data_dir), force=args.force)
+    for path in contexts:
+        print(f"KPI context rebuilt: {path}")
+    if not contexts:
+        print("all KPI contexts up to date")
+
+    if refresh_insights(args.data_dir, force=args.force):
+        print(f"business insights rebuilt: {insights_path(args.data_dir)}")
+    else:
+        print("business insights up to date")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,242 @@
+import glob
+import hashlib
+import json
+import os
+
+from utils import LRUCache, replace_atomically, workbook_sha256
+
+
+# --- Business insights ---
+# Home's "Business Insights" bullets were typed by hand ("Total Equity increased by +7.42%")
+# and went stale with every new workbook. They are now generated: the year-on-year change of
+# every line item of every statement (crossstatement.py) is computed in one array pass, each
+# statement's lines are ranked by absolute change and, among material lines, by relative
+# change, and the top movers are written up from templates. Changes follow statements.yoy,
+# the convention of every page's KPI table: relative to the previous year's signed figure.
+# The result is cached per data version (the workbooks' sha256) in data/insights.json,
+# written by ingest.py, so Home only reads a small JSON file and never imports pandas (utils
+# imports it lazily for the same reason):
+#   python ingest.py
+#   insights.statement_insights("Statement of Financial Position")   # markdown bullets
+
+INSIGHTS_VERSION = 2
+INSIGHTS_FILE = "insights.json"
+DATA_DIR = "data"
+# Same as timeseries.WORKBOOK_GLOB; importing timeseries here would pull in pandas
+WORKBOOK_GLOB = "iras-fs-fy*.xlsx"
+
+# Movers per statement: the largest absolute changes, then the largest relative changes
+# among lines worth at least MATERIALITY of the statement's total
+TOP_ABSOLUTE = 3
+TOP_RELATIVE = 2
+MATERIALITY = 0.01
+# What a statement's lines are measured against, the sum of these (section, line item)
+# figures: total assets, revenue, net cash flow and closing total equity
+STATEMENT_TOTALS = {
+    "Statement of Financial Position": [("non-current assets", "total"), ("current assets", "total")],
+    "Statement of Com. Income": [("operating income", "total")],
+    "Statement of Cash Flows": [("", "net (decrease)/increase in cash and cash equivalents")],
+    "Statement of Changes in Equity": [("total", "closing")],
+}
+# Memorandum sections that are not part of the statement's own figures (the trust funds IRAS
+# administers); they are left out of the ranking
+MEMO_SECTIONS = {("Statement of Financial Position", "net assets of")}
+# A relative change at least this large (%) is described as a surge or a sharp drop
+SHARP_CHANGE_PCT = 50
+
+EQUITY = "Statement of Changes in Equity"
+# Equity movements of the total column; opening and closing repeat the other years' figures
+EQUITY_MOVEMENTS = {
+    "comprehensive_income": "Total comprehensive income",
+    "dividends": "Dividends",
+    "other": "Other equity movements",
+}
+
+
+# --- Data version ---
+def data_version(data_dir=DATA_DIR):
+    # Changes whenever a workbook is added, removed or edited, or the templates change
+    workbooks = sorted(glob.glob(os.path.join(data_dir, WORKBOOK_GLOB)))
+    spec = [INSIGHTS_VERSION, [(os.path.basename(p), workbook_sha256(p)) for p in workbooks]]
+    return hashlib.sha1(json.dumps(spec).encode("utf-8")).hexdigest()[:16]
+
+
+# --- Ranking ---
+def _name(statement, section, line_item, repeated):
+    if statement == EQUITY:
+        return EQUITY_MOVEMENTS[line_item]
+    if line_item == "total":
+        text = f"total {section}"
+    else:
+        text = f"{line_item} ({section})" if repeated else line_item
+    return text[0].upper() + text[1:]
+
+
+def _verb(pct):
+    if pct >= SHARP_CHANGE_PCT:
+        return "surged"
+    if pct > 0:
+        return "rose"
+    if pct <= -SHARP_CHANGE_PCT:
+        return "dropped sharply"
+    if pct < 0:
+        return "fell"
+    return "was unchanged"
+
+
+def narrative(mover):
+    # One markdown bullet; figures in S$'000 as on the pages
+    name, previous, latest = mover["name"], mover["previous"], mover["latest"]
+    if previous == 0:
+        return f"- **{name}** was **{latest:,.0f}**, from nil the year before."
+    if latest == previous:
+        return f"- **{name}** was unchanged at **{latest:,.0f}**."
+    if previous * latest < 0:
+        # A % change across zero reads backwards (a loss turning into income is "-415%")
+        return f"- **{name}** swung from **{previous:,.0f}** to **{latest:,.0f}**."
+    return (f"- **{name}** {_verb(mover['pct'])} **{mover['pct']:+.2f}%** to **{latest:,.0f}** "
+            f"({mover['change']:+,.0f}).")
+
+
+def movers(view):
+    # Year-on-year change of every line item in the view's latest year, one row per line
+    import numpy as np
+    import pandas as pd
+
+    from timeseries import safe_divide
+
+    frame = view.frame()
+    columns = frame.columns
+    # Each statement's total, the larger of its previous and latest figure
+    totals = {}
+    for statement, lines in STATEMENT_TOTALS.items():
+        pair = frame[[(statement, *line) for line in lines]].to_numpy(dtype=float)[-2:].sum(axis=1)
+        totals[statement] = np.nanmax(np.abs(pair))
+    keep = np.array([(s, sec) not in MEMO_SECTIONS and (s != EQUITY or (sec == "total" and item in EQUITY_MOVEMENTS))
+                     for s, sec, item in columns])
+    values = frame.to_numpy(dtype=float)[:, keep]
+    columns = columns[keep]
+
+    previous, latest = values[-2], values[-1]
+    change = latest - previous
+    pct = safe_divide(change, previous) * 100
+    table = pd.DataFrame({
+        "statement": columns.get_level_values("statement"),
+        "section": columns.get_level_values("section"),
+        "line_item": columns.get_level_values("line_item"),
+        "previous": previous,
+        "latest": latest,
+        "change": change,
+        "pct": np.round(pct, 2),
+    })
+    table = table.dropna(subset=["previous", "latest"])
+
+    size = np.maximum(table["previous"].abs(), table["latest"].abs())
+    table["material"] = size >= MATERIALITY * table["statement"].map(totals)
+    repeated = table.duplicated(["statement", "line_item"], keep=False)
+    table["name"] = [_name(*key, r) for key, r in zip(table[["statement", "section", "line_item"]].itertuples(index=False),
+                                                      repeated)]
+    return table
+
+
+def rank(table):
+    # {statement: [mover, ...]}: largest absolute changes first, then the fastest movers
+    ranked = {}
+    for statement, lines in table.groupby("statement", sort=False):
+        lines = lines[lines["change"] != 0]
+        absolute = lines.loc[lines["change"].abs().sort_values(ascending=False, kind="stable").index[:TOP_ABSOLUTE]]
+        rest = lines[lines["material"] & lines["pct"].notna() & ~lines.index.isin(absolute.index)]
+        relative = rest.loc[rest["pct"].abs().sort_values(ascending=False, kind="stable").index[:TOP_RELATIVE]]
+        ranked[statement] = [
+            {**{k: row[k] for k in ("name", "section", "line_item", "previous", "latest", "change")},
+             "pct": None if row["pct"] != row["pct"] else row["pct"], "rank": kind}
+            for kind, rows in (("absolute", absolute), ("relative", relative))
+            for row in rows.to_dict("records")
+        ]
+    return ranked
+
+
+def build_insights(data_dir=DATA_DIR, version=None):
+    from crossstatement import cross_statement
+
+    view = cross_statement(data_dir)
+    # A single fiscal year has nothing to compare against: no insights
+    statements = rank(movers(view)) if len(view.years) >= 2 else {}
+    for lines in statements.values():
+        for mover in lines:
+            mover["text"] = narrative(mover)
+    return {
+        "version": INSIGHTS_VERSION,
+        "data_version": version or data_version(data_dir),
+        "fiscal_year": view.years[-1],
+        "previous_year": view.years[-2] if len(view.years) >= 2 else None,
+        "statements": statements,
+    }
+
+
+def year_end(fiscal_year):
+    # "FY2023/24" -> "31 March 2024" (IRAS's financial year ends 31 March)
+    return f"31 March {int(fiscal_year[2:6]) + 1}"
+
+
+# --- Cached access ---
+def insights_path(data_dir=DATA_DIR):
+    return os.path.join(data_dir, INSIGHTS_FILE)
+
+
+def _read_insights(data_dir, version):
+    try:
+        with open(insights_path(data_dir), encoding="utf-8") as f:
+            insights = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if insights.get("version") != INSIGHTS_VERSION or insights.get("data_version") != version:
+        return None
+    return insights
+
+
+def write_insights(data_dir, insights):
+    try:
+        replace_atomically(insights_path(data_dir), lambda f: json.dump(insights, f, indent=1), binary=False)
+    except OSError:
+        # Read-only data directory: insights are rebuilt per process instead
+        return False
+    return True
+
+
+MAX_CACHED_INSIGHTS = 4
+_insights_cache = LRUCache(MAX_CACHED_INSIGHTS)  # (abs data dir, data version) -> insights
+
+
+def _load_insights(data_dir, version):
+    insights = _read_insights(data_dir, version)
+    if insights is None:
+        insights = build_insights(data_dir, version)
+        write_insights(data_dir, insights)
+    return insights
+
+
+def load_insights(data_dir=DATA_DIR):
+    version = data_version(data_dir)
+    key = os.path.abspath(data_dir), version
+    if key not in _insights_cache:
+        # Only the current version of a directory can be hit again
+        _insights_cache.discard(lambda k: k[0] == key[0] and k != key)
+    return _insights_cache.get_or_build(key, lambda: _load_insights(data_dir, version))
+
+
+def statement_insights(statement, data_dir=DATA_DIR):
+    # Markdown bullets for one statement's top movers
+    insights = load_insights(data_dir)
+    if insights["previous_year"] is None:
+        return "_Only one fiscal year is available, so there is nothing to compare yet._"
+    return "\n".join(mover["text"] for mover in insights["statements"].get(statement, []))
+
+
+def refresh_insights(data_dir=DATA_DIR, force=False):
+    # For ingest.py: rebuilds the artifact when the workbooks changed; True if it was rebuilt
+    version = data_version(data_dir)
+    if not force and _read_insights(data_dir, version) is not None:
+        return False
+    write_insights(data_dir, build_insights(data_dir, version))
+    return True
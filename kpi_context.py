@@ -0,0 +1,173 @@
+import hashlib
+import json
+import os
+
+from kpis import REGISTRY, Formula, workbook_kpis
+from statements import yoy
+from utils import (DEFAULT_WORKBOOK, LRUCache, replace_atomically, snapshot_dir, snapshots_writable, workbook_key,
+                   workbook_sha256)
+
+
+# --- KPI context ---
+# The chatbot used to re-extract and re-format the KPI summary of the selected report on
+# every rerun. The summary of every report is now built once per workbook (by ingest.py, or
+# on first use) and stored as kpi_context.json in the workbook's snapshot directory: prompt-
+# ready text for the chatbot plus the same figures as JSON for anything else that wants them.
+# The artifact is rebuilt when the workbook's sha256 or the KPI definitions change.
+
+CONTEXT_VERSION = 1
+CONTEXT_FILE = "kpi_context.json"
+
+# Metrics the chatbot summarises per report: (name shown to the model, KPI, 0 if missing).
+# Missing figures are left out, except for cash flows which have always been sent as 0.
+REPORT_KPIS = {
+    "Statement of Financial Position": [
+        ("Share Capital", "share_capital", False),
+        ("Accumulated Surplus", "accumulated_surplus", False),
+        ("Net Current Assets", "net_current_assets", False),
+        ("Total Equity", "total_equity", False),
+        ("Non-Current Assets", "non_current_assets", False),
+        ("Total Current Assets", "current_assets", False),
+        ("Total Current Liabilities", "current_liabilities", False),
+        ("Non-Current Liabilities", "non_current_liabilities", False),
+    ],
+    "Statement of Com. Income": [
+        ("Operating Income", "operating_income", False),
+        ("Total Operating Expenditure", "operating_expenditure", False),
+        ("Operating Surplus", "operating_surplus", False),
+        ("Net Investment Income/(Loss)", "investment_income", False),
+        ("Surplus Before Gov Fund", "surplus_before_gov", False),
+        ("Contribution to Gov Fund", "gov_contribution", False),
+        ("Net Surplus for the Year", "net_surplus", False),
+    ],
+    "Statement of Cash Flows": [
+        ("Net Cash from Operating Activities", "cf_operating", True),
+        ("Net Cash from Investing Activities", "cf_investing", True),
+        ("Net Cash from Financing Activities", "cf_financing", True),
+        ("Net Cash Movement", "net_cash_movement", True),
+        ("Beginning Cash", "beginning_cash", True),
+        ("Ending Cash", "ending_cash", True),
+    ],
+}
+
+
+def definitions_hash():
+    # Changes whenever a report's metric list, a line item's source or a formula changes
+    spec = {
+        "reports": REPORT_KPIS,
+        "kpis": {
+            name: d.expression if isinstance(d, Formula) else [d.sheet, d.label, d.section]
+            for name, d in REGISTRY.items()
+        },
+    }
+    return hashlib.sha256(json.dumps(spec, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def _entry(val_new, val_old, latest_year, previous_year):
+    return {
+        latest_year: val_new,
+        previous_year: val_old,
+        "Change (%)": round((val_new - val_old) / val_old * 100, 2) if val_old else 0
+    }
+
+
+def format_prompt(kpis, latest_year, previous_year):
+    return "\n".join(
+        f"{metric}: {latest_year} = {data[latest_year]:,}, {previous_year} = {data[previous_year]:,}, Change = {data['Change (%)']}%"
+        for metric, data in kpis.items()
+    )
+
+
+def build_context(path=DEFAULT_WORKBOOK, sha=None):
+    frame = workbook_kpis(path)
+    latest_year, previous_year = frame.index[-1], frame.index[-2]
+    latest_row, previous_row = frame.iloc[-1], frame.iloc[-2]
+
+    reports = {}
+    for report, metrics in REPORT_KPIS.items():
+        kpis = {}
+        for metric, name, zero_if_missing in metrics:
+            if latest_row.isna()[name] or previous_row.isna()[name]:
+                if zero_if_missing:
+                    kpis[metric] = _entry(0, 0, latest_year, previous_year)
+                continue
+            val_new, val_old, _ = yoy(int(latest_row[name]), int(previous_row[name]))
+            kpis[metric] = _entry(val_new, val_old, latest_year, previous_year)
+        reports[report] = {"kpis": kpis, "prompt": format_prompt(kpis, latest_year, previous_year)}
+
+    # Every line item and KPI for both years, for callers other than the chatbot
+    values = {
+        year: {name: (None if row.isna()[name] else float(row[name])) for name in REGISTRY}
+        for year, row in ((previous_year, previous_row), (latest_year, latest_row))
+    }
+    return {
+        "version": CONTEXT_VERSION,
+        "sha256": sha or workbook_sha256(path),
+        "definitions": definitions_hash(),
+        "fiscal_year": latest_year,
+        "previous_year": previous_year,
+        "reports": reports,
+        "values": values,
+    }
+
+
+def context_path(path):
+    return os.path.join(snapshot_dir(path), CONTEXT_FILE)
+
+
+def _read_context(path, sha):
+    try:
+        with open(context_path(path), encoding="utf-8") as f:
+            context = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if (context.get("version") != CONTEXT_VERSION or context.get("sha256") != sha
+            or context.get("definitions") != definitions_hash()):
+        return None
+    return context
+
+
+def write_context(path, context):
+    if not snapshots_writable():
+        return False
+    target = context_path(path)
+    try:
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        replace_atomically(target, lambda f: json.dump(context, f, indent=1), binary=False)
+    except OSError:
+        return False
+    return True
+
+
+def _load_context(path):
+    sha = workbook_sha256(path)
+    context = _read_context(path, sha)
+    if context is None:
+        context = build_context(path, sha=sha)
+        write_context(path, context)
+    return context
+
+
+MAX_CACHED_CONTEXTS = 8
+_context_cache = LRUCache(MAX_CACHED_CONTEXTS)
+
+
+def load_context(path=DEFAULT_WORKBOOK):
+    return _context_cache.get_or_build(workbook_key(path), lambda: _load_context(path))
+
+
+def report_context(report, path=DEFAULT_WORKBOOK, context=None):
+    # {"kpis": {metric: {year: value, ..., "Change (%)": pct}}, "prompt": text}; pass the
+    # load_context() result when the caller already has it
+    context = context or load_context(path)
+    return context["reports"].get(report, {"kpis": {"error": "Report not recognized"}, "prompt": ""})
+
+
+def build_contexts(paths, force=False):
+    built = []
+    for path in paths:
+        sha = workbook_sha256(path)
+        if force or _read_context(path, sha) is None:
+            write_context(path, build_context(path, sha=sha))
+            built.append(path)
+    return built
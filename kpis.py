@@ -0,0 +1,389 @@
+import ast
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from equity import EQUITY, equity_matrix
+from profiling import timed
+from statements import load_statement, yoy
+from timeseries import DATA_DIR, discover_workbooks, fiscal_year_start, safe_divide
+from utils import DEFAULT_WORKBOOK, LRUCache, workbook_key
+
+
+# --- KPI registry ---
+# Every KPI the pages show is declared once here as a formula over named line items.
+# Formulas are evaluated as pandas expressions over a frame with one row per
+# (entity, fiscal year), so recomputing every ratio for every year is a single pass.
+# Division never raises: anything that ends up as x/0 comes back as NaN.
+
+POSITION = "Statement of Financial Position"
+INCOME = "Statement of Com. Income"
+CASHFLOW = "Statement of Cash Flows"
+
+
+class LineItem:
+    # A value read straight off a statement: a labelled line, or a section total when
+    # only `section` is given
+    def __init__(self, name, sheet, label=None, section=None):
+        self.name = name
+        self.sheet = sheet
+        self.label = label
+        self.section = section
+        self.dependencies = ()
+
+    def read(self, statement):
+        if self.label is None:
+            return statement.section_total(self.section)
+        values = statement.lookup(self.label, section=self.section)
+        return np.full(len(statement.periods), np.nan) if values is None else values
+
+
+class EquityMovement(LineItem):
+    # One movement of the equity statement (see equity.py), keyed by fiscal year so it lines
+    # up with the other statements' period columns
+    def __init__(self, name, movement, component="total"):
+        super().__init__(name, EQUITY, label=movement, section=component)
+
+    def read(self, matrix):
+        return matrix.movement(self.label, self.section)
+
+
+class Formula:
+    def __init__(self, name, expression, label=None):
+        self.name = name
+        self.expression = expression
+        self.label = label or name
+        self.code = compile(expression, f"<kpi {name}>", "eval")
+        self.dependencies = tuple(sorted(
+            {node.id for node in ast.walk(ast.parse(expression, mode="eval")) if isinstance(node, ast.Name)}
+            - set(FUNCTIONS)
+        ))
+
+
+REGISTRY = OrderedDict()
+
+
+def register(definition):
+    missing = [d for d in definition.dependencies if d not in REGISTRY]
+    if missing:
+        raise KeyError(f"KPI {definition.name!r} refers to undefined names: {missing}")
+    REGISTRY[definition.name] = definition
+    return definition
+
+
+def line_item(name, sheet, label=None, section=None):
+    return register(LineItem(name, sheet, label=label, section=section))
+
+
+def equity_movement(name, movement, component="total"):
+    return register(EquityMovement(name, movement, component))
+
+
+def kpi(name, expression, label=None):
+    return register(Formula(name, expression, label=label))
+
+
+# --- Formula functions ---
+# prev/growth look one fiscal year back within the same entity, so they need the index of
+# the frame being evaluated; it is bound per evaluation (see _functions), never shared
+# between the threads of concurrent sessions.
+def _prev(series, frame_index):
+    group_levels = [n for n in frame_index.names if n != "fiscal_year"]
+    if group_levels:
+        return series.groupby(level=group_levels, sort=False).shift(1)
+    return series.shift(1)
+
+
+def _growth(series, frame_index):
+    previous = _prev(series, frame_index)
+    return safe_divide(series - previous, previous) * 100
+
+
+def _where(condition, if_true, if_false):
+    return pd.Series(np.where(condition, if_true, if_false), index=condition.index)
+
+
+FUNCTIONS = {
+    "abs": np.abs,
+    "where": _where,
+    "prev": _prev,
+    "growth": _growth,
+    "div": safe_divide,
+}
+
+
+def _functions(frame_index):
+    # FUNCTIONS with prev/growth bound to the index of one evaluation
+    return {
+        **FUNCTIONS,
+        "prev": lambda series: _prev(series, frame_index),
+        "growth": lambda series: _growth(series, frame_index),
+    }
+
+
+# --- Definitions ---
+# Statement of Financial Position
+line_item("share_capital", POSITION, "Share capital")
+line_item("accumulated_surplus", POSITION, "Accumulated surplus")
+line_item("net_current_assets", POSITION, "Net current assets")
+line_item("non_current_assets", POSITION, section="Non-current assets")
+line_item("current_assets", POSITION, section="Current assets")
+line_item("current_liabilities", POSITION, section="Current liabilities")
+line_item("non_current_liabilities", POSITION, section="Non-current liabilities")
+
+kpi("total_equity", "share_capital + accumulated_surplus", "Total Equity")
+kpi("total_assets", "current_assets + non_current_assets", "Total Assets")
+kpi("total_liabilities", "current_liabilities + non_current_liabilities", "Total Liabilities")
+kpi("equity_ratio", "total_equity / total_assets", "Equity/Assets Ratio")
+kpi("working_capital", "current_assets - current_liabilities", "Working Capital")
+kpi("current_ratio", "current_assets / current_liabilities", "Current Ratio")
+kpi("de_ratio", "total_liabilities / total_equity", "Debt-to-Equity Ratio")
+kpi("asset_growth", "growth(total_assets)", "YoY Asset Growth")
+
+# Statement of Comprehensive Income
+line_item("operating_income", INCOME, section="Operating income")
+line_item("operating_expenditure", INCOME, section="Operating expenditure")
+line_item("operating_surplus", INCOME, "Operating surplus")
+line_item("investment_income", INCOME, "Net investment income/(loss)")
+line_item("surplus_before_gov", INCOME, "Surplus for the financial year before contribution to Government Consolidated Fund")
+line_item("gov_contribution", INCOME, "Contribution to Government Consolidated Fund")
+line_item("net_surplus", INCOME, "Net surplus for the financial year, representing total comprehensive income for the financial year")
+
+kpi("operating_surplus_margin", "operating_surplus / operating_income", "Operating Surplus Margin")
+kpi("investment_contribution_ratio", "investment_income / operating_income", "Investment Return Contribution")
+kpi("gov_contribution_ratio", "gov_contribution / surplus_before_gov", "Gov Fund Contribution Ratio")
+kpi("net_surplus_margin", "net_surplus / operating_income", "Net Surplus Margin")
+kpi("income_growth_pct", "growth(operating_income)", "YoY Income Growth")
+
+# Statement of Cash Flows
+line_item("cf_operating", CASHFLOW, "Net cash from operating activities")
+line_item("cf_investing", CASHFLOW, "Net cash used in investing activities")
+line_item("cf_financing", CASHFLOW, "Net cash used in financing activities")
+line_item("net_cash_movement", CASHFLOW, "Net (decrease)/increase in cash and cash equivalents")
+line_item("beginning_cash", CASHFLOW, "Cash and cash equivalents as at beginning of the financial year")
+line_item("ending_cash", CASHFLOW, "Cash and cash equivalents as at end of the financial year")
+line_item("capex_assets", CASHFLOW, "Payment for purchase of property, plant and equipment and intangible assets")
+line_item("capex_development", CASHFLOW, "Expenditure on development projects")
+
+kpi("capex", "capex_assets + capex_development", "Capital Expenditure")
+kpi("free_cash_flow", "cf_operating - capex", "Free Cash Flow")
+kpi("cash_flow_coverage", "cf_operating / abs(cf_financing)", "Cash Flow Coverage Ratio")
+# Cross-statement: divides by operating income from the income statement
+kpi("net_cash_margin", "net_cash_movement / operating_income", "Net Cash Margin")
+kpi("cash_burn_rate", "where(cf_operating < 0, abs(cf_operating) / 12, 0)", "Cash Burn Rate")
+kpi("runway_months", "ending_cash / (abs(cf_operating) / 12)", "Cash Runway")
+
+# Statement of Changes in Equity (movements of the total column; dividends are negative)
+equity_movement("comprehensive_income", "comprehensive_income")
+equity_movement("dividends", "dividends")
+
+kpi("comprehensive_income_growth", "growth(comprehensive_income)", "Income Growth")
+kpi("dividend_payout_ratio", "abs(dividends) / comprehensive_income", "Dividend Payout Ratio")
+kpi("dividend_growth", "growth(abs(dividends))", "Dividends Growth")
+# Joined with the financial position: accumulated surplus and total equity come from there
+kpi("retained_earnings_growth", "growth(accumulated_surplus)", "Retained Earnings Growth")
+kpi("internal_equity_growth", "growth(total_equity)", "Equity Growth from Internal Sources")
+
+
+# --- Inputs ---
+def workbook_inputs(path=DEFAULT_WORKBOOK):
+    # One row per period column of the workbook, oldest first, one column per line item
+    columns, periods = {}, None
+    for definition in REGISTRY.values():
+        if isinstance(definition, LineItem) and not isinstance(definition, EquityMovement):
+            statement = load_statement(definition.sheet, path)
+            periods = statement.periods
+            columns[definition.name] = definition.read(statement)
+    # Equity movements are keyed by fiscal year rather than by column: joined on the year
+    for definition in REGISTRY.values():
+        if isinstance(definition, EquityMovement):
+            columns[definition.name] = definition.read(equity_matrix(path)).reindex(periods).to_numpy(dtype=float)
+    frame = pd.DataFrame(columns, index=pd.Index(periods, name="fiscal_year"))
+    return frame.iloc[np.argsort([fiscal_year_start(p) for p in frame.index], kind="stable")]
+
+
+def history_inputs(data_dir=DATA_DIR):
+    # Every fiscal year found in data/, later workbooks winning for restated years
+    frames = [workbook_inputs(path) for path in discover_workbooks(data_dir)]
+    inputs = pd.concat(frames)
+    inputs = inputs[~inputs.index.duplicated(keep="last")]
+    return inputs.iloc[np.argsort([fiscal_year_start(p) for p in inputs.index], kind="stable")]
+
+
+# --- Evaluation ---
+@timed("compute/evaluate")
+def _evaluate_nodes(inputs, results, names):
+    # Computes `names` (in registry order) into `results`, reading dependencies from it
+    functions = {"__builtins__": {}, **_functions(inputs.index)}
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for name in names:
+            definition = REGISTRY[name]
+            if isinstance(definition, LineItem):
+                if name in inputs.columns:
+                    results[name] = inputs[name].astype(float)
+                else:
+                    results[name] = pd.Series(np.nan, index=inputs.index)
+                continue
+            namespace = {d: results[d] for d in definition.dependencies}
+            value = eval(definition.code, functions, namespace)
+            if np.isscalar(value):
+                value = pd.Series(value, index=inputs.index)
+            results[name] = value.astype(float).where(np.isfinite(value))
+    return results
+
+
+def upstream(names):
+    # `names` plus everything they depend on, in evaluation (registry) order
+    seen, stack = set(), list(names)
+    while stack:
+        name = stack.pop()
+        if name not in seen:
+            seen.add(name)
+            stack.extend(REGISTRY[name].dependencies)
+    return [name for name in REGISTRY if name in seen]
+
+
+def evaluate(inputs, names=None, fill_value=None):
+    # `inputs` holds one column per line item and one row per observation; its index must
+    # have a "fiscal_year" level (plus e.g. an "entity" level when comparing workbooks).
+    # Returns line items and KPIs side by side, in registry order; with `names`, only those
+    # and what they depend on are computed.
+    wanted = list(REGISTRY) if names is None else names
+    results = _evaluate_nodes(inputs, {}, upstream(wanted))
+    frame = pd.DataFrame({name: results[name] for name in wanted}, index=inputs.index)
+    return frame if fill_value is None else frame.fillna(fill_value)
+
+
+# --- Incremental recomputation ---
+# The registry is a DAG (line items -> aggregates -> ratios; register() only accepts names
+# that already exist, so registry order is a topological order). KPIGraph memoizes every
+# node's values per partition (one workbook) and, when a partition's inputs change, only
+# recomputes the nodes downstream of the line items that actually changed. A new workbook
+# only costs its own partition; the other years are left untouched.
+class KPIGraph:
+    def __init__(self):
+        self.dependents = {name: [] for name in REGISTRY}
+        for name, definition in REGISTRY.items():
+            for dependency in definition.dependencies:
+                self.dependents[dependency].append(name)
+        self._partitions = {}  # key -> {"version", "inputs", "values", "frame"}
+        self._lock = threading.Lock()
+        # Nodes recomputed by the last update of each partition, for inspection
+        self.last_recomputed = {}
+
+    def __contains__(self, key):
+        return key in self._partitions
+
+    def keys(self):
+        return list(self._partitions)
+
+    def downstream(self, names):
+        # `names` plus everything that depends on them, in evaluation order
+        seen, stack = set(), list(names)
+        while stack:
+            name = stack.pop()
+            if name not in seen:
+                seen.add(name)
+                stack.extend(self.dependents.get(name, ()))
+        return [name for name in REGISTRY if name in seen]
+
+    def version(self, key):
+        partition = self._partitions.get(key)
+        return partition["version"] if partition else None
+
+    def update(self, key, inputs, version=None):
+        # Returns the names of the nodes that had to be recomputed
+        with self._lock:
+            partition = self._partitions.get(key)
+            if partition is None or not partition["inputs"].index.equals(inputs.index):
+                stale, values = list(REGISTRY), {}
+            else:
+                old = partition["inputs"]
+                changed = [c for c in inputs.columns if c not in old.columns or not inputs[c].equals(old[c])]
+                changed += [c for c in old.columns if c not in inputs.columns]
+                stale, values = self.downstream(changed), dict(partition["values"])
+
+            frame = partition["frame"] if partition and not stale else None
+            if stale:
+                _evaluate_nodes(inputs, values, stale)
+            self._partitions[key] = {"version": version, "inputs": inputs, "values": values, "frame": frame}
+            self.last_recomputed[key] = stale
+            return stale
+
+    def remove(self, key):
+        with self._lock:
+            self._partitions.pop(key, None)
+            self.last_recomputed.pop(key, None)
+
+    def frame(self, key):
+        with self._lock:
+            partition = self._partitions[key]
+            if partition["frame"] is None:
+                values = partition["values"]
+                partition["frame"] = pd.DataFrame({name: values[name] for name in REGISTRY},
+                                                  index=partition["inputs"].index)
+            return partition["frame"]
+
+
+_graph = KPIGraph()
+
+
+def _sync_workbook(path):
+    # Re-reads a workbook's line items only when the file changed on disk
+    key = workbook_key(path)
+    if _graph.version(key[0]) != key:
+        _graph.update(key[0], workbook_inputs(path), version=key)
+    return key[0]
+
+
+def workbook_kpis(path=DEFAULT_WORKBOOK):
+    # All KPIs for one workbook's periods, recomputed only where the workbook changed. Callers
+    # get a copy so the memoized frame can never be modified in place
+    return _graph.frame(_sync_workbook(path)).copy()
+
+
+MAX_CACHED_HISTORIES = 16
+_history_cache = LRUCache(MAX_CACHED_HISTORIES)
+
+
+def _combine_history(frames):
+    # Later workbooks win for restated years; a comparative year's prev/growth cells (NaN
+    # within its own workbook) are filled from the workbook where that year is current
+    history = frames[-1]
+    for frame in reversed(frames[:-1]):
+        history = history.combine_first(frame)
+    history = history[list(REGISTRY)]
+    history = history.iloc[np.argsort([fiscal_year_start(p) for p in history.index], kind="stable")]
+    history.index.name = "fiscal_year"
+    return history
+
+
+def history_kpis(data_dir=DATA_DIR):
+    paths = discover_workbooks(data_dir)
+    if not paths:
+        raise FileNotFoundError(f"No workbooks found in {data_dir!r}")
+    keys = [_sync_workbook(path) for path in paths]
+    # Workbooks removed from data/ are dropped from the graph
+    for key in [k for k in _graph.keys() if not os.path.exists(k)]:
+        _graph.remove(key)
+    versions = tuple(_graph.version(k) for k in keys)
+    history = _history_cache.get_or_build(versions, lambda: _combine_history([_graph.frame(k) for k in keys]))
+    return history.copy()
+
+
+def comparison(frame, name):
+    # (latest, previous, % change) for one line item or KPI, the shape of the pages' KPI tables
+    latest_val, previous_val = frame[name].iloc[-1], frame[name].iloc[-2]
+    if pd.isna(latest_val) or pd.isna(previous_val):
+        return None, None, None
+    return yoy(int(latest_val), int(previous_val))
+
+
+def latest(frame, fill_value=0):
+    # Most recent fiscal year as a plain dict, with NaN (e.g. x/0) shown as fill_value like
+    # the pages always have
+    row = frame.iloc[-1]
+    return {name: (fill_value if pd.isna(v) else v) for name, v in row.items()}
@@ -0,0 +1,281 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import CancelledError, Future
+
+from utils import replace_atomically
+
+
+# --- Chatbot answers ---
+# Streamlit reruns the chatbot page on every widget interaction, and the page used to send
+# the same question to OpenAI each time. Answers are now cached per (report, system prompt,
+# question, model) for a while, and identical requests that arrive while one is already in
+# flight (two sessions, or a rerun mid-call) wait for that call instead of making another.
+#
+# Point OPENAI_API_BASE at a local server (see openai_stub.py) to run the page offline.
+
+DEFAULT_MODEL = "gpt-4"
+
+# Answers older than this are asked again; the KPI figures only change with the workbook,
+# which changes the system prompt (and so the key) anyway
+CHAT_CACHE_TTL = 24 * 60 * 60
+MAX_CACHED_ANSWERS = 256
+
+# Set to a directory to keep answers across restarts (one JSON file per answer)
+CHAT_CACHE_DIR = os.environ.get("CHAT_CACHE_DIR")
+
+
+def normalize_question(question):
+    # "What is the current ratio?" and "what is the  current ratio" are the same question
+    return " ".join(str(question).lower().split()).rstrip("?!. ")
+
+
+def cache_key(report, system_prompt, question, model=DEFAULT_MODEL):
+    prompt_hash = hashlib.sha256(system_prompt.encode("utf-8")).hexdigest()
+    raw = json.dumps([report, prompt_hash, normalize_question(question), model])
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    # Thread-safe LRU with a TTL, optionally backed by a directory of JSON files
+    def __init__(self, maxsize=MAX_CACHED_ANSWERS, ttl=CHAT_CACHE_TTL, directory=None, clock=time.time):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.directory = directory
+        self.clock = clock
+        self._data = OrderedDict()  # key -> (stored at, answer)
+        self._inflight = {}  # key -> Future of the call being made
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def _fresh(self, stored_at):
+        return self.ttl is None or self.clock() - stored_at < self.ttl
+
+    def _file(self, key):
+        return os.path.join(self.directory, key + ".json")
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                if self._fresh(entry[0]):
+                    self._data.move_to_end(key)
+                    return entry[1]
+                del self._data[key]
+
+        entry = self._read_file(key)
+        if entry is None:
+            return default
+        self._store(key, entry)
+        return entry[1]
+
+    def put(self, key, value):
+        entry = (self.clock(), value)
+        self._store(key, entry)
+        self._write_file(key, entry)
+
+    def _store(self, key, entry):
+        with self._lock:
+            self._data[key] = entry
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def _read_file(self, key):
+        if not self.directory:
+            return None
+        try:
+            with open(self._file(key), encoding="utf-8") as f:
+                stored = json.load(f)
+            stored_at, answer = float(stored["stored_at"]), stored["answer"]
+        except (OSError, ValueError, KeyError, TypeError):
+            # Missing, partial or malformed entries are misses
+            return None
+        if not isinstance(answer, str) or not self._fresh(stored_at):
+            return None
+        return stored_at, answer
+
+    def _write_file(self, key, entry):
+        if not self.directory:
+            return
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            replace_atomically(self._file(key), lambda f: json.dump({"stored_at": entry[0], "answer": entry[1]}, f),
+                               binary=False)
+        except OSError:
+            # A read-only cache directory only costs us the persistence
+            pass
+
+    def claim(self, key):
+        # (future, owner): the first caller for a key makes the call, later ones wait on it
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                return future, False
+            future = self._inflight[key] = Future()
+            return future, True
+
+    def resolve(self, key, value):
+        self.put(key, value)
+        self._settle(key, lambda future: future.set_result(value))
+
+    def fail(self, key, exc):
+        # Failures are not cached; everyone waiting on this call sees the same error
+        self._settle(key, lambda future: future.set_exception(exc))
+
+    def abandon(self, key):
+        # The owner gave up (e.g. a cancelled stream); waiters go and make the call themselves
+        self._settle(key, lambda future: future.cancel())
+
+    def _settle(self, key, action):
+        with self._lock:
+            future = self._inflight.pop(key, None)
+        if future is not None:
+            action(future)
+
+    def get_or_fetch(self, key, fetch):
+        missing = object()
+        while True:
+            value = self.get(key, missing)
+            if value is not missing:
+                return value
+            future, owner = self.claim(key)
+            if owner:
+                break
+            try:
+                return future.result()
+            except CancelledError:
+                continue
+
+        try:
+            value = fetch()
+        except BaseException as exc:
+            self.fail(key, exc)
+            raise
+        self.resolve(key, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+_response_cache = ResponseCache(directory=CHAT_CACHE_DIR)
+
+# openai is only imported when a question is actually sent, so opening the chatbot page (or
+# any page) does not pay for the client's import and setup
+_api_key = None
+
+
+def set_api_key(api_key):
+    global _api_key
+    _api_key = api_key
+
+
+def _openai():
+    import openai
+
+    if _api_key is not None:
+        openai.api_key = _api_key
+    return openai
+
+
+def _complete(system_prompt, question, model):
+    response = _openai().ChatCompletion.create(
+        model=model,
+        messages=[
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": question}
+        ]
+    )
+    return response['choices'][0]['message']['content']
+
+
+def ask(report, system_prompt, question, model=DEFAULT_MODEL):
+    key = cache_key(report, system_prompt, question, model)
+    return _response_cache.get_or_fetch(key, lambda: _complete(system_prompt, question, model))
+
+
+# --- Streaming ---
+# stream() yields the answer token by token as OpenAI produces it, so the page can render
+# into a placeholder and the user waits for the first token instead of the whole answer.
+# A cached answer (or one another session is already fetching) is yielded in one piece.
+def _complete_stream(system_prompt, question, model):
+    chunks = _openai().ChatCompletion.create(
+        model=model,
+        messages=[
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": question}
+        ],
+        stream=True
+    )
+    try:
+        for chunk in chunks:
+            token = chunk['choices'][0].get('delta', {}).get('content')
+            if token:
+                yield token
+    finally:
+        chunks.close()
+
+
+def _finish_stream(key, tokens, parts):
+    try:
+        parts.extend(tokens)
+    except Exception as exc:
+        _response_cache.fail(key, exc)
+    else:
+        _response_cache.resolve(key, "".join(parts))
+
+
+def stream(report, system_prompt, question, model=DEFAULT_MODEL, finish_on_close=False):
+    # Closing the generator early (Streamlit interrupts the page when the user picks another
+    # report) closes the HTTP stream and caches nothing. With finish_on_close the rest of the
+    # answer is read in the background instead, so it is cached when the user comes back.
+    key = cache_key(report, system_prompt, question, model)
+    missing = object()
+    while True:
+        answer = _response_cache.get(key, missing)
+        if answer is not missing:
+            yield answer
+            return
+        future, owner = _response_cache.claim(key)
+        if owner:
+            break
+        try:
+            answer = future.result()
+        except CancelledError:
+            continue
+        yield answer
+        return
+
+    tokens = _complete_stream(system_prompt, question, model)
+    parts = []
+    settled = False
+    try:
+        for token in tokens:
+            parts.append(token)
+            yield token
+        _response_cache.resolve(key, "".join(parts))
+        settled = True
+    except GeneratorExit:
+        if finish_on_close:
+            threading.Thread(target=_finish_stream, args=(key, tokens, parts), daemon=True).start()
+            settled = True
+        raise
+    except Exception as exc:
+        _response_cache.fail(key, exc)
+        settled = True
+        raise
+    finally:
+        if not settled:
+            tokens.close()
+            _response_cache.abandon(key)
+
+
+def clear_response_cache():
+    _response_cache.clear()
@@ -0,0 +1,107 @@
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+# --- Local OpenAI stub ---
+# A tiny stand-in for the chat completions endpoint so the chatbot can be run and timed
+# without network access or an API key:
+#   python openai_stub.py --port 8001 --delay 2 --token-delay 0.05
+#   OPENAI_API_BASE=http://127.0.0.1:8001/v1 streamlit run Home.py
+# Every answer echoes the question, and `calls` counts the requests that reached the stub.
+# Requests with "stream": true get the answer word by word as server-sent events, the way
+# the real endpoint streams; `disconnects` counts streams the client closed early.
+
+class StubHandler(BaseHTTPRequestHandler):
+    delay = 0.0
+    token_delay = 0.0
+    calls = 0
+    disconnects = 0
+    _lock = threading.Lock()
+
+    def do_POST(self):
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self.send_error(404)
+            return
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        with StubHandler._lock:
+            StubHandler.calls += 1
+        time.sleep(self.delay)
+
+        question = next((m["content"] for m in reversed(body.get("messages", [])) if m["role"] == "user"), "")
+        answer = f"Stub answer to: {question}"
+        if body.get("stream"):
+            self._stream(body, answer)
+            return
+
+        payload = json.dumps({
+            "id": f"stub-{StubHandler.calls}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "stub"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": answer},
+                "finish_reason": "stop",
+            }],
+        }).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _stream(self, body, answer):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.end_headers()
+        words = answer.split(" ")
+        deltas = [{"role": "assistant"}] + [{"content": w if i == 0 else " " + w} for i, w in enumerate(words)] + [{}]
+        try:
+            for i, delta in enumerate(deltas):
+                chunk = {
+                    "id": f"stub-{StubHandler.calls}",
+                    "object": "chat.completion.chunk",
+                    "created": int(time.time()),
+                    "model": body.get("model", "stub"),
+                    "choices": [{"index": 0, "delta": delta, "finish_reason": "stop" if i == len(deltas) - 1 else None}],
+                }
+                self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+                self.wfile.flush()
+                time.sleep(self.token_delay)
+            self.wfile.write(b"data: [DONE]\n\n")
+            self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            with StubHandler._lock:
+                StubHandler.disconnects += 1
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(port=8001, delay=0.0, token_delay=0.0):
+    # Returns the running server; call .shutdown() when done
+    StubHandler.delay = delay
+    StubHandler.token_delay = token_delay
+    server = ThreadingHTTPServer(("127.0.0.1", port), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve a fake OpenAI chat completions endpoint")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--delay", type=float, default=0.0, help="seconds to wait before answering")
+    parser.add_argument("--token-delay", type=float, default=0.0, help="seconds between streamed words")
+    args = parser.parse_args(argv)
+
+    StubHandler.delay = args.delay
+    StubHandler.token_delay = args.token_delay
+    print(f"stub listening on http://127.0.0.1:{args.port}/v1")
+    ThreadingHTTPServer(("127.0.0.1", args.port), StubHandler).serve_forever()
+
+
+if __name__ == "__main__":
+    main()
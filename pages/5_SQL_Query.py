@@ -0,0 +1,72 @@
+import sqlite3
+
+import streamlit as st
+from sql_query import MAX_ROWS, TIME_LIMIT_S, run_query, schema
+from profiling import profiled_rerun, stage
+
+# Ready-made cuts to start from; any read-only SQLite query works
+EXAMPLES = {
+    "Expense lines ranked by growth (first to latest year)": """\
+WITH lines AS (
+    SELECT line_item, fiscal_year, value FROM latest_line_items
+    WHERE statement = 'Statement of Com. Income'
+      AND section = 'operating expenditure' AND line_item <> 'total'
+),
+years AS (SELECT MIN(fiscal_year) AS first, MAX(fiscal_year) AS latest FROM lines)
+SELECT line_item,
+       MAX(CASE WHEN fiscal_year = first THEN value END) AS first_year,
+       MAX(CASE WHEN fiscal_year = latest THEN value END) AS latest_year,
+       ROUND(100.0 * (MAX(CASE WHEN fiscal_year = latest THEN value END)
+                    - MAX(CASE WHEN fiscal_year = first THEN value END))
+             / ABS(MAX(CASE WHEN fiscal_year = first THEN value END)), 2) AS growth_pct
+FROM lines, years
+GROUP BY line_item
+ORDER BY growth_pct DESC""",
+    "Year-on-year change of every income statement line": """\
+SELECT section, line_item, fiscal_year, value,
+       ROUND(100.0 * (value - LAG(value) OVER w) / ABS(LAG(value) OVER w), 2) AS yoy_pct
+FROM latest_line_items
+WHERE statement = 'Statement of Com. Income'
+WINDOW w AS (PARTITION BY section, line_item ORDER BY fiscal_year)
+ORDER BY position, fiscal_year""",
+    "Liquidity KPIs by year": """\
+SELECT fiscal_year,
+       MAX(CASE WHEN kpi = 'current_ratio' THEN value END) AS current_ratio,
+       MAX(CASE WHEN kpi = 'working_capital' THEN value END) AS working_capital,
+       MAX(CASE WHEN kpi = 'de_ratio' THEN value END) AS debt_to_equity
+FROM kpis
+GROUP BY fiscal_year
+ORDER BY fiscal_year""",
+}
+
+
+# --- Streamlit Layout ---
+with profiled_rerun("SQL Query"):
+    st.title("🧮 SQL Query")
+
+    st.caption(f"Read-only SQL over every workbook in data/ · at most {MAX_ROWS:,} rows and {TIME_LIMIT_S:g}s per query")
+
+    with stage("schema"):
+        with st.expander("📚 Tables"):
+            for table, columns in schema().items():
+                st.markdown(f"**{table}**: {', '.join(columns)}")
+
+    example = st.selectbox("📄 Start from an example:", list(EXAMPLES))
+
+    with st.form("query"):
+        sql = st.text_area("SQL", EXAMPLES[example], height=260)
+        st.form_submit_button("▶️ Run")
+
+    with stage("query"):
+        try:
+            result = run_query(sql)
+        except TimeoutError as exc:
+            st.error(f"⏱️ {exc}. Narrow the query (fewer statements or years) and run it again.")
+        except sqlite3.Error as exc:
+            st.error(f"❌ {exc}")
+        else:
+            st.dataframe(result.frame, hide_index=True, use_container_width=True)
+            source = "cached" if result.cached else f"{result.ms:,.1f} ms"
+            st.caption(f"{len(result.frame):,} rows · {source}")
+            if result.truncated:
+                st.warning(f"Only the first {MAX_ROWS:,} rows are shown; add a LIMIT or a tighter WHERE clause.")
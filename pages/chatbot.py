@@ -1,182 +1,78 @@
-import pandas as pd
+import os
+from contextlib import closing
+
 import streamlit as st
-import openai
-# import os
+from kpi_context import load_context, report_context
+from llm import ask, set_api_key, stream
+from profiling import profiled_rerun, stage
+from utils import DEFAULT_WORKBOOK
 
 
 st.set_page_config(page_title="📊 KPI Chatbot", layout="wide")
 
-excel_path = "data/iras-fs-fy2324.xlsx"
-
-# --- Utilities ---
-def safe_int(val):
-    try:
-        return int(val)
-    except:
-        return 0
-
-def build_kpi_entry(val_new, val_old):
-    return {
-        "FY2023/24": val_new,
-        "FY2022/23": val_old,
-        "Change (%)": round((val_new - val_old) / val_old * 100, 2) if val_old else 0
-    }
-
-# --- Extractor 1: Financial Position ---
-def extract_kpi_financial_position(sheet_name="Statement of Financial Position"):
-    df = pd.read_excel(excel_path, sheet_name=sheet_name)
-    clean_df = df.dropna(how='all').dropna(axis=1, how='all').reset_index(drop=True)
-
-    def extract_kpi(row_label, col_label='INLAND REVENUE AUTHORITY OF SINGAPORE'):
-        row = clean_df[clean_df[col_label].astype(str).str.contains(row_label, case=False, na=False)]
-        if row.empty:
-            return None
-        val_new = safe_int(row["Unnamed: 4"].values[0])
-        val_old = safe_int(row["Unnamed: 6"].values[0])
-        return build_kpi_entry(val_new, val_old)
-
-    kpi = {
-        "Share Capital": extract_kpi("Share capital"),
-        "Accumulated Surplus": extract_kpi("Accumulated surplus"),
-        "Net Current Assets": extract_kpi("Net current assets"),
-        "Total Equity": build_kpi_entry(safe_int(df.iloc[6, 4]) + safe_int(df.iloc[5, 4]),
-                                        safe_int(df.iloc[6, 6]) + safe_int(df.iloc[5, 6])),
-        "Non-Current Assets": build_kpi_entry(df.iloc[11:16, 4].apply(safe_int).sum(),
-                                              df.iloc[11:16, 6].apply(safe_int).sum()),
-        "Total Current Assets": build_kpi_entry(df.iloc[19:23, 4].apply(safe_int).sum(),
-                                                df.iloc[19:23, 6].apply(safe_int).sum()),
-        "Total Current Liabilities": build_kpi_entry(df.iloc[28:36, 4].apply(safe_int).sum(),
-                                                     df.iloc[28:36, 6].apply(safe_int).sum()),
-        "Non-Current Liabilities": build_kpi_entry(df.iloc[43:46, 4].apply(safe_int).sum(),
-                                                   df.iloc[43:46, 6].apply(safe_int).sum())
-    }
-
-    return kpi
-
-# --- Extractor 2: Income Statement ---
-def extract_kpi_com_income(sheet_name="Statement of Com. Income"):
-    df = pd.read_excel(excel_path, sheet_name=sheet_name)
-    clean_df = df
-
-    def extract_kpi(row_label, col_label='INLAND REVENUE AUTHORITY OF SINGAPORE'):
-        row = clean_df[clean_df[col_label].astype(str).str.contains(row_label, case=False, na=False)]
-        if row.empty:
-            return None
-        val_new = safe_int(row["Unnamed: 4"].values[0])
-        val_old = safe_int(row["Unnamed: 6"].values[0])
-        return build_kpi_entry(val_new, val_old)
-
-    kpi = {
-        "Operating Income": build_kpi_entry(clean_df.iloc[6:8, 4].apply(safe_int).sum(),
-                                            clean_df.iloc[6:8, 6].apply(safe_int).sum()),
-        "Total Operating Expenditure": build_kpi_entry(clean_df.iloc[12:23, 4].apply(safe_int).sum(),
-                                                       clean_df.iloc[12:23, 6].apply(safe_int).sum()),
-        "Operating Surplus": extract_kpi("Operating surplus"),
-        "Net Investment Income/(Loss)": build_kpi_entry(safe_int(clean_df.iloc[27, 4]),
-                                                        safe_int(clean_df.iloc[27, 6])),
-        "Surplus Before Gov Fund": extract_kpi("Government Consolidated Fund"),
-        "Contribution to Gov Fund": extract_kpi("Contribution to Government Consolidated Fund"),
-        "Net Surplus for the Year": extract_kpi("comprehensive income for the financial year")
-    }
-
-    return kpi
-
-# --- Extractor 3: Cash Flow Statement ---
-def extract_kpi_cashflow(sheet_name="Statement of Cash Flows"):
-    df = pd.read_excel(excel_path, sheet_name=sheet_name)
-    clean_df = df
-    label_cols = ['INLAND REVENUE AUTHORITY OF SINGAPORE', 'Unnamed: 1', 'Unnamed: 2']
-    clean_df['combined_label'] = clean_df[label_cols].astype(str).agg(' '.join, axis=1)
-
-    def extract_kpi(row_label):
-        row = clean_df[clean_df['combined_label'].str.lower().str.contains(row_label.lower(), regex=False)]
-        if row.empty:
-            return build_kpi_entry(0, 0)
-        val_new = safe_int(row["Unnamed: 5"].values[0])
-        val_old = safe_int(row["Unnamed: 7"].values[0])
-        return build_kpi_entry(val_new, val_old)
-
-    kpi = {
-        "Net Cash from Operating Activities": extract_kpi("Net cash from operating activities"),
-        "Net Cash from Investing Activities": extract_kpi("Net cash used in investing activities"),
-        "Net Cash from Financing Activities": extract_kpi("Net cash used in financing activities"),
-        "Net Cash Movement": extract_kpi("Net (decrease)/increase in cash and cash equivalents"),
-        "Beginning Cash": build_kpi_entry(safe_int(clean_df.iloc[27, 5]), safe_int(clean_df.iloc[27, 7])),
-        "Ending Cash": build_kpi_entry(safe_int(clean_df.iloc[29, 5]), safe_int(clean_df.iloc[29, 7]))
-    }
-
-    return kpi
-
-# --- Dispatcher ---
-def extract_all_kpis(selected_report):
-    if selected_report == "Statement of Financial Position":
-        return extract_kpi_financial_position()
-    elif selected_report == "Statement of Com. Income":
-        return extract_kpi_com_income()
-    elif selected_report == "Statement of Cash Flows":
-        return extract_kpi_cashflow()
-    else:
-        return {"error": "Report not recognized"}
-
-def format_kpi_dict(kpi_dict):
-    return "\n".join(
-        f"{metric}: FY2023/24 = {data['FY2023/24']:,}, FY2022/23 = {data['FY2022/23']:,}, Change = {data['Change (%)']}%"
-        for metric, data in kpi_dict.items()
-        if isinstance(data, dict)
-    )
-
-# Checking the KPI dictionary
-# st.write(extract_kpi_financial_position(sheet_name="Statement of Financial Position"))
-
-# st.write(extract_kpi_com_income(sheet_name="Statement of Com. Income"))
-
-# st.write(extract_kpi_cashflow(sheet_name="Statement of Cash Flows"))
+# Render answers token by token as they arrive (CHAT_STREAMING=0 waits for the full answer)
+STREAM_ANSWERS = os.environ.get("CHAT_STREAMING", "1") != "0"
+# Picking another report mid-answer reruns the page; stop paying for the old answer, or let
+# it finish in the background so it is cached if the user switches back (CHAT_CANCEL_ON_CHANGE=0)
+CANCEL_ON_REPORT_CHANGE = os.environ.get("CHAT_CANCEL_ON_CHANGE", "1") != "0"
+
 # --- Streamlit UI ---
-st.title("💬 Ask Me About KPIs")
+with profiled_rerun("KPI Chatbot"):
+    st.title("💬 Ask Me About KPIs")
 
 
 
-# Select report
-report_options = [
-    "Statement of Financial Position",
-    "Statement of Com. Income",
-    "Statement of Cash Flows"
-]
-selected_report = st.selectbox("📄 Select a financial report:", report_options)
-report_kpi_raw = extract_all_kpis(selected_report)
-report_kpi = format_kpi_dict(report_kpi_raw)
+    # Select report
+    report_options = [
+        "Statement of Financial Position",
+        "Statement of Com. Income",
+        "Statement of Cash Flows"
+    ]
+    selected_report = st.selectbox("📄 Select a financial report:", report_options)
+    # Prompt-ready KPI summary, precomputed per workbook (see kpi_context.py / ingest.py)
+    with stage("kpi context"):
+        context = load_context(DEFAULT_WORKBOOK)
+        report_kpi = report_context(selected_report, context=context)["prompt"]
+        latest_year, previous_year = context["fiscal_year"], context["previous_year"]
 
-# User question
-question = st.text_input("💬 Ask a question about KPI or the financial report")
+    # User question
+    question = st.text_input("💬 Ask a question about KPI or the financial report")
 
-# Inject context
-system_prompt = f"""
+    # Inject context
+    system_prompt = f"""
 You are a financial analyst. The user selected the report: {selected_report}.
 
-Below is the KPI summary for that report. Each line includes the metric name, the value for FY2023/24, the value for FY2022/23, and the % change.
+Below is the KPI summary for that report. Each line includes the metric name, the value for {latest_year}, the value for {previous_year}, and the % change.
 
 Format:
-"Metric: FY2023/24 = X, FY2022/23 = Y, Change = Z%"
+"Metric: {latest_year} = X, {previous_year} = Y, Change = Z%"
 
 Use this data to explain the user's questions correctly and clearly.
 
 KPI Summary:
 {report_kpi}
 """
-# OpenAPI Key
-# ✅ Load secret key properly
-openai_api_key = st.secrets["openai_api_key"]
-openai.api_key = openai_api_key
-
-# Call OpenAI
-if question:
-    response = openai.ChatCompletion.create(
-        model="gpt-4",
-        messages=[
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": question}
-        ]
-    )
-    st.markdown(
-    f"<div style='color:black'><strong>Answer:</strong> {response['choices'][0]['message']['content']}</div>",
-    unsafe_allow_html=True)
+    # OpenAPI Key
+    # ✅ Load secret key properly
+    openai_api_key = st.secrets["openai_api_key"]
+    set_api_key(openai_api_key)
+
+    # Call OpenAI (answers are cached, so reruns with the same question are instant)
+    def render_answer(placeholder, answer):
+        placeholder.markdown(
+        f"<div style='color:black'><strong>Answer:</strong> {answer}</div>",
+        unsafe_allow_html=True)
+
+    if question:
+        placeholder = st.empty()
+        with stage("answer"):
+            if STREAM_ANSWERS:
+                answer = ""
+                tokens = stream(selected_report, system_prompt, question, model="gpt-4",
+                                finish_on_close=not CANCEL_ON_REPORT_CHANGE)
+                with closing(tokens):
+                    for token in tokens:
+                        answer += token
+                        render_answer(placeholder, answer)
+            else:
+                render_answer(placeholder, ask(selected_report, system_prompt, question, model="gpt-4"))
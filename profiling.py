@@ -0,0 +1,146 @@
+import cProfile
+import functools
+import os
+import re
+import threading
+import time
+import tracemalloc
+from collections import deque
+from contextlib import nullcontext
+
+
+# --- Stage timing ---
+# Set DASHBOARD_PROFILE=1 to time every stage of a page rerun (workbook parsing, KPI
+# evaluation, KPI tables, markdown cards, Plotly) and show the last rerun in the sidebar:
+#   DASHBOARD_PROFILE=1 streamlit run Home.py
+#   DASHBOARD_PROFILE=1 DASHBOARD_PROFILE_DIR=profiles streamlit run Home.py   # + cProfile dumps
+# Pages wrap their body in `with profiled_rerun(page):`, so the total is recorded and the
+# profiler stopped even when the rerun ends in st.stop(), st.rerun() or an exception.
+# With the flag unset stage() and profiled_rerun() hand back one shared no-op context, timed()
+# returns the function untouched and the rerun hooks return immediately, so nothing is
+# measured or kept.
+
+ENABLED = os.environ.get("DASHBOARD_PROFILE") == "1"
+PROFILE_DIR = os.environ.get("DASHBOARD_PROFILE_DIR")
+
+# Most recent stage records across all sessions; older ones fall off the end
+RING_SIZE = 1000
+records = deque(maxlen=RING_SIZE)
+
+_NOOP = nullcontext()
+_local = threading.local()  # each Streamlit session reruns in its own thread
+_rerun_ids = iter(range(1, 1 << 62))
+_ids_lock = threading.Lock()
+
+if ENABLED and not tracemalloc.is_tracing():
+    tracemalloc.start()
+
+
+class _Stage:
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.memory = tracemalloc.get_traced_memory()[0]
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.started
+        records.append({
+            "rerun": getattr(_local, "rerun", None),
+            "page": getattr(_local, "page", None),
+            "stage": self.name,
+            "ms": round(elapsed * 1000, 2),
+            "memory_kib": round((tracemalloc.get_traced_memory()[0] - self.memory) / 1024, 1),
+        })
+        return False
+
+
+def stage(name):
+    # with stage("table"): ...
+    return _Stage(name) if ENABLED else _NOOP
+
+
+def timed(name=None):
+    # @timed("load/parse workbook") - the function itself when profiling is off
+    def decorate(fn):
+        if not ENABLED:
+            return fn
+        label = name or fn.__qualname__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with _Stage(label):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def begin_rerun(page):
+    # Stages recorded until end_rerun() belong to this rerun; pages use profiled_rerun()
+    if not ENABLED:
+        return
+    with _ids_lock:
+        _local.rerun = next(_rerun_ids)
+    _local.page = page
+    _local.total = _Stage("total").__enter__()
+    _local.profiler = None
+    if PROFILE_DIR:
+        _local.profiler = cProfile.Profile()
+        _local.profiler.enable()
+
+
+def end_rerun(panel=True):
+    # Records the total, dumps cProfile stats and draws the panel
+    if not ENABLED or getattr(_local, "rerun", None) is None:
+        return
+    profiler = _local.profiler
+    if profiler is not None:
+        profiler.disable()
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        slug = re.sub(r"\W+", "_", _local.page).strip("_")
+        profiler.dump_stats(os.path.join(PROFILE_DIR, f"{slug}-{_local.rerun}.prof"))
+    _local.total.__exit__(None, None, None)
+    if panel:
+        show_panel(_local.rerun)
+    _local.rerun = None
+
+
+class _Rerun:
+    def __init__(self, page, panel):
+        self.page = page
+        self.panel = panel
+
+    def __enter__(self):
+        begin_rerun(self.page)
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        # Always closes the rerun; the panel is only drawn when the page ran to the end (a
+        # rerun or stop request discards what is drawn after it anyway)
+        end_rerun(panel=self.panel and exc_type is None)
+        return False
+
+
+def profiled_rerun(page, panel=True):
+    # with profiled_rerun("SQL Query"): <page body>
+    return _Rerun(page, panel) if ENABLED else _NOOP
+
+
+def rerun_records(rerun):
+    return [r for r in list(records) if r["rerun"] == rerun]
+
+
+def show_panel(rerun):
+    import pandas as pd
+    import streamlit as st
+
+    rows = rerun_records(rerun)
+    with st.sidebar.expander("⏱️ Rerun timings", expanded=True):
+        st.dataframe(pd.DataFrame(rows, columns=["stage", "ms", "memory_kib"]), hide_index=True)
+        history = pd.DataFrame(list(records))
+        if not history.empty:
+            summary = history[history["page"] == rows[0]["page"]].groupby("stage")["ms"].median()
+            st.caption("Median over recent reruns of this page (ms)")
+            st.dataframe(summary.round(2).rename("median ms"))
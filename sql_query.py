@@ -0,0 +1,142 @@
+import os
+import sqlite3
+import threading
+import time
+
+import pandas as pd
+
+import database
+from kpis import history_kpis
+from timeseries import discover_workbooks
+from utils import LRUCache, workbook_sha256
+
+
+# --- Ad-hoc SQL ---
+# Analysts' one-off cuts ("every expense line across all years ranked by growth") run as SQL
+# instead of a new page each time. Every query runs against an in-memory copy of the
+# line-item database (database.py) plus derived tables, rebuilt only when a workbook changes
+# (changed workbooks are imported into the database first, when its directory is writable):
+#   line_items         every line of every workbook, as imported
+#   latest_line_items  one row per fiscal year: the figure from the newest workbook reporting it
+#   kpis               every registry KPI per fiscal year (kpis.history_kpis), long format
+# Results are cached by (data version, SQL, parameters), and each connection keeps SQLite's
+# prepared-statement cache, so re-running a query re-uses its plan. Queries are read-only,
+# stopped after TIME_LIMIT_S and cut to MAX_ROWS rows.
+#   run_query("SELECT * FROM kpis WHERE kpi = ?", ("current_ratio",)).frame
+
+MAX_ROWS = 5000
+TIME_LIMIT_S = 2.0
+# SQLite calls the time check every this many virtual-machine instructions
+PROGRESS_STEPS = 10_000
+
+MAX_CACHED_RESULTS = 128
+_result_cache = LRUCache(MAX_CACHED_RESULTS)  # (data version, sql, params, max rows) -> QueryResult
+_engine_cache = LRUCache(2)  # data version -> QueryEngine
+
+_DERIVED = """
+CREATE TABLE latest_line_items AS
+    SELECT entity, fiscal_year, statement, section, line_item, position, value, scale
+    FROM line_items
+    WHERE published = (SELECT MAX(published) FROM line_items latest
+                       WHERE latest.statement = line_items.statement AND latest.fiscal_year = line_items.fiscal_year);
+CREATE INDEX latest_by_item ON latest_line_items (statement, section, line_item, fiscal_year, value);
+CREATE TABLE kpis (fiscal_year TEXT NOT NULL, kpi TEXT NOT NULL, value REAL);
+CREATE INDEX kpis_by_kpi ON kpis (kpi, fiscal_year, value);
+"""
+
+# Statements a query may use: reading tables and calling functions, nothing that writes,
+# attaches files or changes pragmas
+_ALLOWED_ACTIONS = {sqlite3.SQLITE_SELECT, sqlite3.SQLITE_READ, sqlite3.SQLITE_FUNCTION, sqlite3.SQLITE_RECURSIVE}
+
+
+def _authorize(action, *args):
+    return sqlite3.SQLITE_OK if action in _ALLOWED_ACTIONS else sqlite3.SQLITE_DENY
+
+
+class QueryResult:
+    def __init__(self, frame, truncated, ms, cached=False):
+        self.frame = frame
+        self.truncated = truncated
+        self.ms = ms
+        self.cached = cached
+
+
+def _copy_line_items(conn):
+    # Imports changed workbooks, then copies the line-item database into conn. A read-only
+    # deployment queries whatever was last imported, or empty line-item tables
+    try:
+        database.ingest()
+    except sqlite3.OperationalError:
+        pass
+    try:
+        database.connect().backup(conn)
+    except sqlite3.OperationalError:
+        conn.executescript(database.SCHEMA)
+
+
+class QueryEngine:
+    # One in-memory database for one data version; queries on it are serialised
+    def __init__(self):
+        self.conn = sqlite3.connect(":memory:", check_same_thread=False, cached_statements=256)
+        _copy_line_items(self.conn)
+        self.conn.executescript(_DERIVED)
+        history = history_kpis()
+        rows = [
+            (year, name, None if pd.isna(value) else float(value))
+            for name in history.columns
+            for year, value in history[name].items()
+        ]
+        with self.conn:
+            self.conn.executemany("INSERT INTO kpis VALUES (?, ?, ?)", rows)
+        tables = [r[0] for r in self.conn.execute("SELECT name FROM sqlite_master WHERE type = 'table' ORDER BY name")]
+        self.schema = {t: [r[1] for r in self.conn.execute(f"PRAGMA table_info({t})")] for t in tables}
+        self.conn.set_authorizer(_authorize)
+        self.lock = threading.Lock()
+
+    def execute(self, sql, params, max_rows, time_limit):
+        with self.lock:
+            deadline = time.perf_counter() + time_limit
+            self.conn.set_progress_handler(lambda: time.perf_counter() > deadline, PROGRESS_STEPS)
+            try:
+                cursor = self.conn.execute(sql, params)
+                rows = cursor.fetchmany(max_rows + 1)
+            except sqlite3.OperationalError as exc:
+                if str(exc) == "interrupted":
+                    raise TimeoutError(f"Query stopped after the {time_limit:g}s limit") from None
+                raise
+            finally:
+                self.conn.set_progress_handler(None, 0)
+        columns = [d[0] for d in cursor.description or ()]
+        return pd.DataFrame(rows[:max_rows], columns=columns), len(rows) > max_rows
+
+
+def data_version():
+    # The workbooks on disk and their hashes (re-hashed only when a file's mtime changes); a
+    # new version builds a new QueryEngine, which is when the database gets re-imported
+    return tuple((os.path.abspath(p), workbook_sha256(p)) for p in discover_workbooks())
+
+
+def schema():
+    # {table: [column, ...]} of everything a query can use
+    return _engine_cache.get_or_build(data_version(), QueryEngine).schema
+
+
+def run_query(sql, params=(), max_rows=MAX_ROWS, time_limit=TIME_LIMIT_S):
+    # -> QueryResult; raises sqlite3.Error for bad or disallowed SQL and TimeoutError past the limit
+    version = data_version()
+    key = (version, sql.strip(), tuple(params), max_rows)
+    hit = _result_cache.get(key)
+    if hit is not None:
+        return QueryResult(hit.frame.copy(), hit.truncated, 0.0, cached=True)
+
+    engine = _engine_cache.get_or_build(version, QueryEngine)
+    started = time.perf_counter()
+    frame, truncated = engine.execute(sql, tuple(params), max_rows, time_limit)
+    result = QueryResult(frame, truncated, round((time.perf_counter() - started) * 1000, 2))
+    _result_cache.put(key, result)
+    return QueryResult(frame.copy(), truncated, result.ms)
+
+
+def clear_query_cache():
+    _result_cache.clear()
+    _engine_cache.clear()
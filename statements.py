@@ -0,0 +1,600 @@
+import json
+import os
+import re
+from array import array
+
+import numpy as np
+import pandas as pd
+
+from accounting import parse_amounts, to_float, unit_scale
+from utils import (DEFAULT_WORKBOOK, STATEMENT_SHEETS, LRUCache, iter_sheet_rows, load_workbook,
+                   replace_atomically, snapshot_dir, snapshots_writable, workbook_key, workbook_sha256)
+
+
+# --- Statement model ---
+# Parses one IRAS statement sheet into line items once, instead of every KPI doing a
+# str.contains scan over the label column or reading hard-coded iloc positions. The parser
+# only relies on what every fiscal-year layout has in common:
+#   - a unit row ("S$'000") marking the value columns, with the period/column names above it
+#   - a "Note" column that is not part of the label
+#   - labels spread over one or more columns to the left of the values, sometimes wrapped
+#     over two rows ("Contribution payable to Government" / "Consolidated Fund")
+#   - section headers (label without values) followed by their items, closed by a blank row
+
+UNIT_PATTERN = re.compile(r"S\$\s*['’]?\s*000")
+
+# A label-only row ending with one of these words is wrapped onto the next row
+CONNECTOR_WORDS = {"the", "of", "to", "and", "for", "before", "by", "from", "in", "on", "with", "total", "representing"}
+
+
+# Some lines are worded by the sign of the result, so the same line item reads differently
+# from year to year. Every variant is indexed under the FY2023/24 wording.
+LABEL_ALIASES = {
+    "net investment (loss)/income": "net investment income/(loss)",
+    "net investment income": "net investment income/(loss)",
+    "net investment loss": "net investment income/(loss)",
+    "net increase in cash and cash equivalents": "net (decrease)/increase in cash and cash equivalents",
+    "net decrease in cash and cash equivalents": "net (decrease)/increase in cash and cash equivalents",
+    "net increase/(decrease) in cash and cash equivalents": "net (decrease)/increase in cash and cash equivalents",
+}
+
+
+def normalize_label(text):
+    text = str(text).replace("’", "'").lower()
+    text = " ".join(text.split()).rstrip(":").strip()
+    return LABEL_ALIASES.get(text, text)
+
+
+def yoy(val_new, val_old):
+    pct_change = ((val_new - val_old) / val_old) * 100 if val_old != 0 else 0
+    return val_new, val_old, round(pct_change, 2)
+
+
+def _trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def _similarity(a, b):
+    # Dice coefficient of the two labels' trigram sets, 1.0 for identical labels
+    grams_a, grams_b = _trigrams(a), _trigrams(b)
+    if not grams_a or not grams_b:
+        return float(a == b)
+    return 2 * len(grams_a & grams_b) / (len(grams_a) + len(grams_b))
+
+
+# lookup() only binds a line item to a label other than the one asked for when the two
+# are at least this similar: "cash equivalents" still finds "cash and cash equivalents"
+# (0.82), but "income" no longer silently reads "other income" (0.57)
+LOOKUP_MIN_SIMILARITY = 0.8
+
+
+def _is_blank(val):
+    return val is None or (isinstance(val, float) and np.isnan(val)) or (isinstance(val, str) and not val.strip())
+
+
+class Statement:
+    def __init__(self, df, name=None):
+        self.name = name
+        self._parse_header(df)
+        self._parse_rows(df)
+
+    @classmethod
+    def from_rows(cls, sheet):
+        # Built from read_statement_rows() instead of a whole pd.read_excel sheet
+        self = cls.__new__(cls)
+        self.name = sheet.name
+        self._parse_header(sheet.header)
+        rows = sheet.rows
+        self._build_items(rows["row"].tolist(), rows["label"].to_numpy(dtype=object),
+                          rows["indent_column"].to_numpy(), rows["indent_spaces"].to_numpy(),
+                          rows["has_label"].to_numpy(), rows["has_values"].to_numpy(),
+                          to_float(sheet.amounts, sheet.missing))
+        return self
+
+    @classmethod
+    def from_store(cls, meta, amounts, missing, values):
+        # Attached from the shared store (see attach_statement): amounts, missing and values are
+        # the memory-mapped arrays and the items' period columns are views of values, so the
+        # figures are never copied; only the label metadata and lookup indexes are per process
+        self = cls.__new__(cls)
+        self.name = meta["name"]
+        self.periods = meta["periods"]
+        self.scale = meta["scale"]
+        self.label_columns = meta["label_columns"]
+        self.value_columns = meta["value_columns"]
+        self.data_start = meta["data_start"]
+        self.amounts = amounts
+        self.missing = missing
+        self.values = values
+        # One float block over the mapped values; the label columns are inserted in front of it
+        self.items = pd.DataFrame(values, columns=self.periods, copy=False)
+        for i, column in enumerate(_ITEM_COLUMNS):
+            self.items.insert(i, column, meta["items"][column])
+        self.sections = {name: tuple(bounds) for name, bounds in meta["sections"].items()}
+        self._index_items()
+        return self
+
+    # --- Header: value columns, their names, and the columns that make up the label ---
+    def _parse_header(self, df):
+        unit_row = None
+        for i, row in enumerate(df.itertuples(index=False)):
+            if any(isinstance(v, str) and UNIT_PATTERN.search(v) for v in row):
+                unit_row = i
+                break
+        if unit_row is None:
+            raise ValueError(f"No S$'000 unit row found in sheet {self.name!r}")
+
+        header = df.iloc[:unit_row]
+        unit_cells = df.iloc[unit_row]
+        self.value_columns = [c for c in df.columns if isinstance(unit_cells[c], str) and UNIT_PATTERN.search(unit_cells[c])]
+        # Figures stay in the sheet's unit (S$'000); multiply by scale for dollars
+        self.scale = unit_scale(unit_cells[self.value_columns[0]])
+        self.periods = [
+            " ".join(str(v).strip() for v in header[c] if not _is_blank(v)) or str(c)
+            for c in self.value_columns
+        ]
+
+        note_columns = {c for c in df.columns if any(isinstance(v, str) and v.strip().lower() == "note" for v in header[c])}
+        first_value = list(df.columns).index(self.value_columns[0])
+        self.label_columns = [c for c in df.columns[:first_value] if c not in note_columns]
+        self.data_start = unit_row + 1
+
+    # --- Body: line items, wrapped labels and sections ---
+    def _parse_rows(self, df):
+        body = df.iloc[self.data_start:]
+
+        # Label: every label column's text joined with single spaces, built column-wise for
+        # the whole sheet at once rather than row by row
+        text = body[self.label_columns].astype(object)
+        text = text.where(text.notna(), "").astype(str)
+        present = text.apply(lambda col: col.str.strip() != "").to_numpy()
+        combined = text.iloc[:, 0].str.cat([text[c] for c in self.label_columns[1:]], sep=" ")
+        labels = combined.str.split().str.join(" ").to_numpy()
+
+        # Indent: (position of the first label column with text, its leading spaces)
+        first = present.argmax(axis=1)
+        leading = text.apply(lambda col: col.str.len() - col.str.lstrip().str.len()).to_numpy()
+        leading = leading[np.arange(len(body)), first]
+        has_label = present.any(axis=1)
+
+        raw = body[self.value_columns].astype(object)
+        has_values = raw.where(raw.notna(), "").astype(str).apply(lambda col: col.str.strip() != "").to_numpy().any(axis=1)
+        values = to_float(*parse_amounts(raw))
+
+        self._build_items(range(self.data_start, len(df)), labels, first, leading, has_label, has_values, values)
+
+    def _build_items(self, row_numbers, labels, first, leading, has_label, has_values, values):
+        rows = [
+            {
+                "row": row_no,
+                "label": labels[i],
+                "indent": (int(first[i]), int(leading[i])) if has_label[i] else None,
+                "has_values": bool(has_values[i]),
+                "values": list(values[i]),
+            }
+            for i, row_no in enumerate(row_numbers)
+        ]
+
+        rows = self._join_wrapped_labels(rows)
+
+        items = []
+        sections = {}
+        section = None
+        for i, r in enumerate(rows):
+            blank = not r["label"] and not r["has_values"]
+            if blank:
+                section = None
+                continue
+            if not r["has_values"]:
+                # Label without values: a new section header (empty ones are dropped below)
+                section = normalize_label(r["label"])
+                sections[section] = []
+                continue
+            kind = "item" if r["label"] else "subtotal"
+            items.append({
+                "label": normalize_label(r["label"]) if r["label"] else "",
+                "text": r["label"],
+                "section": section,
+                "kind": kind,
+                "row": r["row"],
+                **dict(zip(self.periods, r["values"])),
+            })
+            if section is not None:
+                sections[section].append(len(items) - 1)
+
+        self.items = pd.DataFrame(items, columns=["label", "text", "section", "kind", "row"] + self.periods)
+        self.values = self.items[self.periods].to_numpy(dtype=float)
+        # int64 amounts with missing cells as 0, and the mask telling them apart from a nil
+        self.missing = np.isnan(self.values)
+        self.amounts = np.where(self.missing, 0, self.values).astype(np.int64)
+        self.sections = {}
+        for name, positions in sections.items():
+            if positions:
+                self.sections[name] = (positions[0], positions[-1] + 1)
+                self._mark_section_total(positions)
+        self._index_items()
+
+    def _index_items(self):
+        # label -> item positions (a label can repeat, e.g. "Lease liabilities" in both
+        # current and non-current liabilities), and (section, label) -> position
+        self._index = {}
+        self._section_index = {}
+        for pos, (label, section) in enumerate(zip(self.items["label"], self.items["section"])):
+            if label:
+                self._index.setdefault(label, []).append(pos)
+                self._section_index.setdefault((section, label), pos)
+
+        # trigram -> labels containing it, so search() only looks at labels sharing text with
+        # the query instead of scanning every row
+        self._trigram_index = {}
+        for label in self._index:
+            for gram in _trigrams(label):
+                self._trigram_index.setdefault(gram, []).append(label)
+
+    @staticmethod
+    def _join_wrapped_labels(rows):
+        joined = []
+        i = 0
+        while i < len(rows):
+            r = dict(rows[i])
+            nxt = rows[i + 1] if i + 1 < len(rows) else None
+            # "Contribution payable to Government" + "Consolidated Fund" (values on 2nd row)
+            if r["label"] and not r["has_values"] and nxt and nxt["label"] and nxt["has_values"]:
+                words = r["label"].split()
+                if (nxt["label"][0].islower() or words[-1].lower() in CONNECTOR_WORDS
+                        or (r["indent"][0] == nxt["indent"][0] > 0 and nxt["indent"][1] >= r["indent"][1])):
+                    r.update(nxt, label=r["label"] + " " + nxt["label"], row=nxt["row"], indent=r["indent"])
+                    joined.append(r)
+                    i += 2
+                    continue
+            # "Total comprehensive income for the" (values on 1st row) + "financial year"
+            if (r["label"] and not r["has_values"] and joined and joined[-1]["label"] and joined[-1]["has_values"]
+                    and not (nxt and nxt["label"] and nxt["has_values"])):
+                joined[-1]["label"] += " " + r["label"]
+                i += 1
+                continue
+            joined.append(r)
+            i += 1
+        return joined
+
+    def _mark_section_total(self, positions):
+        # Cash-flow sections end with their own total ("Net cash from operating activities")
+        # as a labelled line; spot it by checking it equals the sum of the lines above it
+        labelled = [p for p in positions if self.items.at[p, "kind"] == "item"]
+        if len(labelled) < 3 or len(labelled) != len(positions):
+            return
+        last = labelled[-1]
+        above = self.amounts[labelled[:-1]].sum(axis=0)
+        if np.array_equal(above, self.amounts[last]):
+            self.items.at[last, "kind"] = "total"
+
+    # --- Lookups ---
+    def position(self, *labels, section=None):
+        for label in labels:
+            key = normalize_label(label)
+            if section is not None:
+                pos = self._section_index.get((normalize_label(section), key))
+                if pos is not None:
+                    return pos
+            elif key in self._index:
+                return self._index[key][0]
+        return None
+
+    def positions(self, label):
+        return list(self._index.get(normalize_label(label), []))
+
+    def get(self, *labels, section=None):
+        # Values of the first label that exists, one per period; missing cells count as 0
+        pos = self.position(*labels, section=section)
+        if pos is None:
+            return None
+        return self.amounts[pos]
+
+    def occurrences(self, label, period):
+        # Every value of a repeated label in one column, top to bottom (the equity statement
+        # lists "Total comprehensive income" once per year)
+        col = self.periods.index(period)
+        return self.amounts[self.positions(label), col]
+
+    def search(self, text, section=None, fuzzy=True, min_similarity=0.6):
+        # Item positions whose label matches `text`, best first: the exact label, then labels
+        # containing it (the pages' old str.contains lookup), then - if fuzzy - labels sharing
+        # most of its trigrams, which catches rewording between years
+        query = normalize_label(text)
+        grams = _trigrams(query)
+        shared = {}
+        if grams:
+            for gram in grams:
+                for label in self._trigram_index.get(gram, ()):
+                    shared[label] = shared.get(label, 0) + 1
+        else:
+            shared = {label: 0 for label in self._index}
+
+        exact = [query] if query in self._index else []
+        contains = [label for label, n in shared.items() if n == len(grams) and query in label and label != query]
+        ranked = exact + sorted(contains, key=self._index.__getitem__)
+        if fuzzy and grams:
+            similarity = {
+                label: 2 * n / (len(grams) + len(_trigrams(label)))
+                for label, n in shared.items() if label not in ranked
+            }
+            ranked += sorted((label for label, s in similarity.items() if s >= min_similarity),
+                             key=lambda label: (-similarity[label], self._index[label]))
+
+        positions = [pos for label in ranked for pos in self._index[label]]
+        if section is not None:
+            section = normalize_label(section)
+            positions = [pos for pos in positions if self.items.at[pos, "section"] == section]
+        return positions
+
+    def lookup(self, label, section=None, fuzzy=False):
+        # Like get(), but falls back to the best search() match when there is no exact label,
+        # provided it is at least LOOKUP_MIN_SIMILARITY similar to the label asked for
+        pos = self.position(label, section=section)
+        if pos is None:
+            query = normalize_label(label)
+            matches = self.search(label, section=section, fuzzy=fuzzy, min_similarity=LOOKUP_MIN_SIMILARITY)
+            matches = [pos for pos in matches
+                       if _similarity(query, self.items.at[pos, "label"]) >= LOOKUP_MIN_SIMILARITY]
+            if not matches:
+                return None
+            pos = matches[0]
+        return self.amounts[pos]
+
+    def section_items(self, section):
+        start, stop = self.sections[normalize_label(section)]
+        return self.items.iloc[start:stop]
+
+    def section_total(self, section):
+        items = self.section_items(section)
+        totals = items[items["kind"].isin(["subtotal", "total"])]
+        if not totals.empty:
+            return self.amounts[totals.index[-1]]
+        return self.amounts[items.index].sum(axis=0)
+
+    def total(self, *labels):
+        # Sum of every label's values; a label the statement does not have is an error rather
+        # than a silent zero
+        values = []
+        for label in labels:
+            value = self.get(label)
+            if value is None:
+                raise KeyError(f"{self.name!r} has no line item {label!r}")
+            values.append(value)
+        return sum(values)
+
+    # (latest, previous, % change) in the shape the pages' KPI tables use
+    def kpi(self, *labels, section=None):
+        values = self.get(*labels, section=section)
+        if values is None:
+            return None, None, None
+        return self.kpi_from(values)
+
+    @staticmethod
+    def kpi_from(values):
+        return yoy(int(values[0]), int(values[1]))
+
+
+# --- Streaming reader ---
+# pd.read_excel materialises every cell of a sheet as an object DataFrame, the mostly-empty
+# "Unnamed: N" columns included, before a statement is parsed out of it. For large
+# consolidated workbooks read_statement_rows() streams the sheet instead (openpyxl read-only
+# mode), keeps only each row's label and value cells, and packs them into compact columns
+# every CHUNK_ROWS rows: categorical labels, small-int indents and int64 amounts. Peak memory
+# then follows the line items kept, not the size of the raw sheet.
+#   STREAM_WORKBOOKS=1 streamlit run Home.py    # load_statement() always reads through it,
+#                                               # bypassing the shared store below
+#   python batch_kpis.py "data/*.xlsx" --stream
+
+STREAM_WORKBOOKS = os.environ.get("STREAM_WORKBOOKS") == "1"
+CHUNK_ROWS = 4096
+# The unit row is always near the top; give up rather than buffer a whole sheet looking for it
+MAX_HEADER_ROWS = 50
+
+
+class SheetRows:
+    # header: the rows down to the unit row, shaped like pd.read_excel's frame
+    # rows: one per body row - row, label (categorical), indent_column, indent_spaces,
+    #       has_label, has_values
+    # amounts / missing: int64 values and missing-cell mask, one column per value column
+    def __init__(self, name, header, rows, amounts, missing):
+        self.name = name
+        self.header = header
+        self.rows = rows
+        self.amounts = amounts
+        self.missing = missing
+
+
+def _cell(value):
+    # As pd.read_excel reads it: integral floats become ints, empty text is blank
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if value == "":
+        return None
+    return value
+
+
+def _header_frame(names, header_rows):
+    width = max(len(names), *(len(r) for r in header_rows))
+    names = list(names) + [None] * (width - len(names))
+    columns = [f"Unnamed: {i}" if _is_blank(v) else str(v) for i, v in enumerate(names)]
+    return pd.DataFrame([r + (None,) * (width - len(r)) for r in header_rows], columns=columns, dtype=object)
+
+
+def read_statement_rows(path, sheet_name):
+    stream = iter_sheet_rows(path, sheet_name)
+    try:
+        # The first row is the one pd.read_excel turns into column names
+        names = tuple(_cell(v) for v in next(stream, ()))
+        header_rows = []
+        for row in stream:
+            header_rows.append(tuple(_cell(v) for v in row))
+            if any(isinstance(v, str) and UNIT_PATTERN.search(v) for v in row):
+                break
+            if len(header_rows) >= MAX_HEADER_ROWS:
+                raise ValueError(f"No S$'000 unit row in the first {MAX_HEADER_ROWS} rows of sheet {sheet_name!r}")
+        if not header_rows:
+            raise ValueError(f"No S$'000 unit row found in sheet {sheet_name!r}")
+        header = _header_frame(names, header_rows)
+        layout = Statement.__new__(Statement)
+        layout.name = sheet_name
+        layout._parse_header(header)
+        label_at = [header.columns.get_loc(c) for c in layout.label_columns]
+        value_at = [header.columns.get_loc(c) for c in layout.value_columns]
+
+        categories, codes = {}, array("l")
+        first, leading = array("l"), array("l")
+        has_label, has_values = array("b"), array("b")
+        amounts, missing, pending = [], [], []
+
+        def flush():
+            if pending:
+                chunk = parse_amounts(pd.DataFrame(pending, dtype=object))
+                amounts.append(chunk[0])
+                missing.append(chunk[1])
+                pending.clear()
+
+        for row in stream:
+            cells = [_cell(row[i]) if i < len(row) else None for i in label_at]
+            texts = ["" if v is None else str(v) for v in cells]
+            present = [t.strip() != "" for t in texts]
+            j = present.index(True) if any(present) else 0
+            label = " ".join(" ".join(texts).split())
+            codes.append(categories.setdefault(label, len(categories)))
+            first.append(j)
+            leading.append(len(texts[j]) - len(texts[j].lstrip()))
+            has_label.append(any(present))
+
+            values = [_cell(row[i]) if i < len(row) else None for i in value_at]
+            has_values.append(any(v is not None and str(v).strip() != "" for v in values))
+            pending.append(values)
+            if len(pending) >= CHUNK_ROWS:
+                flush()
+        flush()
+    finally:
+        stream.close()
+
+    count = len(codes)
+    rows = pd.DataFrame({
+        "row": np.arange(layout.data_start, layout.data_start + count, dtype=np.int32),
+        "label": pd.Categorical.from_codes(np.asarray(codes, dtype=np.int32), categories=list(categories)),
+        "indent_column": np.asarray(first, dtype=np.int16),
+        "indent_spaces": np.asarray(leading, dtype=np.int32),
+        "has_label": np.asarray(has_label, dtype=bool),
+        "has_values": np.asarray(has_values, dtype=bool),
+    })
+    width = len(value_at)
+    return SheetRows(
+        sheet_name, header, rows,
+        np.vstack(amounts) if amounts else np.empty((0, width), dtype=np.int64),
+        np.vstack(missing) if missing else np.empty((0, width), dtype=bool),
+    )
+
+
+# --- Shared statement store ---
+# Every Streamlit process behind the load balancer used to parse its own copy of each
+# statement, holding the raw sheets alongside. A parsed statement is now published once next
+# to its workbook (data/iras-fs-fy2324.snapshot/statements/) as three .npy arrays (amounts,
+# the missing mask and the decoded float values) plus a JSON of labels, sections and layout.
+# Other processes np.load the arrays memory-mapped and use them as they are, so the OS keeps
+# a single copy in the page cache however many workers attach, and an attaching worker never
+# loads the workbook itself. An entry is tied to the
+# workbook's sha256 and republished by whichever process first parses a changed file.
+
+STORE_VERSION = 2
+STORE_DIR = "statements"
+_ITEM_COLUMNS = ["label", "text", "section", "kind", "row"]
+
+
+def _store_paths(path, sheet_name):
+    slug = re.sub(r"\W+", "_", sheet_name).strip("_").lower()
+    base = os.path.join(snapshot_dir(path), STORE_DIR, slug)
+    return base + ".json", base + ".amounts.npy", base + ".missing.npy", base + ".values.npy"
+
+
+def publish_statement(path, statement, sha=None):
+    if not snapshots_writable():
+        return False
+    meta_file, *array_files = _store_paths(path, statement.name)
+    meta = {
+        "version": STORE_VERSION,
+        "sha256": sha or workbook_sha256(path),
+        "name": statement.name,
+        "periods": statement.periods,
+        "scale": statement.scale,
+        "label_columns": [str(c) for c in statement.label_columns],
+        "value_columns": [str(c) for c in statement.value_columns],
+        "data_start": statement.data_start,
+        "items": {column: statement.items[column].tolist() for column in _ITEM_COLUMNS},
+        "sections": {name: list(bounds) for name, bounds in statement.sections.items()},
+    }
+    try:
+        os.makedirs(os.path.dirname(meta_file), exist_ok=True)
+        # Values are stored column-major so each period column is a contiguous view
+        arrays = (np.ascontiguousarray(statement.amounts), np.ascontiguousarray(statement.missing),
+                  np.asfortranarray(statement.values))
+        for target, array in zip(array_files, arrays):
+            replace_atomically(target, lambda f: np.save(f, array))
+        # The metadata goes last so a half-written entry is never attached
+        replace_atomically(meta_file, lambda f: json.dump(meta, f), binary=False)
+    except OSError:
+        # Read-only data directory: every process keeps its own parse
+        return False
+    return True
+
+
+def _read_store_meta(path, sheet_name, sha=None):
+    try:
+        with open(_store_paths(path, sheet_name)[0], encoding="utf-8") as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if meta.get("version") != STORE_VERSION or meta.get("sha256") != (sha or workbook_sha256(path)):
+        return None
+    return meta
+
+
+def attach_statement(path, sheet_name, sha=None):
+    # The published statement for this sheet, or None if there is none for this workbook version
+    meta = _read_store_meta(path, sheet_name, sha)
+    if meta is None:
+        return None
+    try:
+        arrays = [np.load(f, mmap_mode="r") for f in _store_paths(path, sheet_name)[1:]]
+    except (OSError, ValueError):
+        return None
+    return Statement.from_store(meta, *arrays)
+
+
+def _build_statement(sheet_name, path):
+    if STREAM_WORKBOOKS:
+        # Checked before the store, so the flag holds for every load, not just cold builds
+        return Statement.from_rows(read_statement_rows(path, sheet_name))
+    sha = workbook_sha256(path)
+    statement = attach_statement(path, sheet_name, sha)
+    if statement is None:
+        statement = Statement(load_workbook(path)[sheet_name], name=sheet_name)
+        publish_statement(path, statement, sha)
+    return statement
+
+
+def build_stores(paths, force=False):
+    # Publishes every statement sheet of the given workbooks; returns the workbooks rebuilt
+    built = []
+    for path in paths:
+        sha = workbook_sha256(path)
+        stale = [sheet for sheet in STATEMENT_SHEETS if force or _read_store_meta(path, sheet, sha) is None]
+        for sheet in stale:
+            publish_statement(path, Statement(load_workbook(path)[sheet], name=sheet), sha)
+        if stale:
+            built.append(path)
+    return built
+
+
+MAX_CACHED_STATEMENTS = 32
+_statement_cache = LRUCache(MAX_CACHED_STATEMENTS)
+
+
+def load_statement(sheet_name, path=DEFAULT_WORKBOOK):
+    key = workbook_key(path) + (sheet_name,)
+    return _statement_cache.get_or_build(key, lambda: _build_statement(sheet_name, path))
@@ -0,0 +1,112 @@
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from utils import LRUCache, data_version
+
+
+# --- KPI tables ---
+# The pages formatted their KPI tables with a pandas Styler: a Python color callback per
+# cell on every rerun, and the whole table rendered to HTML. Amounts and percentages now stay
+# numeric, so the browser formats them through NumberColumn and header clicks sort by value;
+# the only text is the sign marker (🟢/🔴/➖) in a Trend column next to each percentage,
+# computed column-wise once per data version. Tables longer than a page get server-side
+# sorting and pagination, so only one page of rows is sent to the browser.
+
+PAGE_SIZE = 25
+MAX_CACHED_TABLES = 32
+_table_cache = LRUCache(MAX_CACHED_TABLES)  # data version -> (numbers, display frame)
+
+_SIGNS = np.array(["🟢", "🔴", "➖"])
+AMOUNT_FORMAT = "%.0f"
+PERCENT_FORMAT = "%+.2f%%"
+
+
+def trend_column(column):
+    # Name of the marker column shown in front of a percentage column
+    return "Trend" if column == "% Change" else f"{column} trend"
+
+
+def _markers(pct):
+    # 🟢 above zero, 🔴 below, ➖ at zero; blank where the change is missing
+    marker = _SIGNS[np.select([pct > 0, pct < 0], [0, 1], 2)]
+    return np.where(np.isnan(pct), "", marker)
+
+
+def prepare(frame, amounts, percents=("% Change",)):
+    # -> (numbers, display); cached by the frame's data version
+    def build():
+        numbers = frame.copy()
+        for column in [*amounts, *percents]:
+            numbers[column] = pd.to_numeric(frame[column], errors="coerce").astype(float)
+        display = numbers.copy()
+        for column in percents:
+            pct = numbers[column].to_numpy()
+            display.insert(display.columns.get_loc(column), trend_column(column), _markers(pct))
+        return numbers, display
+    version = data_version(frame, list(amounts), list(percents))
+    return _table_cache.get_or_build(version, build)
+
+
+def column_config(frame, amounts, percents=("% Change",)):
+    trends = {trend_column(column) for column in percents}
+    config = {}
+    for column in frame.columns:
+        if column in amounts:
+            config[column] = st.column_config.NumberColumn(column, help="SGD", format=AMOUNT_FORMAT)
+        elif column in percents:
+            config[column] = st.column_config.NumberColumn(column, help="Change against the previous year",
+                                                           format=PERCENT_FORMAT)
+        elif column in trends:
+            config[column] = st.column_config.TextColumn(column, width="small")
+        else:
+            config[column] = st.column_config.TextColumn(column)
+    return config
+
+
+def kpi_frame(kpi_results, years=("FY2023/24", "FY2022/23")):
+    # {label: (latest, previous, % change)} -> the pages' Metric / year / year / % Change table
+    frame = pd.DataFrame.from_dict(kpi_results, orient="index", columns=[*years, "% Change"])
+    frame.index.name = "Metric"
+    return frame.reset_index()
+
+
+def history_frame(history, names):
+    # history_kpis() frame, {label: KPI name} -> one row per (metric, fiscal year)
+    frame = history[list(names.values())].set_axis(list(names), axis=1).dropna(how="all")
+    frame.index.name = "Fiscal year"
+    long = frame.reset_index().melt(id_vars="Fiscal year", var_name="Metric", value_name="Amount")
+    long = long[["Metric", "Fiscal year", "Amount"]]
+    # Same convention as statements.yoy: 0% when the previous year is zero
+    previous = long.groupby("Metric", sort=False)["Amount"].shift()
+    change = (long["Amount"] - previous) / previous.where(previous != 0) * 100
+    long["% Change"] = change.mask(previous == 0, 0.0).round(2)
+    return long
+
+
+def _page(numbers, display, key):
+    # Server-side sort and page selection; returns the rows to send
+    sort_col, order_col, page_col = st.columns([2, 1, 1])
+    sort_by = sort_col.selectbox("Sort by", ["(table order)", *numbers.columns], key=f"{key}_sort")
+    descending = order_col.selectbox("Order", ["Ascending", "Descending"], key=f"{key}_order") == "Descending"
+    pages = -(-len(display) // PAGE_SIZE)
+    page = page_col.number_input("Page", min_value=1, max_value=pages, value=1, key=f"{key}_page")
+
+    order = numbers.index
+    if sort_by != "(table order)":
+        order = numbers[sort_by].sort_values(ascending=not descending, na_position="last", kind="stable").index
+    start = (page - 1) * PAGE_SIZE
+    rows = order[start:start + PAGE_SIZE]
+    st.caption(f"Rows {start + 1}–{start + len(rows)} of {len(display)}")
+    return display.loc[rows]
+
+
+def kpi_table(frame, amounts, percents=("% Change",), key="kpi_table"):
+    numbers, display = prepare(frame, amounts, percents)
+    if len(display) > PAGE_SIZE:
+        display = _page(numbers, display, key)
+    st.dataframe(display, column_config=column_config(display, amounts, percents), hide_index=True)
+
+
+def clear_table_cache():
+    _table_cache.clear()
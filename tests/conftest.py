@@ -0,0 +1,89 @@
+import os
+import shutil
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(ROOT, "data")
+sys.path.insert(0, ROOT)
+
+
+def _copy_workbooks(target):
+    target.mkdir()
+    for name in os.listdir(DATA_DIR):
+        if name.startswith("iras-fs-fy") and name.endswith(".xlsx"):
+            shutil.copy(os.path.join(DATA_DIR, name), target / name)
+
+
+def _data_state():
+    return sorted((os.path.join(folder, name), os.stat(os.path.join(folder, name)).st_mtime_ns)
+                  for folder, dirs, files in os.walk(DATA_DIR) for name in dirs + files)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def checkout_untouched():
+    # Nothing the suite runs may write to the real data/ (snapshots, stores, the database,
+    # insights.json): everything goes to tmp copies
+    before = _data_state()
+    yield
+    assert _data_state() == before, "the test suite changed data/"
+
+
+@pytest.fixture(scope="session")
+def site(tmp_path_factory):
+    # A scratch working directory whose data/ holds copies of the workbooks: the pages,
+    # ingest.py and every default "data/..." path resolve there instead of the checkout
+    root = tmp_path_factory.mktemp("site")
+    _copy_workbooks(root / "data")
+    return str(root)
+
+
+@pytest.fixture(autouse=True)
+def in_site(site, monkeypatch):
+    import database
+
+    monkeypatch.chdir(site)
+    monkeypatch.setattr(database, "DB_PATH", os.path.join(site, "data", "line_items.sqlite"))
+    return site
+
+
+@pytest.fixture
+def workbook(tmp_path):
+    # A private copy of the current workbook, so snapshots and stores are written under tmp_path
+    path = tmp_path / "iras-fs-fy2324.xlsx"
+    shutil.copy(os.path.join(DATA_DIR, "iras-fs-fy2324.xlsx"), path)
+    return str(path)
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    # A private copy of every workbook in data/
+    target = tmp_path / "data"
+    _copy_workbooks(target)
+    return str(target)
+
+
+@pytest.fixture
+def openai_stub():
+    # The local fake chat completions server (openai_stub.py), with the openai client and
+    # llm's answer cache pointed at it
+    import openai
+
+    import llm
+    import openai_stub as stub
+
+    server = stub.serve(port=0)
+    previous_base = openai.api_base
+    openai.api_base = f"http://127.0.0.1:{server.server_address[1]}/v1"
+    llm.set_api_key("test")
+    llm.clear_response_cache()
+    stub.StubHandler.calls = stub.StubHandler.disconnects = 0
+    try:
+        yield stub.StubHandler
+    finally:
+        server.shutdown()
+        server.server_close()
+        openai.api_base = previous_base
+        stub.StubHandler.delay = stub.StubHandler.token_delay = 0.0
+        llm.clear_response_cache()
@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from accounting import parse_amounts, to_float, unit_scale
+from statements import Statement
+from utils import STATEMENT_SHEETS, load_workbook
+
+# (cell, amount, missing)
+CASES = [
+    (1234, 1234, False),
+    (1234.0, 1234, False),
+    (-56.4, -56, False),
+    ("1,234", 1234, False),
+    ("1 234 567", 1234567, False),
+    ("(1,234)", -1234, False),
+    ("( 1,234 )", -1234, False),
+    ("-1,234", -1234, False),
+    ("−1,234", -1234, False),       # unicode minus
+    ("S$1,234", 1234, False),
+    ("S$ (1,234)", -1234, False),
+    ("$1,234", 1234, False),
+    ("-", 0, False),
+    ("–", 0, False),                # en dash
+    ("—", 0, False),                # em dash
+    ("−", 0, False),                # a lone unicode minus
+    ("", 0, True),
+    ("   ", 0, True),
+    (None, 0, True),
+    (np.nan, 0, True),
+    ("n.m.", 0, True),
+]
+
+
+@pytest.mark.parametrize("cell, amount, missing", CASES)
+def test_parse_amounts(cell, amount, missing):
+    amounts, mask = parse_amounts(pd.DataFrame({"FY2023/24": [cell]}, dtype=object))
+    assert amounts.dtype == np.int64
+    assert amounts[0, 0] == amount
+    assert mask[0, 0] == missing
+
+
+def test_parse_amounts_whole_block():
+    frame = pd.DataFrame({"a": ["(1,234)", "-", None], "b": [5.0, np.nan, 7.0]})
+    amounts, missing = parse_amounts(frame, scale=1000)
+    np.testing.assert_array_equal(amounts, [[-1_234_000, 5000], [0, 0], [0, 7000]])
+    np.testing.assert_array_equal(missing, [[False, False], [False, True], [True, False]])
+    np.testing.assert_array_equal(to_float(amounts, missing), [[-1_234_000, 5000], [0, np.nan], [np.nan, 7000]])
+
+
+@pytest.mark.parametrize("text, scale", [
+    ("S$'000", 1_000),
+    ("S$’000", 1_000),
+    ("S$ ' 000", 1_000),
+    ("S$000", 1_000),
+    ("S$m", 1_000_000),
+    ("S$ mil", 1_000_000),
+    ("S$b", 1_000_000_000),
+    ("S$", 1),
+    ("Note", 1),
+    (None, 1),
+])
+def test_unit_scale(text, scale):
+    assert unit_scale(text) == scale
+
+
+@pytest.mark.parametrize("sheet", STATEMENT_SHEETS)
+def test_statement_amounts_match_the_sheet(workbook, sheet):
+    df = load_workbook(workbook)[sheet]
+    statement = Statement(df, name=sheet)
+    assert statement.scale == 1_000
+    # Figures stay in S$'000: the float values are the amounts, missing cells NaN
+    np.testing.assert_array_equal(statement.values, to_float(statement.amounts, statement.missing))
+    # and amounts x scale are the dollars parsed straight from the raw cells
+    raw = df.loc[statement.items["row"].to_numpy(), statement.value_columns]
+    dollars, missing = parse_amounts(raw, scale=statement.scale)
+    np.testing.assert_array_equal(statement.amounts * statement.scale, dollars)
+    np.testing.assert_array_equal(statement.missing, missing)
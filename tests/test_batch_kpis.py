@@ -0,0 +1,29 @@
+import glob
+import os
+
+from batch_kpis import compute
+
+
+def _snapshots(directory):
+    return glob.glob(os.path.join(directory, "*.snapshot"))
+
+
+def test_writes_nothing_next_to_inputs_by_default(data_dir):
+    paths = sorted(glob.glob(os.path.join(data_dir, "*.xlsx")))
+    frame, errors = compute(paths, workers=2)
+    assert errors == {}
+    assert set(frame["workbook"]) == set(paths)
+    assert _snapshots(data_dir) == []
+
+
+def test_cache_dir_keeps_snapshots_elsewhere(data_dir, tmp_path):
+    paths = sorted(glob.glob(os.path.join(data_dir, "*.xlsx")))
+    cache_dir = str(tmp_path / "cache")
+    first, errors = compute(paths, workers=2, cache_dir=cache_dir)
+    assert errors == {}
+    assert _snapshots(data_dir) == []
+    assert len(_snapshots(cache_dir)) == len(paths)
+    assert all(glob.glob(os.path.join(s, "statements", "*.json")) for s in _snapshots(cache_dir))
+    # A second run attaches the cached stores and computes the same table
+    second, _ = compute(paths, workers=2, cache_dir=cache_dir)
+    assert first.equals(second)
@@ -0,0 +1,47 @@
+import json
+
+import pytest
+from streamlit.testing.v1 import AppTest
+
+import charts
+
+_SCRIPT = """
+import streamlit as st
+from charts import comparison_chart
+left, right = st.columns(2)
+with right:
+    comparison_chart({"In the with block": (1, 2, 50.0)})
+comparison_chart({"Passed in": (3, 4, 25.0)}, container=left)
+comparison_chart({"Main": (5, 6, 20.0)})
+"""
+
+
+def _labels(element):
+    spec = json.loads(element.proto.figure.spec)
+    return spec["data"][0]["y"]
+
+
+@pytest.mark.parametrize("path", ["fast", "no spec field", "enqueue fails"])
+def test_charts_render_in_their_container(monkeypatch, path):
+    charts.clear_figure_cache()
+    if path == "no spec field":
+        monkeypatch.setattr(charts, "_spec_proto", lambda: None)
+    elif path == "enqueue fails":
+        # Only the messages show_figure builds are rejected; st.plotly_chart's own goes through
+        from streamlit.delta_generator import DeltaGenerator
+
+        built, spec_proto, enqueue = [], charts._spec_proto, DeltaGenerator._enqueue
+
+        def failing_enqueue(self, name, proto, *args, **kwargs):
+            if any(proto is b for b in built):
+                raise TypeError("_enqueue() takes a different message")
+            return enqueue(self, name, proto, *args, **kwargs)
+
+        monkeypatch.setattr(charts, "_spec_proto", lambda: built.append(spec_proto()) or built[-1])
+        monkeypatch.setattr(DeltaGenerator, "_enqueue", failing_enqueue)
+    app = AppTest.from_string(_SCRIPT).run()
+    assert not app.exception
+    left, right = app.columns
+    assert _labels(right.children[0]) == ["In the with block"]
+    assert _labels(left.children[0]) == ["Passed in"]
+    assert _labels(app.main.children[1]) == ["Main"]
@@ -0,0 +1,49 @@
+import pytest
+from streamlit.testing.v1 import AppTest
+
+import kpi_context
+import llm
+from conftest import ROOT
+from utils import workbook_sha256
+
+
+def test_context_loaded_once_per_rerun(monkeypatch):
+    calls = []
+    load = kpi_context.load_context
+    monkeypatch.setattr(kpi_context, "load_context", lambda *a, **k: calls.append(a) or load(*a, **k))
+    app = AppTest.from_file(f"{ROOT}/pages/chatbot.py", default_timeout=60)
+    app.secrets["openai_api_key"] = "test"
+    app.run()
+    assert not app.exception
+    assert len(calls) == 1
+    app.selectbox[0].select("Statement of Cash Flows").run()
+    assert len(calls) == 2
+
+
+def test_context_is_tied_to_the_workbook_hash(workbook):
+    assert kpi_context.build_contexts([workbook]) == [workbook]
+    assert kpi_context.load_context(workbook)["sha256"] == workbook_sha256(workbook)
+    assert kpi_context.build_contexts([workbook]) == []
+
+
+@pytest.mark.parametrize("setting, finish_on_close", [(None, False), ("1", False), ("0", True)])
+def test_cancel_on_report_change_setting(monkeypatch, setting, finish_on_close):
+    # CHAT_CANCEL_ON_CHANGE=0 lets an interrupted answer finish in the background
+    calls = []
+
+    def stream(*args, finish_on_close=False, **kwargs):
+        calls.append(finish_on_close)
+        yield "answer"
+
+    monkeypatch.setattr(llm, "stream", stream)
+    if setting is None:
+        monkeypatch.delenv("CHAT_CANCEL_ON_CHANGE", raising=False)
+    else:
+        monkeypatch.setenv("CHAT_CANCEL_ON_CHANGE", setting)
+    monkeypatch.delenv("CHAT_STREAMING", raising=False)
+    app = AppTest.from_file(f"{ROOT}/pages/chatbot.py", default_timeout=60)
+    app.secrets["openai_api_key"] = "test"
+    app.run()
+    app.text_input[0].input("What is the current ratio?").run()
+    assert not app.exception
+    assert calls == [finish_on_close]
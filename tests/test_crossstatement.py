@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from crossstatement import CrossStatement, cross_statement
+from equity import EQUITY, MOVEMENTS, equity_history
+from kpis import REGISTRY, history_kpis
+from timeseries import line_item, statement_history
+
+POSITION = "Statement of Financial Position"
+INCOME = "Statement of Com. Income"
+CASHFLOW = "Statement of Cash Flows"
+NET_CASH = (CASHFLOW, "Net (decrease)/increase in cash and cash equivalents")
+OPERATING_INCOME = (INCOME, "Total", "Operating income")  # (statement, label, section)
+KEYS = [
+    (POSITION, "Share capital", None),
+    (POSITION, "Total", "Current assets"),
+    (INCOME, "Operating surplus", None),
+    (CASHFLOW, "Net cash from operating activities", None),
+]
+
+
+@pytest.fixture
+def view(data_dir):
+    return cross_statement(data_dir)
+
+
+@pytest.mark.parametrize("statement, label, section", KEYS)
+def test_series_and_value_match_statement_history(view, data_dir, statement, label, section):
+    expected = line_item(statement_history(statement, data_dir), label, section).astype(float)
+    series = view.series(statement, label, section)
+    pd.testing.assert_series_equal(series.dropna(), expected.dropna(), check_names=False)
+    for year in expected.dropna().index:
+        assert view.value(statement, label, year, section) == expected[year]
+    assert view.value(statement, label, section=section) == series.iloc[-1]
+
+
+def test_equity_columns_match_equity_history(view, data_dir):
+    history = equity_history(data_dir)
+    assert view.years[-len(history.years):] == history.years
+    for component in history.components:
+        frame = history.frame(component)
+        for movement in MOVEMENTS:
+            np.testing.assert_array_equal(view.series(EQUITY, movement, section=component)[history.years],
+                                          frame[movement].to_numpy(dtype=float))
+
+
+def test_year_is_every_column_of_one_row(view):
+    year = view.years[-1]
+    row = view.year(year)
+    assert list(row) == list(view.columns)
+    assert row[(INCOME, "operating income", "total")] == view.value(INCOME, "Total", year, "Operating income")
+    assert row[(EQUITY, "total", "closing")] == view.value(EQUITY, "closing", year, "total")
+    assert view.year(year) is row
+
+
+def test_ratio_of_one_year_and_of_every_year(view):
+    ratios = view.ratio(NET_CASH, OPERATING_INCOME)
+    assert list(ratios.index) == view.years
+    for year in view.years:
+        expected = view.value(*NET_CASH, year) / view.value(*OPERATING_INCOME[:2], year, OPERATING_INCOME[2])
+        assert view.ratio(NET_CASH, OPERATING_INCOME, year) == pytest.approx(expected)
+        assert ratios[year] == pytest.approx(expected)
+
+
+def test_ratio_is_nan_on_a_zero_denominator():
+    frame = pd.DataFrame({("a", "x"): [1.0, 2.0], ("a", "zero"): [0.0, 0.0]}, index=["FY2022/23", "FY2023/24"])
+    view = CrossStatement({"s": frame})
+    assert np.isnan(view.ratio(("s", "x"), ("s", "zero"), "FY2023/24"))
+    assert view.ratio(("s", "x"), ("s", "zero")).isna().all()
+    assert view.ratio(("s", "zero"), ("s", "x"), "FY2023/24") == 0.0
+
+
+def test_net_cash_margin_is_net_cash_movement_over_operating_income(view, data_dir):
+    # The KPI registry's Net Cash Margin and the cross-statement ratio are the same figure
+    assert REGISTRY["net_cash_margin"].expression == "net_cash_movement / operating_income"
+    assert REGISTRY["net_cash_movement"].label == NET_CASH[1]
+    assert (REGISTRY["operating_income"].label, REGISTRY["operating_income"].section) == (None, OPERATING_INCOME[2])
+    margin = history_kpis(data_dir)["net_cash_margin"]
+    pd.testing.assert_series_equal(margin, view.ratio(NET_CASH, OPERATING_INCOME)[margin.index], check_names=False)
@@ -0,0 +1,13 @@
+from streamlit.testing.v1 import AppTest
+
+from conftest import ROOT
+
+
+def test_roll_forward_shows_every_term_it_reconciles():
+    app = AppTest.from_file(f"{ROOT}/pages/3_Statement_of_Changes_in_Equity.py", default_timeout=120).run()
+    assert not app.exception
+    roll = app.dataframe[-1].value
+    terms = ["Opening", "Comprehensive income", "Dividends", "Other movements"]
+    assert list(roll.columns) == ["Fiscal year", *terms, "Closing", "Reconciles"]
+    reconciles = (roll[terms].sum(axis=1) == roll["Closing"]).map({True: "✅", False: "❌"})
+    assert (reconciles == roll["Reconciles"]).all()
@@ -0,0 +1,35 @@
+import insights
+from crossstatement import CrossStatement, cross_statement
+from insights import MEMO_SECTIONS, build_insights, load_insights, movers
+
+
+def test_memo_sections_are_not_ranked(data_dir):
+    table = movers(cross_statement(data_dir))
+    assert not any((s, sec) in MEMO_SECTIONS for s, sec in zip(table["statement"], table["section"]))
+
+
+def test_materiality_is_measured_against_the_statement_total(data_dir):
+    table = movers(cross_statement(data_dir)).set_index(["statement", "section", "line_item"])
+    position = table.loc["Statement of Financial Position"]
+    total_assets = max(abs(position.loc[("non-current assets", "total"), side]) +
+                       abs(position.loc[("current assets", "total"), side]) for side in ("previous", "latest"))
+    size = position[["previous", "latest"]].abs().max(axis=1)
+    assert (position["material"] == (size >= insights.MATERIALITY * total_assets)).all()
+
+
+def test_single_year_has_no_insights(data_dir, monkeypatch):
+    view = cross_statement(data_dir)
+    frame = view.frame().iloc[-1:]
+    single = CrossStatement({s: frame[s] for s in dict.fromkeys(view.columns.get_level_values("statement"))})
+    monkeypatch.setattr("crossstatement.cross_statement", lambda data_dir: single)
+    result = build_insights(data_dir, version="test")
+    assert result["statements"] == {}
+    assert result["fiscal_year"] == view.years[-1]
+    assert result["previous_year"] is None
+
+
+def test_load_insights_writes_and_reuses_the_artifact(data_dir):
+    first = load_insights(data_dir)
+    assert first["previous_year"] is not None
+    assert insights._read_insights(data_dir, insights.data_version(data_dir)) == first
+    assert load_insights(data_dir) is first
@@ -0,0 +1,108 @@
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import pytest
+
+import kpis
+from kpis import REGISTRY, KPIGraph, evaluate, history_inputs, history_kpis, upstream, workbook_inputs, workbook_kpis
+
+
+def test_upstream_is_the_dependency_closure():
+    assert upstream(["current_ratio"]) == ["current_assets", "current_liabilities", "current_ratio"]
+    assert upstream(["asset_growth"]) == ["non_current_assets", "current_assets", "total_assets", "asset_growth"]
+
+
+def test_evaluate_names_matches_full_evaluation(data_dir):
+    inputs = history_inputs(data_dir)
+    full = evaluate(inputs)
+    subset = evaluate(inputs, names=["asset_growth", "net_cash_margin"])
+    pd.testing.assert_frame_equal(subset, full[["asset_growth", "net_cash_margin"]])
+
+
+def test_concurrent_evaluations_keep_their_own_index(data_dir):
+    # One frame indexed by fiscal year only, one by (entity, fiscal year): prev/growth must
+    # shift within each evaluation's own index whatever runs alongside it
+    single = history_inputs(data_dir)
+    paired = pd.concat({"a": workbook_inputs(f"{data_dir}/iras-fs-fy2324.xlsx"),
+                        "b": workbook_inputs(f"{data_dir}/iras-fs-fy2223.xlsx")}, names=["entity"])
+    expected = [evaluate(single), evaluate(paired)]
+    with ThreadPoolExecutor(8) as pool:
+        results = list(pool.map(lambda i: (i % 2, evaluate([single, paired][i % 2])), range(64)))
+    for which, frame in results:
+        pd.testing.assert_frame_equal(frame, expected[which])
+
+
+# --- Incremental recomputation ---
+@pytest.fixture
+def graph(monkeypatch):
+    # A fresh graph and history cache, with every read of a workbook's inputs recorded
+    reads = []
+    graph = KPIGraph()
+    monkeypatch.setattr(kpis, "_graph", graph)
+    monkeypatch.setattr(kpis, "_history_cache", kpis.LRUCache(kpis.MAX_CACHED_HISTORIES))
+    monkeypatch.setattr(kpis, "workbook_inputs", lambda path: reads.append(os.path.basename(path)) or
+                        workbook_inputs(path))
+    graph.reads = reads
+    return graph
+
+
+def test_changed_line_item_recomputes_only_downstream(workbook):
+    graph = KPIGraph()
+    inputs = workbook_inputs(workbook)
+    assert graph.update("wb", inputs) == list(REGISTRY)
+    before = graph.frame("wb")
+
+    changed = inputs.copy()
+    changed["current_assets"] *= 2
+    stale = graph.update("wb", changed)
+    assert stale == ["current_assets", "total_assets", "equity_ratio", "working_capital", "current_ratio",
+                     "asset_growth"]
+    after = graph.frame("wb")
+    pd.testing.assert_frame_equal(after, evaluate(changed))
+    untouched = [name for name in REGISTRY if name not in stale]
+    pd.testing.assert_frame_equal(after[untouched], before[untouched])
+
+
+def test_unchanged_inputs_recompute_nothing(workbook):
+    graph = KPIGraph()
+    inputs = workbook_inputs(workbook)
+    graph.update("wb", inputs)
+    frame = graph.frame("wb")
+    assert graph.update("wb", inputs.copy()) == []
+    assert graph.frame("wb") is frame
+
+
+def test_unchanged_workbook_is_not_reread(graph, workbook):
+    workbook_kpis(workbook)
+    workbook_kpis(workbook)
+    assert graph.reads == ["iras-fs-fy2324.xlsx"]
+    # A new mtime re-reads it, and identical figures recompute nothing
+    os.utime(workbook, (0, os.path.getmtime(workbook) + 10))
+    workbook_kpis(workbook)
+    assert graph.reads == ["iras-fs-fy2324.xlsx"] * 2
+    assert graph.last_recomputed[os.path.abspath(workbook)] == []
+
+
+def test_new_workbook_evaluates_only_its_partition(graph, data_dir):
+    newest = os.path.join(data_dir, "iras-fs-fy2324.xlsx")
+    held_back = newest + ".held"
+    shutil.move(newest, held_back)
+    older = history_kpis(data_dir)
+    assert sorted(graph.reads) == ["iras-fs-fy2122.xlsx", "iras-fs-fy2223.xlsx"]
+
+    shutil.move(held_back, newest)
+    graph.reads.clear()
+    history = history_kpis(data_dir)
+    assert graph.reads == ["iras-fs-fy2324.xlsx"]
+    assert list(history.index) == [*older.index, "FY2023/24"]
+    pd.testing.assert_frame_equal(history, evaluate(history_inputs(data_dir)), check_like=True, atol=1e-9)
+
+
+def test_returned_frames_are_copies(graph, data_dir):
+    workbook = os.path.join(data_dir, "iras-fs-fy2324.xlsx")
+    for frame in (workbook_kpis(workbook), history_kpis(data_dir)):
+        frame["current_ratio"] = -1
+    assert (workbook_kpis(workbook)["current_ratio"] != -1).all()
+    assert (history_kpis(data_dir)["current_ratio"] != -1).all()
@@ -0,0 +1,97 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from llm import ResponseCache, ask, cache_key
+
+REPORT = "Statement of Financial Position"
+PROMPT = "KPI Summary:\nShare Capital: FY2023/24 = 7,823"
+
+
+def test_hit_and_miss():
+    cache = ResponseCache()
+    key = cache_key(REPORT, PROMPT, "What is share capital?")
+    assert cache.get(key) is None
+    cache.put(key, "answer")
+    assert cache.get(key) == "answer"
+    # Same question up to case, spacing and trailing punctuation
+    assert cache.get(cache_key(REPORT, PROMPT, "what is  share capital")) == "answer"
+
+
+def test_entries_expire():
+    now = [1000.0]
+    cache = ResponseCache(ttl=60, clock=lambda: now[0])
+    cache.put("k", "answer")
+    now[0] += 61
+    assert cache.get("k") is None
+
+
+def test_key_changes_with_the_context():
+    # A new workbook changes the KPI summary in the system prompt, and so every key
+    question = "What is share capital?"
+    assert cache_key(REPORT, PROMPT, question) != cache_key(REPORT, PROMPT.replace("7,823", "7,900"), question)
+    assert cache_key(REPORT, PROMPT, question) != cache_key("Statement of Cash Flows", PROMPT, question)
+
+
+def test_concurrent_requests_are_coalesced():
+    cache = ResponseCache()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        time.sleep(0.2)
+        return "answer"
+
+    with ThreadPoolExecutor(8) as pool:
+        answers = list(pool.map(lambda _: cache.get_or_fetch("k", fetch), range(8)))
+    assert answers == ["answer"] * 8
+    assert len(calls) == 1
+
+
+def test_failures_are_shared_and_not_cached():
+    cache = ResponseCache()
+    with pytest.raises(RuntimeError):
+        cache.get_or_fetch("k", lambda: (_ for _ in ()).throw(RuntimeError("down")))
+    assert cache.get("k") is None
+    assert cache.get_or_fetch("k", lambda: "answer") == "answer"
+
+
+def test_directory_persists_answers(tmp_path):
+    ResponseCache(directory=str(tmp_path)).put("k", "answer")
+    assert ResponseCache(directory=str(tmp_path)).get("k") == "answer"
+
+
+def test_concurrent_writers_of_one_answer(tmp_path):
+    # Workers persisting the same answer at once each write their own temp file
+    caches = [ResponseCache(directory=str(tmp_path)) for _ in range(8)]
+    with ThreadPoolExecutor(8) as pool:
+        list(pool.map(lambda i: caches[i % 8].put("k", f"answer {i % 8}"), range(64)))
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["k.json"]
+    assert ResponseCache(directory=str(tmp_path)).get("k") in {f"answer {i}" for i in range(8)}
+
+
+def test_writes_do_not_share_a_fixed_temp_file(tmp_path):
+    # A leftover (here: unwritable) "<key>.json.tmp" from another writer does not block the write
+    (tmp_path / "k.json.tmp").mkdir()
+    ResponseCache(directory=str(tmp_path)).put("k", "answer")
+    assert ResponseCache(directory=str(tmp_path)).get("k") == "answer"
+
+
+@pytest.mark.parametrize("content", ['{"stored_at": 1', '[]', '{"answer": "x"}', '{"stored_at": "x", "answer": "y"}',
+                                     '{"stored_at": 1e12, "answer": null}', ""])
+def test_malformed_entries_are_misses(tmp_path, content):
+    (tmp_path / "k.json").write_text(content, encoding="utf-8")
+    assert ResponseCache(directory=str(tmp_path), ttl=None).get("k") is None
+
+
+def test_ask_against_the_local_stub(openai_stub):
+    openai_stub.delay = 0.2
+    with ThreadPoolExecutor(4) as pool:
+        answers = list(pool.map(lambda _: ask(REPORT, PROMPT, "What is share capital?"), range(4)))
+    assert answers == ["Stub answer to: What is share capital?"] * 4
+    assert ask(REPORT, PROMPT, "what is share capital") == answers[0]
+    assert openai_stub.calls == 1
+
+    ask(REPORT, PROMPT + "\nTotal Equity: FY2023/24 = 1,112,856", "What is share capital?")
+    assert openai_stub.calls == 2
@@ -0,0 +1,52 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from llm import ask, stream
+
+REPORT = "Statement of Cash Flows"
+PROMPT = "KPI Summary:\nEnding Cash: FY2023/24 = 169,752"
+QUESTION = "Why did ending cash fall?"
+ANSWER = f"Stub answer to: {QUESTION}"
+
+
+def test_chunks_assemble_into_the_answer(openai_stub):
+    tokens = list(stream(REPORT, PROMPT, QUESTION))
+    assert len(tokens) == len(ANSWER.split(" "))
+    assert "".join(tokens) == ANSWER
+    assert openai_stub.calls == 1
+
+
+def test_streamed_answer_is_cached_whole(openai_stub):
+    "".join(stream(REPORT, PROMPT, QUESTION))
+    assert list(stream(REPORT, PROMPT, QUESTION)) == [ANSWER]
+    assert ask(REPORT, PROMPT, QUESTION) == ANSWER
+    assert openai_stub.calls == 1
+
+
+def test_closing_early_caches_nothing(openai_stub):
+    openai_stub.token_delay = 0.05
+    tokens = stream(REPORT, PROMPT, QUESTION)
+    assert next(tokens) == "Stub"
+    tokens.close()
+    openai_stub.token_delay = 0.0
+    assert "".join(stream(REPORT, PROMPT, QUESTION)) == ANSWER
+    assert openai_stub.calls == 2
+
+
+def test_finish_on_close_completes_in_the_background(openai_stub):
+    tokens = stream(REPORT, PROMPT, QUESTION, finish_on_close=True)
+    next(tokens)
+    tokens.close()
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline and list(stream(REPORT, PROMPT, QUESTION)) != [ANSWER]:
+        time.sleep(0.05)
+    assert list(stream(REPORT, PROMPT, QUESTION)) == [ANSWER]
+    assert openai_stub.calls == 1
+
+
+def test_concurrent_streams_share_one_call(openai_stub):
+    openai_stub.delay = 0.2
+    with ThreadPoolExecutor(4) as pool:
+        answers = list(pool.map(lambda _: "".join(stream(REPORT, PROMPT, QUESTION)), range(4)))
+    assert answers == [ANSWER] * 4
+    assert openai_stub.calls == 1
@@ -0,0 +1,40 @@
+import pytest
+
+import profiling
+from profiling import profiled_rerun, stage
+
+
+@pytest.fixture
+def enabled(monkeypatch):
+    panels = []
+    monkeypatch.setattr(profiling, "ENABLED", True)
+    monkeypatch.setattr(profiling, "show_panel", panels.append)
+    return panels
+
+
+def _totals(page):
+    return [r for r in profiling.records if r["page"] == page and r["stage"] == "total"]
+
+
+def test_rerun_is_recorded_and_shown(enabled):
+    with profiled_rerun("ok page"):
+        with stage("work"):
+            pass
+    rerun = _totals("ok page")[-1]["rerun"]
+    assert [r["stage"] for r in profiling.rerun_records(rerun)] == ["work", "total"]
+    assert enabled == [rerun]
+
+
+def test_rerun_closed_when_the_page_raises(enabled):
+    # st.stop() and st.rerun() end a script with an exception, like any error
+    with pytest.raises(RuntimeError):
+        with profiled_rerun("failing page"):
+            raise RuntimeError("stop")
+    assert len(_totals("failing page")) == 1
+    assert profiling._local.rerun is None
+    assert enabled == []
+
+
+def test_disabled_is_a_noop(monkeypatch):
+    monkeypatch.setattr(profiling, "ENABLED", False)
+    assert profiled_rerun("page") is profiling._NOOP
@@ -0,0 +1,23 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from utils import read_snapshot, snapshot_dir, write_snapshot
+
+
+def test_snapshot_round_trip(workbook):
+    sheets = pd.read_excel(workbook, sheet_name=None)
+    assert write_snapshot(workbook, sheets)
+    restored = read_snapshot(workbook)
+    assert list(restored) == list(sheets)
+    for name, frame in sheets.items():
+        pd.testing.assert_frame_equal(restored[name], frame)
+
+
+def test_concurrent_writers_leave_a_complete_snapshot(workbook):
+    sheets = pd.read_excel(workbook, sheet_name=None)
+    with ThreadPoolExecutor(4) as pool:
+        assert all(pool.map(lambda _: write_snapshot(workbook, sheets), range(8)))
+    assert not [f for f in os.listdir(snapshot_dir(workbook)) if f.endswith(".tmp")]
+    assert read_snapshot(workbook) is not None
@@ -0,0 +1,53 @@
+import sqlite3
+
+import pytest
+
+import database
+import sql_query
+from sql_query import run_query, schema
+
+
+@pytest.fixture
+def db_path(tmp_path, monkeypatch):
+    path = str(tmp_path / "line_items.sqlite")
+    monkeypatch.setattr(database, "DB_PATH", path)
+    sql_query.clear_query_cache()
+    yield path
+    sql_query.clear_query_cache()
+    database.close(path)
+
+
+def test_ingest_runs_once_per_data_version(db_path, monkeypatch):
+    calls = []
+    ingest = database.ingest
+    monkeypatch.setattr(database, "ingest", lambda *a, **k: calls.append(1) or ingest(*a, **k))
+    first = run_query("SELECT COUNT(*) AS n FROM line_items")
+    assert first.frame["n"][0] > 0
+    assert run_query("SELECT COUNT(*) AS n FROM line_items").cached
+    run_query("SELECT COUNT(*) AS n FROM kpis")
+    schema()
+    assert len(calls) == 1
+    assert sql_query.data_version() == sql_query.data_version()
+
+
+def test_read_only_deployment_degrades(db_path, monkeypatch):
+    def refuse(*args, **kwargs):
+        raise sqlite3.OperationalError("attempt to write a readonly database")
+
+    monkeypatch.setattr(database, "ingest", refuse)
+    monkeypatch.setattr(database, "connect", refuse)
+    assert run_query("SELECT COUNT(*) AS n FROM line_items").frame["n"][0] == 0
+    assert run_query("SELECT COUNT(*) AS n FROM kpis").frame["n"][0] > 0
+
+
+def test_connect_without_wal(db_path, monkeypatch):
+    class ReadOnlyJournal(sqlite3.Connection):
+        def execute(self, sql, *args):
+            if sql.startswith("PRAGMA journal_mode"):
+                raise sqlite3.OperationalError("attempt to write a readonly database")
+            return super().execute(sql, *args)
+
+    connect = sqlite3.connect
+    monkeypatch.setattr(database.sqlite3, "connect", lambda path: connect(path, factory=ReadOnlyJournal))
+    conn = database.connect()
+    assert conn.execute("PRAGMA user_version").fetchone()[0] == database.SCHEMA_VERSION
@@ -0,0 +1,42 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from conftest import ROOT
+
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+import startup  # noqa: E402
+
+# Slow CI machines can widen the budgets without editing them: STARTUP_BUDGET_SCALE=2
+SCALE = float(os.environ.get("STARTUP_BUDGET_SCALE", "1"))
+
+
+@pytest.fixture(scope="module")
+def ingested(site):
+    # The budgets assume the snapshots, stores and artifacts are built, as on a deploy; they
+    # are built in the scratch copy of data/, never in the checkout
+    env = dict(os.environ, DASHBOARD_DB=os.path.join(site, "data", "line_items.sqlite"))
+    subprocess.run([sys.executable, os.path.join(ROOT, "ingest.py")], cwd=site, env=env, capture_output=True,
+                   check=True)
+    return site
+
+
+@pytest.mark.parametrize("page", list(startup.BUDGETS_MS))
+def test_cold_render_within_budget(page, ingested):
+    result = startup.probe(page, cwd=ingested)
+    assert result["errors"] == []
+    heavy = [m for m in startup.FORBIDDEN_MODULES[page] if m in result["loaded"]]
+    assert heavy == [], f"{page} imported {', '.join(heavy)} on first render"
+    assert result["ms"] <= startup.BUDGETS_MS[page] * SCALE
+
+
+def test_home_imports_stay_light(ingested):
+    # Home only hashes the workbooks and reads data/insights.json: no pandas, no workbook parsing, no chart library
+    code = ("import sys, insights; insights.load_insights(); "
+            "print(','.join(sorted({m.split('.')[0] for m in sys.modules})))")
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    loaded = subprocess.run([sys.executable, "-c", code], cwd=ingested, env=env, capture_output=True, text=True,
+                            check=True).stdout.strip().split(",")
+    assert not {"pandas", "numpy", "openpyxl", "plotly", "openai"} & set(loaded)
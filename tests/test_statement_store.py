@@ -0,0 +1,41 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from statements import STORE_DIR, Statement, attach_statement, publish_statement
+from utils import STATEMENT_SHEETS, load_workbook, snapshot_dir
+
+
+@pytest.mark.parametrize("sheet", STATEMENT_SHEETS)
+def test_attached_statement_equals_parse(workbook, sheet):
+    parsed = Statement(load_workbook(workbook)[sheet], name=sheet)
+    assert publish_statement(workbook, parsed)
+    attached = attach_statement(workbook, sheet)
+    pd.testing.assert_frame_equal(attached.items, parsed.items)
+    np.testing.assert_array_equal(attached.amounts, parsed.amounts)
+    np.testing.assert_array_equal(attached.missing, parsed.missing)
+    np.testing.assert_array_equal(attached.values, parsed.values)
+    assert attached.sections == parsed.sections
+
+
+def test_attached_statement_is_zero_copy(workbook):
+    sheet = STATEMENT_SHEETS[0]
+    publish_statement(workbook, Statement(load_workbook(workbook)[sheet], name=sheet))
+    attached = attach_statement(workbook, sheet)
+    assert isinstance(attached.values, np.memmap)
+    assert not attached.values.flags.owndata
+    for period in attached.periods:
+        assert np.shares_memory(attached.items[period].to_numpy(), attached.values)
+
+
+def test_concurrent_publishers_leave_no_temp_files(workbook):
+    sheet = STATEMENT_SHEETS[1]
+    statement = Statement(load_workbook(workbook)[sheet], name=sheet)
+    with ThreadPoolExecutor(4) as pool:
+        assert all(pool.map(lambda _: publish_statement(workbook, statement), range(8)))
+    store = os.path.join(snapshot_dir(workbook), STORE_DIR)
+    assert not [f for f in os.listdir(store) if f.endswith(".tmp")]
+    assert attach_statement(workbook, sheet) is not None
@@ -0,0 +1,145 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from statements import LOOKUP_MIN_SIMILARITY, Statement, _similarity, load_statement, normalize_label
+
+POSITION = "Statement of Financial Position"
+INCOME = "Statement of Com. Income"
+CASHFLOW = "Statement of Cash Flows"
+WORKBOOKS = {
+    "iras-fs-fy2122.xlsx": ["FY2021/22", "FY2020/21"],
+    "iras-fs-fy2223.xlsx": ["FY2022/23", "FY2021/22"],
+    "iras-fs-fy2324.xlsx": ["FY2023/24", "FY2022/23"],
+}
+
+
+@pytest.fixture(params=list(WORKBOOKS))
+def layout(request, data_dir):
+    # (workbook path, its periods), once per fiscal year's layout
+    return os.path.join(data_dir, request.param), WORKBOOKS[request.param]
+
+
+def test_header(layout):
+    path, periods = layout
+    for sheet in (POSITION, INCOME, CASHFLOW):
+        statement = load_statement(sheet, path)
+        assert statement.periods == periods
+        assert statement.scale == 1_000
+
+
+def test_sections_resolve_in_every_layout(layout):
+    statement = load_statement(POSITION, layout[0])
+    assert list(statement.sections) == ["non-current assets", "current assets", "current liabilities",
+                                        "non-current liabilities", "net assets of"]
+    # A repeated label resolves per section, and to its first occurrence without one
+    current = statement.position("Lease liabilities", section="Current liabilities")
+    non_current = statement.position("Lease liabilities", section="Non-current liabilities")
+    assert statement.positions("lease liabilities") == [current, non_current]
+    assert statement.position("LEASE  liabilities") == current
+    assert statement.items.at[non_current, "section"] == "non-current liabilities"
+    assert statement.position("No such line") is None
+    assert statement.get("No such line") is None
+
+
+def test_wrapped_labels_join(layout):
+    position = load_statement(POSITION, layout[0])
+    income = load_statement(INCOME, layout[0])
+    # Label on two rows, values on the second
+    assert position.get("Contribution payable to Government Consolidated Fund") is not None
+    assert "contribution payable to government" not in position._index
+    # Values on the first row, the label running on below it
+    label = "net surplus for the financial year, representing total comprehensive income for the financial year"
+    assert label in income._index
+    assert "comprehensive income for the financial year" not in income._index
+
+
+def test_section_totals(layout):
+    statement = load_statement(POSITION, layout[0])
+    for section in ("current assets", "non-current assets", "current liabilities"):
+        items = statement.section_items(section)
+        lines = statement.amounts[items.index[items["kind"] == "item"]]
+        np.testing.assert_array_equal(statement.section_total(section), lines.sum(axis=0))
+
+    # Cash-flow sections end with their own labelled total
+    cashflow = load_statement(CASHFLOW, layout[0])
+    totals = cashflow.items.loc[cashflow.items["kind"] == "total", "label"].tolist()
+    assert totals == ["net cash from operating activities", "net cash used in investing activities",
+                      "net cash used in financing activities"]
+    np.testing.assert_array_equal(cashflow.section_total("Cash flows from operating activities"),
+                                  cashflow.get("Net cash from operating activities"))
+
+
+def test_total(layout):
+    statement = load_statement(POSITION, layout[0])
+    np.testing.assert_array_equal(statement.total("Share capital", "Accumulated surplus"),
+                                  statement.get("Share capital") + statement.get("Accumulated surplus"))
+    with pytest.raises(KeyError, match="No such line"):
+        statement.total("Share capital", "No such line")
+
+
+def test_normalize_label():
+    assert normalize_label("  Net  Current\nAssets ") == "net current assets"
+
+
+@pytest.fixture
+def income():
+    # A one-section sheet shaped like the workbooks: periods, unit row, section header, items
+    rows = [
+        [None, "FY2023/24", "FY2022/23"],
+        [None, "S$'000", "S$'000"],
+        ["Operating income", None, None],
+        ["Other income", 10, 9],
+        ["Grants and other income", 20, 19],
+        ["Othr income", 30, 29],
+        ["Manpower", 40, 39],
+    ]
+    return Statement(pd.DataFrame(rows, dtype=object), name="test")
+
+
+def labels(statement, positions):
+    return [statement.items.at[pos, "label"] for pos in positions]
+
+
+def test_search_ranks_exact_then_substring_then_trigram(income):
+    assert labels(income, income.search("Other income")) == ["other income", "grants and other income", "othr income"]
+    assert labels(income, income.search("Other income", fuzzy=False)) == ["other income", "grants and other income"]
+    # no exact label: substring matches in sheet order, then the closest reworded label
+    assert labels(income, income.search("other incom")) == ["other income", "grants and other income", "othr income"]
+    assert labels(income, income.search("othr incme")) == ["othr income"]
+
+
+def test_search_no_match(income):
+    assert income.search("Depreciation") == []
+    assert income.search("Depreciation", fuzzy=False) == []
+    assert income.search("Other income", section="Operating expenditure") == []
+    assert income.lookup("Depreciation", fuzzy=True) is None
+
+
+def test_lookup_similarity_threshold(income):
+    assert LOOKUP_MIN_SIMILARITY == 0.8
+    assert income.lookup("Manpower")[0] == 40
+    # substring and reworded matches above the threshold still bind...
+    assert _similarity("other incom", "other income") >= LOOKUP_MIN_SIMILARITY
+    assert income.lookup("Other incom")[0] == 10
+    assert _similarity("othr incomes", "othr income") >= LOOKUP_MIN_SIMILARITY
+    assert income.lookup("Othr incomes") is None
+    assert income.lookup("Othr incomes", fuzzy=True)[0] == 30
+    # ...but one below it no longer reads a different line
+    assert _similarity("income", "other income") < LOOKUP_MIN_SIMILARITY
+    assert income.search("Income", fuzzy=False)
+    assert income.lookup("Income") is None
+    assert _similarity("othr incme", "othr income") < LOOKUP_MIN_SIMILARITY
+    assert income.lookup("Othr incme", fuzzy=True) is None
+
+
+def test_lookup_threshold_on_real_sheet(data_dir):
+    cashflow = load_statement(CASHFLOW, os.path.join(data_dir, "iras-fs-fy2324.xlsx"))
+    closing = cashflow.get("Cash and cash equivalents as at end of the financial year")
+    np.testing.assert_array_equal(
+        cashflow.lookup("Cash and cash equivalents as at end of financial year", fuzzy=True), closing)
+    # every line containing the bare phrase is a different figure; none is close enough to bind
+    assert len(cashflow.search("Cash and cash equivalents", fuzzy=False)) == 3
+    assert cashflow.lookup("Cash and cash equivalents", fuzzy=True) is None
@@ -0,0 +1,39 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import statements
+from statements import Statement, build_stores, load_statement, read_statement_rows
+from utils import STATEMENT_SHEETS, load_workbook
+
+
+@pytest.mark.parametrize("sheet", STATEMENT_SHEETS)
+def test_streamed_statement_equals_parse(workbook, sheet):
+    parsed = Statement(load_workbook(workbook)[sheet], name=sheet)
+    streamed = Statement.from_rows(read_statement_rows(workbook, sheet))
+    assert streamed.periods == parsed.periods
+    assert streamed.scale == parsed.scale
+    pd.testing.assert_frame_equal(streamed.items, parsed.items)
+    np.testing.assert_array_equal(streamed.amounts, parsed.amounts)
+    np.testing.assert_array_equal(streamed.missing, parsed.missing)
+    assert streamed.sections == parsed.sections
+
+
+def test_stream_flag_bypasses_store(workbook, monkeypatch):
+    # A published store must not stop STREAM_WORKBOOKS=1 from streaming the sheet
+    build_stores([workbook])
+    streamed = []
+
+    def read(path, sheet_name):
+        streamed.append(sheet_name)
+        return read_statement_rows(path, sheet_name)
+
+    monkeypatch.setattr(statements, "STREAM_WORKBOOKS", True)
+    monkeypatch.setattr(statements, "read_statement_rows", read)
+    statements._statement_cache.clear()
+    try:
+        statement = load_statement(STATEMENT_SHEETS[0], workbook)
+    finally:
+        statements._statement_cache.clear()
+    assert streamed == [STATEMENT_SHEETS[0]]
+    assert not isinstance(statement.values, np.memmap)
@@ -0,0 +1,41 @@
+import numpy as np
+import pandas as pd
+
+from tables import clear_table_cache, column_config, kpi_frame, prepare
+
+
+def _frame():
+    return kpi_frame({
+        "Total Equity": (1112856, 1035991, 7.42),
+        "Dividends Paid": (-80000, -2057, -3789.16),
+        "Share Capital": (7823, 7823, 0.0),
+        "New line": (100, None, None),
+    })
+
+
+def test_amounts_stay_numeric():
+    clear_table_cache()
+    numbers, display = prepare(_frame(), amounts=["FY2023/24", "FY2022/23"])
+    for frame in (numbers, display):
+        for column in ("FY2023/24", "FY2022/23", "% Change"):
+            assert frame[column].dtype == np.float64
+    # Sorting the display column sorts by value, not by its digits
+    order = display.sort_values("FY2023/24")["Metric"].tolist()
+    assert order == ["Dividends Paid", "New line", "Share Capital", "Total Equity"]
+
+
+def test_trend_markers():
+    clear_table_cache()
+    _, display = prepare(_frame(), amounts=["FY2023/24", "FY2022/23"])
+    assert list(display.columns) == ["Metric", "FY2023/24", "FY2022/23", "Trend", "% Change"]
+    assert display["Trend"].tolist() == ["🟢", "🔴", "➖", ""]
+    assert pd.isna(display["% Change"].iloc[3])
+
+
+def test_column_config_formats_numbers():
+    _, display = prepare(_frame(), amounts=["FY2023/24", "FY2022/23"])
+    config = column_config(display, ["FY2023/24", "FY2022/23"])
+    assert config["FY2023/24"]["type_config"]["type"] == "number"
+    assert config["FY2023/24"]["type_config"]["format"] == "%.0f"
+    assert config["% Change"]["type_config"]["format"] == "%+.2f%%"
+    assert config["Trend"]["type_config"]["type"] == "text"
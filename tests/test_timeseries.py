@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from timeseries import cagr, line_item, rolling_ratio, safe_divide, statement_history, yoy_change
+
+YEARS = pd.Index(["FY2020/21", "FY2021/22", "FY2022/23", "FY2023/24"], name="fiscal_year")
+
+
+def _history(**columns):
+    return pd.DataFrame(columns, index=YEARS, dtype=float)
+
+
+def test_safe_divide_zero_is_nan():
+    np.testing.assert_array_equal(safe_divide(np.array([1.0, 0.0, 4.0]), np.array([0.0, 0.0, 2.0])),
+                                  [np.nan, np.nan, 2.0])
+
+
+def test_yoy_change_gaps_and_zero_base():
+    change = yoy_change(_history(a=[100, 110, np.nan, 121], b=[0, 5, 10, 5]))
+    np.testing.assert_allclose(change["a"], [np.nan, 10.0, np.nan, np.nan])
+    np.testing.assert_allclose(change["b"], [np.nan, np.nan, 100.0, -50.0])
+
+
+@pytest.mark.parametrize("values, expected", [
+    ([100, 110, 121, 133.1], 10.0),
+    ([np.nan, 100, np.nan, 121], 10.0),      # first and last reported years, gaps skipped
+    ([100, 50, 25, 100], 0.0),
+    ([-10, -20, -30, -40], np.nan),          # a deepening deficit is not +100% growth
+    ([-10, 5, 8, 40], np.nan),
+    ([10, 5, 8, -40], np.nan),
+    ([0, 5, 8, 40], np.nan),                 # zero base
+    ([np.nan, np.nan, np.nan, 40], np.nan),  # a single year
+    ([np.nan] * 4, np.nan),
+])
+def test_cagr(values, expected):
+    result = cagr(_history(a=values))["a"]
+    if np.isnan(expected):
+        assert np.isnan(result)
+    else:
+        assert result == pytest.approx(expected)
+
+
+def test_rolling_ratio_pairs_the_same_years():
+    numerator = pd.Series([100, np.nan], index=YEARS[:2])
+    denominator = pd.Series([0, 5], index=YEARS[:2])
+    assert rolling_ratio(numerator, denominator).isna().all()
+
+    numerator = pd.Series([10, 20, np.nan, 40], index=YEARS)
+    denominator = pd.Series([100, 100, 100, 100], index=YEARS)
+    np.testing.assert_allclose(rolling_ratio(numerator, denominator, window=2), [0.1, 0.15, 0.2, 0.4])
+
+
+def test_line_item_from_history(data_dir):
+    history = statement_history("Statement of Financial Position", data_dir)
+    cash = line_item(history, "Cash and cash equivalents")
+    assert cash.name == "cash and cash equivalents"
+    assert cash.equals(line_item(history, "cash and cash equivalents", section="Current assets"))
+    assert list(cash.index) == list(history.index)
@@ -0,0 +1,134 @@
+import glob
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+from statements import load_statement, normalize_label
+from utils import LRUCache, workbook_key
+
+
+# --- Multi-year history ---
+# Each IRAS workbook only covers its own year and the comparative one. This lines up every
+# iras-fs-fy*.xlsx in data/ into one year-indexed frame per statement (rows = fiscal years,
+# columns = (section, line item)) so growth and ratios are computed as column operations over
+# all years at once, however many workbooks are dropped in.
+
+DATA_DIR = "data"
+WORKBOOK_GLOB = "iras-fs-fy*.xlsx"
+FISCAL_YEAR_PATTERN = re.compile(r"FY\s*(\d{4})\s*/\s*(\d{2})", re.IGNORECASE)
+_WORKBOOK_YEAR_PATTERN = re.compile(r"fy(\d{2})(\d{2})", re.IGNORECASE)
+
+# Label used for a section's unlabelled subtotal row, e.g. ("current assets", "total")
+SUBTOTAL_LABEL = "total"
+
+
+def fiscal_year_start(period):
+    match = FISCAL_YEAR_PATTERN.search(str(period))
+    return int(match.group(1)) if match else None
+
+
+def _workbook_year(path):
+    match = _WORKBOOK_YEAR_PATTERN.search(os.path.basename(path))
+    return 2000 + int(match.group(1)) if match else 0
+
+
+def discover_workbooks(data_dir=DATA_DIR):
+    # Oldest fiscal year first
+    return sorted(glob.glob(os.path.join(data_dir, WORKBOOK_GLOB)), key=lambda p: (_workbook_year(p), p))
+
+
+def _statement_frame(statement):
+    if not all(fiscal_year_start(p) for p in statement.periods):
+        raise ValueError(f"{statement.name!r} is not laid out by fiscal year: {statement.periods}")
+
+    items = statement.items
+    # Unlabelled totals outside any section (e.g. the grand total under equity) have no
+    # stable name across years, so they are left out
+    keep = ((items["label"] != "") | items["section"].notna()).to_numpy()
+    sections = items["section"].fillna("")[keep]
+    labels = items["label"].where(items["label"] != "", SUBTOTAL_LABEL)[keep]
+    columns = pd.MultiIndex.from_arrays([sections, labels], names=["section", "line_item"])
+
+    # Within a published statement a blank or "-" cell is a reported nil
+    frame = pd.DataFrame(statement.amounts[keep].T, index=statement.periods, columns=columns)
+    return frame.loc[:, ~frame.columns.duplicated()]
+
+
+def _build_history(sheet_name, paths):
+    frames = [_statement_frame(load_statement(sheet_name, path)) for path in paths]
+    if not frames:
+        raise FileNotFoundError(f"No {WORKBOOK_GLOB} workbooks found")
+
+    # Later workbooks come last, so a restated comparative replaces the figure first published
+    history = pd.concat(frames)
+    history = history[~history.index.duplicated(keep="last")]
+    history = history.iloc[np.argsort([fiscal_year_start(p) for p in history.index], kind="stable")]
+    history.index.name = "fiscal_year"
+    return history
+
+
+MAX_CACHED_HISTORIES = 16
+_history_cache = LRUCache(MAX_CACHED_HISTORIES)
+
+
+def statement_history(sheet_name, data_dir=DATA_DIR):
+    paths = discover_workbooks(data_dir)
+    key = (sheet_name,) + tuple(workbook_key(p) for p in paths)
+    # Callers get a copy so the cached frame can never be modified in place
+    return _history_cache.get_or_build(key, lambda: _build_history(sheet_name, paths)).copy()
+
+
+def line_item(history, label, section=None):
+    # One line item as a year-indexed Series; looks in every section unless one is given
+    label = normalize_label(label)
+    if section is not None:
+        return history[(normalize_label(section), label)]
+    matches = history.xs(label, level="line_item", axis=1)
+    return matches.iloc[:, 0].rename(label)
+
+
+# --- Vectorised analytics ---
+def safe_divide(numerator, denominator):
+    # Element-wise division where x/0 and 0/0 give NaN instead of inf or an exception
+    with np.errstate(divide="ignore", invalid="ignore"):
+        result = np.true_divide(numerator, denominator)
+    if isinstance(result, (pd.Series, pd.DataFrame)):
+        return result.where(np.isfinite(result))
+    result = np.asarray(result, dtype=float)
+    return np.where(np.isfinite(result), result, np.nan)
+
+
+def yoy_change(history, periods=1):
+    # % change against the year `periods` rows earlier, for every column at once
+    previous = history.shift(periods)
+    return safe_divide(history - previous, previous) * 100
+
+
+def cagr(history):
+    # Compound annual growth (%) between the first and last reported year of each column; NaN
+    # unless both endpoints are positive (a deficit deepening from -10 to -40 is not growth)
+    values = history.to_numpy(dtype=float)
+    years = np.array([fiscal_year_start(p) for p in history.index])
+    reported = ~np.isnan(values)
+    has_data = reported.any(axis=0)
+    first = np.argmax(reported, axis=0)
+    last = len(values) - 1 - np.argmax(reported[::-1], axis=0)
+
+    cols = np.arange(values.shape[1])
+    ratio = safe_divide(values[last, cols], values[first, cols])
+    span = (years[last] - years[first]).astype(float)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        growth = np.power(ratio, safe_divide(1.0, span)) - 1
+    positive = (values[first, cols] > 0) & (values[last, cols] > 0)
+    growth = np.where(has_data & (span > 0) & positive, growth * 100, np.nan)
+    return pd.Series(growth, index=history.columns, name="cagr_pct")
+
+
+def rolling_ratio(numerator, denominator, window=3):
+    # Ratio of rolling sums, e.g. 3-year operating surplus over 3-year operating income. Only
+    # years both sides report are summed, so a gap never pairs sums over different years
+    both = numerator.notna() & denominator.notna()
+    return safe_divide(numerator.where(both).rolling(window, min_periods=1).sum(),
+                       denominator.where(both).rolling(window, min_periods=1).sum())
@@ -0,0 +1,322 @@
+import glob
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+
+from profiling import timed
+
+
+# --- Workbook loader ---
+# Every page used to call pd.read_excel at the top of the script, so each Streamlit rerun
+# paid a full openpyxl parse. Workbooks are now parsed once per process (all sheets in a
+# single read) and shared by every page and session until the file changes on disk.
+# pandas is imported by the functions that need it, so the caches and hashes here stay
+# cheap to import for Home (insights.py), which never touches a DataFrame.
+
+DEFAULT_WORKBOOK = "data/iras-fs-fy2324.xlsx"
+
+STATEMENT_SHEETS = [
+    "Statement of Financial Position",
+    "Statement of Com. Income",
+    "Statement of Changes in Equity",
+    "Statement of Cash Flows",
+]
+
+# How many parsed workbooks to keep in memory before the least recently used one is dropped
+MAX_CACHED_WORKBOOKS = 8
+
+
+# Small thread-safe LRU shared by the process-wide caches (workbooks, parsed statements, ...)
+class LRUCache:
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key not in self._data:
+                return default
+            self._data.move_to_end(key)
+            return self._data[key]
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def get_or_build(self, key, build):
+        # build() runs outside the lock; two threads racing on a cold key both build and the
+        # last one wins, which is harmless for pure parse/compute results
+        missing = object()
+        value = self.get(key, missing)
+        if value is missing:
+            value = build()
+            self.put(key, value)
+        return value
+
+    def discard(self, predicate):
+        with self._lock:
+            for key in [k for k in self._data if predicate(k)]:
+                del self._data[key]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+def data_version(*parts):
+    # Short hash of the data a chart or table shows; DataFrames hash their values and index
+    import pandas as pd
+
+    digest = hashlib.sha1()
+    for part in parts:
+        if isinstance(part, pd.DataFrame):
+            digest.update(pd.util.hash_pandas_object(part).to_numpy().tobytes())
+            digest.update(repr(list(part.columns)).encode())
+        else:
+            digest.update(json.dumps(part, default=str).encode())
+    return digest.hexdigest()[:16]
+
+
+_workbook_cache = LRUCache(MAX_CACHED_WORKBOOKS)  # (abs path, mtime) -> {sheet name: DataFrame}
+
+
+def workbook_key(path):
+    path = os.path.abspath(path)
+    return path, os.path.getmtime(path)
+
+
+@timed("load/parse workbook")
+def _parse_workbook(path):
+    import pandas as pd
+
+    sha = workbook_sha256(path)
+    sheets = read_snapshot(path, sha)
+    if sheets is None:
+        sheets = pd.read_excel(path, sheet_name=None)
+        write_snapshot(path, sheets, sha=sha)
+    return sheets
+
+
+def load_workbook(path=DEFAULT_WORKBOOK):
+    key = workbook_key(path)
+    if key not in _workbook_cache:
+        # An older mtime of the same file can never be hit again
+        _workbook_cache.discard(lambda k: k[0] == key[0] and k != key)
+    return _workbook_cache.get_or_build(key, lambda: _parse_workbook(path))
+
+
+def iter_sheet_rows(path, sheet_name):
+    # One sheet's rows as tuples of cell values, streamed with openpyxl's read-only mode:
+    # the sheet XML is parsed as it is iterated, so no row is held after it is yielded
+    from openpyxl import load_workbook as open_workbook
+
+    book = open_workbook(path, read_only=True, data_only=True)
+    try:
+        yield from book[sheet_name].iter_rows(values_only=True)
+    finally:
+        book.close()
+
+
+# --- Columnar snapshots ---
+# openpyxl is by far the slowest part of a cold start, so every workbook gets an Arrow IPC
+# snapshot next to it (data/iras-fs-fy2324.snapshot/). The snapshot is memory-mapped on
+# load and rebuilt whenever the sha256 of the xlsx no longer matches its manifest.
+# pyarrow ships with streamlit; without it we simply keep parsing the xlsx.
+# Everything derived from a workbook (snapshot, statement store, KPI context) lives in its
+# snapshot directory. Tools that must not write next to their inputs (batch_kpis.py) set
+# SNAPSHOT_ROOT to keep those directories elsewhere, or WRITE_SNAPSHOTS = False to use the
+# existing ones without ever writing.
+
+SNAPSHOT_VERSION = 1
+SNAPSHOT_SUFFIX = ".snapshot"
+_KIND_SUFFIX = "::kind"
+SNAPSHOT_ROOT = None
+WRITE_SNAPSHOTS = True
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+_sha_cache = LRUCache(MAX_CACHED_WORKBOOKS * 4)  # (abs path, mtime) -> sha256
+
+
+def workbook_sha256(path):
+    # file_sha256, hashed once per version of the file on disk
+    return _sha_cache.get_or_build(workbook_key(path), lambda: file_sha256(path))
+
+
+def replace_atomically(target, write, binary=True):
+    # Calls write(f) on a temp file unique to this writer, then renames it over `target`:
+    # concurrent writers of the same file (two workers publishing one workbook) never share a
+    # temp file, and readers only ever see a complete file
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(target) or ".", prefix=os.path.basename(target) + ".",
+                               suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb" if binary else "w", **({} if binary else {"encoding": "utf-8"})) as f:
+            write(f)
+        os.replace(tmp, target)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def snapshot_dir(path):
+    stem = os.path.splitext(path)[0]
+    if SNAPSHOT_ROOT is None:
+        return stem + SNAPSHOT_SUFFIX
+    # Tagged with the workbook's directory so same-named workbooks never share one
+    tag = hashlib.sha1(os.path.dirname(os.path.abspath(path)).encode("utf-8")).hexdigest()[:8]
+    return os.path.join(SNAPSHOT_ROOT, f"{os.path.basename(stem)}-{tag}{SNAPSHOT_SUFFIX}")
+
+
+def snapshots_writable():
+    return WRITE_SNAPSHOTS
+
+
+def _read_manifest(path):
+    try:
+        with open(os.path.join(snapshot_dir(path), "manifest.json"), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _manifest_matches(manifest, path, sha=None):
+    if not manifest or manifest.get("version") != SNAPSHOT_VERSION:
+        return False
+    return manifest.get("sha256") == (sha or file_sha256(path))
+
+
+def snapshot_is_fresh(path, sha=None):
+    return _manifest_matches(_read_manifest(path), path, sha)
+
+
+# Excel sheets come back as object columns mixing str, int and NaN, which Arrow cannot
+# store directly. Each object column is written as text plus a one-letter kind column
+# (s/i/f) so the DataFrame read back is cell-for-cell what pd.read_excel returned.
+def _encode_sheet(df):
+    import pandas as pd
+
+    columns = {}
+    for col in df.columns:
+        values = df[col]
+        if values.dtype != object:
+            columns[col] = values
+            continue
+        kinds, texts = [], []
+        for v in values:
+            if isinstance(v, float) and v != v or v is None:
+                kind, text = None, None
+            elif isinstance(v, (bool, int)):
+                kind, text = "i", str(int(v))
+            elif isinstance(v, float):
+                kind, text = "f", repr(v)
+            else:
+                kind, text = "s", str(v)
+            kinds.append(kind)
+            texts.append(text)
+        columns[col] = pd.Series(texts, dtype=object)
+        columns[col + _KIND_SUFFIX] = pd.Series(kinds, dtype=object)
+    return pd.DataFrame(columns)
+
+
+def _decode_sheet(df, columns):
+    import pandas as pd
+
+    out = {}
+    for col in columns:
+        if col + _KIND_SUFFIX not in df:
+            out[col] = df[col]
+            continue
+        out[col] = pd.Series([
+            v if k == "s" else int(v) if k == "i" else float(v) if k == "f" else float("nan")
+            for v, k in zip(df[col], df[col + _KIND_SUFFIX])
+        ], dtype=object)
+    return pd.DataFrame(out, columns=columns)
+
+
+def write_snapshot(path, sheets, sha=None):
+    if not snapshots_writable():
+        return False
+    try:
+        import pyarrow as pa
+        import pyarrow.ipc
+    except ImportError:
+        return False
+
+    def write_table(sink, table):
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+
+    target = snapshot_dir(path)
+    try:
+        os.makedirs(target, exist_ok=True)
+        manifest = {"version": SNAPSHOT_VERSION, "sha256": sha or file_sha256(path), "sheets": []}
+        for i, (name, df) in enumerate(sheets.items()):
+            file_name = f"sheet{i}.arrow"
+            table = pa.Table.from_pandas(_encode_sheet(df), preserve_index=False)
+            replace_atomically(os.path.join(target, file_name), lambda sink: write_table(sink, table))
+            manifest["sheets"].append({"name": name, "file": file_name, "columns": [str(c) for c in df.columns]})
+
+        # The manifest goes last so a half-written snapshot is never considered fresh
+        replace_atomically(os.path.join(target, "manifest.json"), lambda f: json.dump(manifest, f, indent=1),
+                           binary=False)
+    except OSError:
+        # Read-only data directory: keep working from the xlsx
+        return False
+    return True
+
+
+def read_snapshot(path, sha=None):
+    try:
+        import pyarrow as pa
+        import pyarrow.ipc
+    except ImportError:
+        return None
+
+    manifest = _read_manifest(path)
+    if not _manifest_matches(manifest, path, sha):
+        return None
+
+    sheets = {}
+    try:
+        for entry in manifest["sheets"]:
+            with pa.memory_map(os.path.join(snapshot_dir(path), entry["file"]), "r") as source:
+                table = pa.ipc.open_file(source).read_all()
+            sheets[entry["name"]] = _decode_sheet(table.to_pandas(), entry["columns"])
+    except (OSError, KeyError, pa.ArrowInvalid):
+        return None
+    return sheets
+
+
+def build_snapshots(data_dir="data", force=False):
+    import pandas as pd
+
+    built = []
+    for path in sorted(glob.glob(os.path.join(data_dir, "iras-fs-*.xlsx"))):
+        sha = file_sha256(path)
+        if force or not snapshot_is_fresh(path, sha):
+            write_snapshot(path, pd.read_excel(path, sheet_name=None), sha=sha)
+            built.append(path)
+    return built